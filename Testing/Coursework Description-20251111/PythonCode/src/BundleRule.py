@@ -0,0 +1,78 @@
+from enum import Enum
+from typing import Iterable, Optional
+
+from Money import RATE_SCALE, RoundingMode, divide, from_minor_units, to_minor_units, to_rate_units
+
+
+class BundleDiscountType(Enum):
+    PERCENTAGE = "Percentage"
+    FIXED = "Fixed"
+
+
+class BundleRule:
+    """A bundle promotion declared as data.
+
+    Every unit of a trigger SKU in the cart unlocks the discount on one unit of a
+    target SKU, up to ``max_applications`` units per cart (unlimited when None).
+    ``amount`` is a percentage (10 means 10% off) for PERCENTAGE rules and an
+    amount off each target unit for FIXED rules.
+    """
+
+    def __init__(self, name: str, trigger_skus: Iterable[str], target_skus: Iterable[str],
+                 discount_type: BundleDiscountType, amount: float, max_applications: Optional[int] = None):
+        trigger_skus = frozenset(trigger_skus)
+        target_skus = frozenset(target_skus)
+        if not trigger_skus or not target_skus:
+            raise ValueError("A bundle rule needs at least one trigger and one target SKU")
+        if not isinstance(discount_type, BundleDiscountType):
+            raise ValueError("discount_type must be an instance of BundleDiscountType")
+        if amount < 0:
+            raise ValueError("Bundle discount amount cannot be negative")
+        if max_applications is not None and max_applications < 0:
+            raise ValueError("max_applications cannot be negative")
+
+        self._name = name
+        self._trigger_skus = trigger_skus
+        self._target_skus = target_skus
+        self._discount_type = discount_type
+        self._amount = amount
+        self._max_applications = max_applications
+
+    # Getters
+    def get_name(self) -> str:
+        return self._name
+
+    def get_trigger_skus(self) -> frozenset:
+        return self._trigger_skus
+
+    def get_target_skus(self) -> frozenset:
+        return self._target_skus
+
+    def get_discount_type(self) -> BundleDiscountType:
+        return self._discount_type
+
+    def get_amount(self) -> float:
+        return self._amount
+
+    def get_max_applications(self) -> Optional[int]:
+        return self._max_applications
+
+    # Number of target units this rule discounts, given units per SKU in the cart
+    def count_applications(self, sku_counts) -> int:
+        triggers = sum(sku_counts.get(sku, 0) for sku in self._trigger_skus)
+        targets = sum(sku_counts.get(sku, 0) for sku in self._target_skus)
+        applications = min(triggers, targets)
+        if self._max_applications is not None:
+            applications = min(applications, self._max_applications)
+        return applications
+
+    # Discount granted on a single target unit at the given price, rounded to the cent as line_savings does
+    def unit_savings(self, unit_price: float) -> float:
+        return from_minor_units(self.line_savings(to_minor_units(unit_price), 1))
+
+    # Exact discount in cents on units target units priced at unit_price cents;
+    # a percentage is rounded once per line
+    def line_savings(self, unit_price: int, units: int, rounding: RoundingMode = RoundingMode.HALF_UP) -> int:
+        if self._discount_type == BundleDiscountType.PERCENTAGE:
+            return divide(unit_price * units * to_rate_units(self._amount / 100), RATE_SCALE, rounding)
+        return min(to_minor_units(self._amount), unit_price) * units
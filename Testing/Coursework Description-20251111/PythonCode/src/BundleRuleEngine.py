@@ -0,0 +1,131 @@
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+
+from BundleRule import BundleRule, BundleDiscountType
+from CartItem import CartItem
+from Money import RATE_SCALE, RoundingMode, divide_array, from_minor_units, to_minor_units, to_rate_units
+
+
+class BundleApplication(NamedTuple):
+    rule: BundleRule
+    item: CartItem
+    units: int
+    savings: float
+    savings_minor: int  # savings in cents
+
+
+class BundleRuleEngine:
+    """Bundle rules compiled into a trigger SKU -> rules lookup table.
+
+    Pricing a cart only evaluates the rules whose trigger products are present.
+    Rules are applied in declaration order and a target unit is discounted by at
+    most one rule.
+    """
+
+    def __init__(self, rules: List[BundleRule]):
+        self._rules = list(rules)
+        self._rules_by_trigger: Dict[str, List[int]] = {}
+        for position, rule in enumerate(self._rules):
+            for sku in rule.get_trigger_skus():
+                self._rules_by_trigger.setdefault(sku, []).append(position)
+
+    def get_rules(self) -> List[BundleRule]:
+        return list(self._rules)
+
+    # SKUs that trigger at least one rule
+    def get_trigger_skus(self):
+        return self._rules_by_trigger.keys()
+
+    # Rules triggered by the SKUs present in the cart index, in declaration order
+    def candidate_rules(self, sku_counts: Dict[str, int]) -> List[BundleRule]:
+        positions = set()
+        for sku in sku_counts:
+            matches = self._rules_by_trigger.get(sku)
+            if matches:
+                positions.update(matches)
+        return [self._rules[position] for position in sorted(positions)]
+
+    # Work out which cart lines each triggered rule discounts; percentage savings are
+    # rounded to the cent with the given mode, once per line
+    def evaluate(self, cart_items: List[CartItem], sku_counts: Dict[str, int],
+                 rounding: RoundingMode = RoundingMode.HALF_UP) -> List[BundleApplication]:
+        rules = self.candidate_rules(sku_counts)
+        if not rules:
+            return []
+
+        lines_by_sku: Dict[str, List[CartItem]] = {}
+        for item in cart_items:
+            lines_by_sku.setdefault(item.get_product().get_sku(), []).append(item)
+
+        claimed: Dict[int, int] = {}  # units of each line already discounted
+        applications = []
+        for rule in rules:
+            remaining = rule.count_applications(sku_counts)
+            for sku in sorted(rule.get_target_skus()):
+                for item in lines_by_sku.get(sku, ()):
+                    if remaining <= 0:
+                        break
+                    free_units = item.get_quantity() - claimed.get(id(item), 0)
+                    units = min(free_units, remaining)
+                    if units <= 0:
+                        continue
+                    claimed[id(item)] = claimed.get(id(item), 0) + units
+                    remaining -= units
+                    savings = rule.line_savings(to_minor_units(item.get_product().get_price()), units, rounding)
+                    applications.append(BundleApplication(rule, item, units, from_minor_units(savings), savings))
+        return applications
+
+    # Vectorized evaluate over a flattened batch of carts; returns the bundle savings in cents per cart.
+    # Lines must be grouped by cart in cart order, line_skus indexes into skus; prices are int64 cents.
+    def evaluate_batch(self, skus: List[str], line_carts: np.ndarray, line_skus: np.ndarray,
+                       line_prices: np.ndarray, line_quantities: np.ndarray, cart_count: int,
+                       rounding: RoundingMode = RoundingMode.HALF_UP) -> np.ndarray:
+        rules = self.candidate_rules(dict.fromkeys(skus))
+        savings = np.zeros(cart_count, dtype=np.int64)
+        if not rules:
+            return savings
+
+        line_order = np.arange(len(line_carts))
+        claimed = np.zeros(len(line_carts), dtype=np.int64)
+        for rule in rules:
+            triggers = np.array([sku in rule.get_trigger_skus() for sku in skus])[line_skus]
+            trigger_units = np.zeros(cart_count, dtype=np.int64)
+            np.add.at(trigger_units, line_carts, line_quantities * triggers)
+            target_ranks = {sku: rank for rank, sku in enumerate(sorted(rule.get_target_skus()))}
+            line_ranks = np.array([target_ranks.get(sku, -1) for sku in skus])[line_skus]
+            targets = line_ranks >= 0
+            target_units = np.zeros(cart_count, dtype=np.int64)
+            np.add.at(target_units, line_carts, line_quantities * targets)
+            applications = np.minimum(trigger_units, target_units)
+            if rule.get_max_applications() is not None:
+                applications = np.minimum(applications, rule.get_max_applications())
+
+            # Same order as evaluate: by cart, then sorted target SKU, then cart line
+            lines = np.flatnonzero(targets)
+            lines = lines[np.lexsort((line_order[lines], line_ranks[lines], line_carts[lines]))]
+            carts = line_carts[lines]
+            free_units = line_quantities[lines] - claimed[lines]
+            units_before = np.cumsum(free_units) - free_units
+            group_starts = np.flatnonzero(np.r_[True, carts[1:] != carts[:-1]]) if len(carts) else carts
+            group_sizes = np.diff(np.r_[group_starts, len(carts)])
+            units_before -= np.repeat(units_before[group_starts], group_sizes)
+            units = np.clip(applications[carts] - units_before, 0, np.maximum(free_units, 0))
+            claimed[lines] += units
+
+            # Same per-line rounding as BundleRule.line_savings
+            prices = line_prices[lines]
+            if rule.get_discount_type() == BundleDiscountType.PERCENTAGE:
+                line_savings = divide_array(prices * units * to_rate_units(rule.get_amount() / 100), RATE_SCALE,
+                                            rounding)
+            else:
+                line_savings = np.minimum(to_minor_units(rule.get_amount()), prices) * units
+            np.add.at(savings, carts, line_savings)
+
+        return savings
+
+
+# The laptop + mouse promotion: 10% off one mouse for every laptop in the cart
+DEFAULT_BUNDLE_RULES = [
+    BundleRule("Laptop + Mouse", ["laptop"], ["mouse"], BundleDiscountType.PERCENTAGE, 10),
+]
@@ -0,0 +1,84 @@
+from bisect import bisect_right
+from typing import Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+BIN_DIGITS = 6  # Issuer identification number length
+
+# Luhn value of each digit when it is doubled
+_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+
+
+class CardValidator:
+    """Credit card number checks: ASCII digits only, allowed lengths, optionally the
+    Luhn checksum and issuer BIN ranges.
+
+    ``bin_ranges`` holds inclusive (low, high) ranges of the first six digits, e.g.
+    (400000, 499999) for Visa. ``validate`` checks one card; ``validate_batch`` checks
+    an array of cards with NumPy for bulk re-screening.
+    """
+
+    def __init__(self, lengths: Iterable[int] = (16,), check_luhn: bool = False,
+                 bin_ranges: Optional[Iterable[Tuple[int, int]]] = None):
+        self._lengths = frozenset(lengths)
+        self._check_luhn = check_luhn
+        self._bin_ranges = sorted(bin_ranges) if bin_ranges is not None else None
+        if self._bin_ranges is not None:
+            self._bin_lows = [low for low, _ in self._bin_ranges]
+            self._bin_highs = [high for _, high in self._bin_ranges]
+
+    def validate(self, credit_card_number: str) -> bool:
+        if len(credit_card_number) not in self._lengths:
+            return False
+        if not (credit_card_number.isascii() and credit_card_number.isdigit()):
+            return False
+        if self._check_luhn and not self.luhn_valid(credit_card_number):
+            return False
+        if self._bin_ranges is not None and not self._bin_allowed(int(credit_card_number[:BIN_DIGITS])):
+            return False
+        return True
+
+    @staticmethod
+    def luhn_valid(digits: str) -> bool:
+        total = 0
+        for position, digit in enumerate(reversed(digits)):
+            value = ord(digit) - 48
+            total += _DOUBLED[value] if position % 2 else value
+        return total % 10 == 0
+
+    def _bin_allowed(self, issuer: int) -> bool:
+        index = bisect_right(self._bin_lows, issuer) - 1
+        return index >= 0 and issuer <= self._bin_highs[index]
+
+    # Validate many card numbers at once; returns one bool per card
+    def validate_batch(self, credit_card_numbers: Sequence[str]) -> np.ndarray:
+        count = len(credit_card_numbers)
+        valid = np.zeros(count, dtype=bool)
+        if count == 0:
+            return valid
+        width = max(self._lengths)
+        # Unicode array so non-ASCII input is rejected rather than failing to encode
+        cards = np.asarray(credit_card_numbers, dtype=f"U{width + 1}")
+        lengths = np.char.str_len(cards)
+        codes = cards.view(np.uint32).reshape(count, width + 1)
+
+        for length in self._lengths:
+            rows = np.flatnonzero(lengths == length)
+            if len(rows) == 0:
+                continue
+            digits = codes[rows, :length].astype(np.int64) - 48
+            ok = ((digits >= 0) & (digits <= 9)).all(axis=1)
+            digits = np.where(ok[:, None], digits, 0)
+            if self._check_luhn:
+                # Every second digit from the right is doubled
+                doubled = np.zeros(length, dtype=bool)
+                doubled[length - 2::-2] = True
+                values = np.where(doubled, np.asarray(_DOUBLED)[digits], digits)
+                ok &= values.sum(axis=1) % 10 == 0
+            if self._bin_ranges is not None:
+                issuers = digits[:, :BIN_DIGITS] @ (10 ** np.arange(BIN_DIGITS - 1, -1, -1))
+                index = np.searchsorted(self._bin_lows, issuers, side="right") - 1
+                highs = np.asarray(self._bin_highs)
+                ok &= (index >= 0) & (issuers <= highs[np.maximum(index, 0)])
+            valid[rows] = ok
+        return valid
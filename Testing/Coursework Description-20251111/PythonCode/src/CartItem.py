@@ -1,4 +1,5 @@
 class CartItem:
+    __slots__ = ("product", "quantity")
 
     def __init__(self, product, quantity):
         self.product = product
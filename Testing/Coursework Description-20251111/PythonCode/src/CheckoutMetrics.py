@@ -0,0 +1,247 @@
+import math
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Tuple
+
+# Latency histograms are log-linear, as in HdrHistogram: values below 2**SUB_BUCKET_BITS
+# get a bucket each, above that every power of two is split into 2**(SUB_BUCKET_BITS - 1)
+# buckets, so a recorded value is off by at most 1/64 (1.6%) of itself
+SUB_BUCKET_BITS = 7
+MAX_VALUE = (1 << 40) - 1  # Nanoseconds, about 18 minutes; longer values count as this
+_SUB_BUCKET_HALF = 1 << (SUB_BUCKET_BITS - 1)
+BUCKET_COUNT = (MAX_VALUE.bit_length() - SUB_BUCKET_BITS + 2) << (SUB_BUCKET_BITS - 1)
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+# Lowest and highest value counted in a bucket
+def _bucket_bounds(index: int) -> Tuple[int, int]:
+    if index < 2 * _SUB_BUCKET_HALF:
+        return index, index
+    shift = (index >> (SUB_BUCKET_BITS - 1)) - 1
+    low = (index - (shift << (SUB_BUCKET_BITS - 1))) << shift
+    return low, low + (1 << shift) - 1
+
+
+class LatencyHistogram:
+    """Counts of latencies in nanoseconds, in fixed log-linear buckets.
+
+    Recording is a bucket increment, so it costs the same however many values have
+    been seen, and histograms recorded separately merge exactly. Percentiles are
+    reported as the highest value of the bucket they fall in, capped at the maximum.
+    """
+
+    __slots__ = ("_counts", "_count", "_total", "_min", "_max")
+
+    def __init__(self):
+        self._counts = [0] * BUCKET_COUNT
+        self._count = 0
+        self._total = 0
+        self._min = MAX_VALUE
+        self._max = 0
+
+    def record(self, value: int):
+        # Bucket index: the value itself below 2**SUB_BUCKET_BITS, otherwise its top bits
+        # after the shift; out of range values are handled off the common path
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        if shift > 0:
+            if value > MAX_VALUE:
+                value = MAX_VALUE
+                shift = MAX_VALUE.bit_length() - SUB_BUCKET_BITS
+            self._counts[(shift << (SUB_BUCKET_BITS - 1)) + (value >> shift)] += 1
+        else:
+            if value < 0:
+                value = 0
+            self._counts[value] += 1
+        self._count += 1
+        self._total += value
+        if value > self._max:
+            self._max = value
+        if value < self._min:
+            self._min = value
+
+    # Add another histogram's counts to this one
+    def merge(self, other: 'LatencyHistogram'):
+        counts = self._counts
+        for index, count in enumerate(other._counts):
+            if count:
+                counts[index] += count
+        self._count += other._count
+        self._total += other._total
+        self._max = max(self._max, other._max)
+        self._min = min(self._min, other._min)
+
+    def get_count(self) -> int:
+        return self._count
+
+    def get_total(self) -> int:
+        return self._total
+
+    def get_min(self) -> int:
+        return self._min if self._count else 0
+
+    def get_max(self) -> int:
+        return self._max
+
+    def get_mean(self) -> float:
+        return self._total / self._count if self._count else 0.0
+
+    # Value at or below which the given percentage (0-100) of recorded values fall
+    def value_at_percentile(self, percentile: float) -> int:
+        if not 0 <= percentile <= 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if not self._count:
+            return 0
+        # Rounded first so float noise (99.9 * 1000 / 100 = 999.0000000000001) cannot push the rank up
+        rank = max(1, math.ceil(round(percentile * self._count / 100, 9)))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return min(_bucket_bounds(index)[1], self._max)
+        return self._max
+
+
+class _ThreadRecorder:
+    # One thread's histograms and error counts, written only by that thread
+    __slots__ = ("histograms", "errors")
+
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.errors: Dict[str, int] = {}
+
+    # Add another recorder's histograms and error counts to this one
+    def merge(self, other: '_ThreadRecorder'):
+        for stage, histogram in list(other.histograms.items()):
+            self.histograms.setdefault(stage, LatencyHistogram()).merge(histogram)
+        for stage, count in list(other.errors.items()):
+            self.errors[stage] = self.errors.get(stage, 0) + count
+
+
+class CheckoutMetrics:
+    """Per-stage call counts, error counts and latency histograms for checkout.
+
+    Services given a CheckoutMetrics time their stages through call(). Each thread
+    records into histograms of its own, so recording takes no lock; snapshot() merges
+    every thread's histograms into one report per stage; once a thread has ended, its
+    counts are folded into one retired recorder. Services without metrics skip
+    timing altogether, and a disabled CheckoutMetrics calls straight through, so it can
+    be left wired in and switched on when needed.
+    """
+
+    def __init__(self, enabled: bool = True, clock: Callable[[], int] = time.perf_counter_ns):
+        self._enabled = enabled
+        self._clock = clock
+        self._local = threading.local()
+        # Recorders of threads that may still be running, with a reference to their thread
+        self._recorders: List[Tuple[weakref.ref, _ThreadRecorder]] = []
+        self._retired = _ThreadRecorder()  # Counts of threads that have ended
+        self._recorders_lock = threading.Lock()
+
+    def is_enabled(self) -> bool:
+        return self._enabled
+
+    def set_enabled(self, enabled: bool):
+        self._enabled = enabled
+
+    # Run function(*args) as one call of stage, timing it when enabled; a call that
+    # raises is counted as an error and the exception propagates
+    def call(self, stage: str, function: Callable, *args) -> Any:
+        if not self._enabled:
+            return function(*args)
+        clock = self._clock
+        start = clock()
+        try:
+            result = function(*args)
+        except BaseException:
+            self.record(stage, clock() - start, error=True)
+            raise
+        self.record(stage, clock() - start)
+        return result
+
+    # Record one call of stage that took the given nanoseconds
+    def record(self, stage: str, nanoseconds: int, error: bool = False):
+        try:
+            histogram = self._local.histograms[stage]
+        except (AttributeError, KeyError):
+            histogram = self._new_histogram(stage)
+        histogram.record(nanoseconds)
+        if error:
+            errors = self._local.recorder.errors
+            errors[stage] = errors.get(stage, 0) + 1
+
+    # First call of stage on this thread; the first call of any stage also registers the thread
+    def _new_histogram(self, stage: str) -> LatencyHistogram:
+        local = self._local
+        recorder = getattr(local, "recorder", None)
+        if recorder is None:
+            recorder = local.recorder = _ThreadRecorder()
+            local.histograms = recorder.histograms
+            with self._recorders_lock:
+                self._retire_finished()
+                self._recorders.append((weakref.ref(threading.current_thread()), recorder))
+        histogram = recorder.histograms[stage] = LatencyHistogram()
+        return histogram
+
+    # One stage's latencies across all threads
+    def get_histogram(self, stage: str) -> LatencyHistogram:
+        merged = LatencyHistogram()
+        for recorder in self._get_recorders():
+            histogram = recorder.histograms.get(stage)
+            if histogram is not None:
+                merged.merge(histogram)
+        return merged
+
+    # Counts and latency percentiles per stage, across all threads; latencies in microseconds
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        merged = _ThreadRecorder()
+        for recorder in self._get_recorders():
+            merged.merge(recorder)
+        histograms, errors = merged.histograms, merged.errors
+
+        report = {}
+        for stage in sorted(histograms):
+            histogram = histograms[stage]
+            stats = {
+                "count": histogram.get_count(),
+                "errors": errors.get(stage, 0),
+                "total_ms": histogram.get_total() / 1e6,
+                "mean_us": histogram.get_mean() / 1e3,
+                "min_us": histogram.get_min() / 1e3,
+            }
+            for percentile in PERCENTILES:
+                stats[f"p{percentile:g}_us"] = histogram.value_at_percentile(percentile) / 1e3
+            stats["max_us"] = histogram.get_max() / 1e3
+            report[stage] = stats
+        return report
+
+    # Forget everything recorded so far
+    def reset(self):
+        with self._recorders_lock:
+            self._local = threading.local()
+            self._recorders = []
+            self._retired = _ThreadRecorder()
+
+    # Live threads' recorders, and a copy of the retired counts so merging them needs no lock
+    def _get_recorders(self) -> List[_ThreadRecorder]:
+        with self._recorders_lock:
+            self._retire_finished()
+            retired = _ThreadRecorder()
+            retired.merge(self._retired)
+            return [recorder for _, recorder in self._recorders] + [retired]
+
+    # Fold the recorders of threads that have ended into the retired counts, so thread
+    # churn does not grow the list; an ended thread writes nothing more. Called under the lock.
+    def _retire_finished(self):
+        running = []
+        for thread_ref, recorder in self._recorders:
+            thread = thread_ref()
+            if thread is not None and thread.is_alive():
+                running.append((thread_ref, recorder))
+            else:
+                self._retired.merge(recorder)
+        self._recorders = running
+
+    def get_recorder_count(self) -> int:
+        with self._recorders_lock:
+            return len(self._recorders)
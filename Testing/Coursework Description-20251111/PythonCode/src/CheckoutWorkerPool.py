@@ -0,0 +1,117 @@
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from InventoryService import InventoryService
+from OrderService import OrderService
+from PaymentService import PaymentService
+from Product import Product
+from ShoppingCart import ShoppingCart
+from StockLedger import StockLedger
+
+
+class CheckoutRequest(NamedTuple):
+    """Picklable description of an order: lines are (sku, name, price, quantity)."""
+    customer_type: CustomerType
+    lines: Tuple[Tuple[str, str, float, int], ...]
+    credit_card_number: str
+    coupon_code: Optional[str] = None
+    promotion_active: bool = False
+
+    @staticmethod
+    def from_cart(cart: ShoppingCart, credit_card_number: str) -> 'CheckoutRequest':
+        lines = tuple((item.get_product().get_sku(), item.get_product().get_name(),
+                       item.get_product().get_price(), item.get_quantity()) for item in cart.get_items())
+        return CheckoutRequest(cart.get_customer().get_customer_type(), lines, credit_card_number,
+                               cart.get_coupon_code(), cart.is_promotion_active())
+
+
+# State of each worker process, set up by _start_worker
+_worker_order_service: Optional[OrderService] = None
+_worker_discount_service: Optional[DiscountService] = None
+_worker_products: Dict[str, Product] = {}
+
+
+def _start_worker(ledger_path: str, payment_service_factory: Callable[[], PaymentService],
+                  discount_service_factory: Callable[[], DiscountService]):
+    global _worker_order_service, _worker_discount_service
+    inventory = InventoryService(stock_ledger=StockLedger(ledger_path))
+    _worker_order_service = OrderService(payment_service_factory(), inventory)
+    _worker_discount_service = discount_service_factory()
+
+
+def _build_cart(request: CheckoutRequest) -> ShoppingCart:
+    cart = ShoppingCart(Customer("Checkout", request.customer_type), _worker_discount_service)
+    for sku, name, price, quantity in request.lines:
+        product = _worker_products.get(sku)
+        if product is None:
+            # Stock lives in the shared ledger, so the local starting count is never used
+            product = _worker_products[sku] = Product(name, price, 0, sku=sku)
+        elif product.get_price() != price:
+            product.set_price(price)  # Each request is priced at the price it was placed with
+        cart.add_item(CartItem(product, quantity))
+    cart.apply_coupon_code(request.coupon_code)
+    cart.set_promotion_active(request.promotion_active)
+    return cart
+
+
+def _place_order(request: CheckoutRequest) -> bool:
+    return _worker_order_service.place_order(_build_cart(request), request.credit_card_number)
+
+
+# _place_order with the time place_order itself took in the worker, in seconds
+def _place_order_timed(request: CheckoutRequest) -> Tuple[bool, float]:
+    cart = _build_cart(request)
+    start = time.perf_counter()
+    placed = _worker_order_service.place_order(cart, request.credit_card_number)
+    return placed, time.perf_counter() - start
+
+
+class CheckoutWorkerPool:
+    """Runs place_order in a pool of worker processes sharing one StockLedger file, so
+    checkouts are not limited to one core by the GIL. The ledger's atomic decrements
+    keep the workers from overselling.
+
+    Each worker builds its own services from the factories, which must be picklable.
+    Workers only share coupon usage when discount_service_factory gives them a registry
+    backed by shared storage, such as a SqliteCouponRegistry on one file."""
+
+    def __init__(self, ledger_path: str, workers: Optional[int] = None,
+                 payment_service_factory: Callable[[], PaymentService] = PaymentService,
+                 discount_service_factory: Callable[[], DiscountService] = DiscountService):
+        self._ledger = StockLedger(ledger_path)
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_start_worker,
+                                             initargs=(ledger_path, payment_service_factory,
+                                                       discount_service_factory))
+
+    def __enter__(self) -> 'CheckoutWorkerPool':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Register stock for a SKU; existing ledger counts are kept
+    def stock(self, sku: str, quantity: int):
+        self._ledger.slot_for(sku, quantity)
+
+    def get_stock(self, sku: str) -> int:
+        return self._ledger.get_stock(self._ledger.slot_for(sku))
+
+    def place_order(self, request: CheckoutRequest) -> Future:
+        return self._executor.submit(_place_order, request)
+
+    # Place many orders, sent to the workers in chunks; results are in request order
+    def place_orders(self, requests: List[CheckoutRequest], chunksize: int = 64) -> List[bool]:
+        return list(self._executor.map(_place_order, requests, chunksize=chunksize))
+
+    # place_orders, also giving how long each order took inside its worker, in seconds
+    def place_orders_timed(self, requests: List[CheckoutRequest], chunksize: int = 64) -> List[Tuple[bool, float]]:
+        return list(self._executor.map(_place_order_timed, requests, chunksize=chunksize))
+
+    def close(self):
+        self._executor.shutdown()
+        self._ledger.close()
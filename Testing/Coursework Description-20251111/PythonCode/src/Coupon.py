@@ -0,0 +1,71 @@
+from enum import Enum
+from typing import Optional, Tuple
+
+
+class CouponType(Enum):
+    PERCENTAGE = "Percentage"
+    FIXED = "Fixed"
+
+
+class Coupon:
+    """A coupon code as data.
+
+    ``value`` is a percentage (10 means 10% off) for PERCENTAGE coupons and an amount
+    off the cart for FIXED coupons. A coupon stops applying once ``expires_at`` (epoch
+    seconds, never when None) has passed or it has been redeemed ``max_uses`` times
+    (unlimited when None).
+    """
+
+    __slots__ = ("_code", "_coupon_type", "_value", "_expires_at", "_max_uses", "_uses")
+
+    def __init__(self, code: str, coupon_type: CouponType, value: float, expires_at: Optional[float] = None,
+                 max_uses: Optional[int] = None, uses: int = 0):
+        if not code or not code.strip():
+            raise ValueError("Coupon code cannot be empty")
+        if not isinstance(coupon_type, CouponType):
+            raise ValueError("coupon_type must be an instance of CouponType")
+        if value < 0:
+            raise ValueError("Coupon value cannot be negative")
+        if max_uses is not None and max_uses < 0:
+            raise ValueError("max_uses cannot be negative")
+        if uses < 0:
+            raise ValueError("uses cannot be negative")
+        self._code = code
+        self._coupon_type = coupon_type
+        self._value = value
+        self._expires_at = expires_at
+        self._max_uses = max_uses
+        self._uses = uses
+
+    def get_code(self) -> str:
+        return self._code
+
+    def get_coupon_type(self) -> CouponType:
+        return self._coupon_type
+
+    def get_value(self) -> float:
+        return self._value
+
+    def get_expires_at(self) -> Optional[float]:
+        return self._expires_at
+
+    def get_max_uses(self) -> Optional[int]:
+        return self._max_uses
+
+    def get_uses(self) -> int:
+        return self._uses
+
+    def set_uses(self, uses: int):
+        self._uses = uses
+
+    # Whether the coupon can still be applied at time now
+    def is_valid(self, now: float) -> bool:
+        if self._expires_at is not None and now >= self._expires_at:
+            return False
+        return self._max_uses is None or self._uses < self._max_uses
+
+    # Percentage rate and fixed amount this coupon takes off a cart
+    def discount(self) -> Tuple[float, float]:
+        if self._coupon_type == CouponType.PERCENTAGE:
+            return self._value / 100, 0.0
+        return 0.0, float(self._value)
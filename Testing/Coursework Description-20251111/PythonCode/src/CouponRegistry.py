@@ -0,0 +1,92 @@
+import threading
+import time
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+from Coupon import Coupon, CouponType
+
+
+class CouponRegistry:
+    """Coupon codes indexed by exact code in a dict, so lookups cost the same however
+    many codes are registered.
+
+    Redemption checks validity and counts the use under one lock, so a single-use code
+    is granted to exactly one order. ``clock`` returns epoch seconds for expiry checks.
+    Each code has a version that moves on every change to it, so carts can tell when a
+    price they cached with the code is stale.
+    """
+
+    def __init__(self, coupons: Iterable[Coupon] = (), clock: Callable[[], float] = time.time):
+        self._coupons: Dict[str, Coupon] = {}
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._clock = clock
+        self.import_coupons(coupons)
+
+    def __len__(self) -> int:
+        return len(self._coupons)
+
+    # Register a coupon, replacing any coupon with the same code
+    def add(self, coupon: Coupon):
+        with self._lock:
+            self._coupons[coupon.get_code()] = coupon
+            self._bump(coupon.get_code())
+
+    # Bulk import of prepared coupons; returns how many were registered
+    def import_coupons(self, coupons: Iterable[Coupon]) -> int:
+        batch = {coupon.get_code(): coupon for coupon in coupons}
+        with self._lock:
+            self._coupons.update(batch)
+            for code in batch:
+                self._bump(code)
+        return len(batch)
+
+    # Bulk import of a batch of codes sharing one type, value, expiry and usage cap
+    def import_codes(self, codes: Iterable[str], coupon_type: CouponType, value: float,
+                     expires_at: Optional[float] = None, max_uses: Optional[int] = 1) -> int:
+        return self.import_coupons(Coupon(code, coupon_type, value, expires_at, max_uses) for code in codes)
+
+    # The registered coupon for a code, valid or not; None when unknown
+    def get(self, code: str) -> Optional[Coupon]:
+        return self._coupons.get(code)
+
+    # Changes whenever the code is added, replaced, redeemed or released; compare for equality only
+    def get_version(self, code: str) -> Hashable:
+        return self._versions.get(code, 0)
+
+    # The coupon for a code if it can still be applied, otherwise None
+    def lookup(self, code: str) -> Optional[Coupon]:
+        coupon = self._coupons.get(code)
+        if coupon is None or not coupon.is_valid(self._clock()):
+            return None
+        return coupon
+
+    # Atomically use up one redemption of a code; False when unknown, expired or exhausted
+    def redeem(self, code: str) -> bool:
+        with self._lock:
+            coupon = self._coupons.get(code)
+            if coupon is None or not coupon.is_valid(self._clock()):
+                return False
+            coupon.set_uses(coupon.get_uses() + 1)
+            self._bump(code)
+            return True
+
+    # Give back a redemption, e.g. when the order it was taken for fails
+    def release(self, code: str):
+        with self._lock:
+            coupon = self._coupons.get(code)
+            if coupon is not None and coupon.get_uses() > 0:
+                coupon.set_uses(coupon.get_uses() - 1)
+                self._bump(code)
+
+    # Called with the lock held
+    def _bump(self, code: str):
+        self._versions[code] = self._versions.get(code, 0) + 1
+
+
+# Codes a DiscountService starts with unless the caller supplies its own registry;
+# built fresh each time because coupons count their own redemptions
+def default_coupons() -> List[Coupon]:
+    return [
+        Coupon("DISCOUNT10", CouponType.PERCENTAGE, 10),  # 10% off
+        Coupon("SAVE50", CouponType.FIXED, 50),  # Fixed amount discount of 50
+    ]
@@ -1,48 +1,220 @@
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
+from BundleRule import BundleRule
+from BundleRuleEngine import BundleRuleEngine, DEFAULT_BUNDLE_RULES
 from CartItem import CartItem
+from CheckoutMetrics import CheckoutMetrics
+from CouponRegistry import CouponRegistry, default_coupons
 from CustomerType import CustomerType
+from Money import MINOR_UNITS, RoundingMode, from_minor_units, to_minor_units, to_rate_units
+from PricingPipeline import PricingPipeline
+from PricingPolicy import PricingPolicy
+from PricingResult import PricingResult
+from PricingTracer import PricingTrace, PricingTracer
+
+# Multi-tier discounts on the cart value after bundle discounts, highest threshold first
+TIERED_DISCOUNTS = [
+    (15000, 0.25),  # 25% discount for carts over 15000
+    (7000, 0.20),  # 20% discount for carts over 7000
+    (1000, 0.15),  # 15% discount for carts over 2000
+]
+
+# Additional discount per customer type
+CUSTOMER_DISCOUNTS = {
+    CustomerType.REGULAR: 0.0,
+    CustomerType.PREMIUM: 0.20,  # Additional 20% for premium customers
+    CustomerType.VIP: 0.15,  # Additional 15% for VIP customers
+}
+
+PROMOTION_RATE = 0.75  # 25% off
+
+# Built-in policy, the same as the shipped pricing_policy.json; PricingPolicyReloader swaps in edited ones
+DEFAULT_PRICING_POLICY = PricingPolicy(TIERED_DISCOUNTS, CUSTOMER_DISCOUNTS, PROMOTION_RATE)
 
 
 class DiscountService:
+    def __init__(self, bundle_rules: Optional[List[BundleRule]] = None, tracer: Optional[PricingTracer] = None,
+                 coupon_registry: Optional[CouponRegistry] = None, policy: PricingPolicy = DEFAULT_PRICING_POLICY,
+                 metrics: Optional[CheckoutMetrics] = None):
+        self._bundle_engine = BundleRuleEngine(DEFAULT_BUNDLE_RULES if bundle_rules is None else bundle_rules)
+        self._tracer = tracer  # No tracing when None
+        self._coupon_registry = CouponRegistry(default_coupons()) if coupon_registry is None else coupon_registry
+        self._pipeline = PricingPipeline(policy)
+        self._metrics = metrics  # Pricing passes are timed as "apply_discount" when set
+
+    def get_bundle_engine(self) -> BundleRuleEngine:
+        return self._bundle_engine
+
+    def get_tracer(self) -> Optional[PricingTracer]:
+        return self._tracer
+
+    def set_tracer(self, tracer: Optional[PricingTracer]):
+        self._tracer = tracer
+
+    def get_metrics(self) -> Optional[CheckoutMetrics]:
+        return self._metrics
+
+    def get_coupon_registry(self) -> CouponRegistry:
+        return self._coupon_registry
+
+    def get_policy(self) -> PricingPolicy:
+        return self._pipeline.get_policy()
+
+    # Switch to another pricing policy; it is only compiled when it differs from the current one
+    def set_policy(self, policy: PricingPolicy):
+        if policy != self._pipeline.get_policy():
+            self._pipeline = PricingPipeline(policy)
+
+    def get_pipeline(self) -> PricingPipeline:
+        return self._pipeline
+
     # Apply promotional discounts (e.g., Black Friday, flat 25% off)
     def apply_promotion_discount(self, total: float) -> float:
-        return total * 0.75  # 25% off
+        return self._promotion_price(total, self._pipeline)
 
-    # Apply tiered, customer-specific, bundle, and coupon discounts
-    def apply_discount(self, total: float, customer_type: CustomerType, cart_items: List[CartItem], coupon_code: str) -> float:
-        discount = 0.0
+    def _promotion_price(self, total: float, pipeline: PricingPipeline) -> float:
+        trace = self._tracer.start(total) if self._tracer is not None else None
+        final_price = from_minor_units(pipeline.promotion_price(to_minor_units(total)))
+        if trace is not None:
+            trace.record("promotion", "Promotion", total - final_price)
+            self._tracer.emit(trace, final_price)
+        return final_price
 
-        # Apply bundle discounts (e.g., buy laptop + mouse, 5% off mouse)
+    # Build the cart analysis index in a single pass: units per product SKU
+    @staticmethod
+    def index_cart(cart_items: List[CartItem]) -> Dict[str, int]:
+        sku_counts: Dict[str, int] = {}
         for item in cart_items:
-            if item.get_product().get_name().casefold() != "mouse".casefold():
-                has_laptop = sum(1 for i in cart_items if i.get_product(
-                ).get_name().casefold() == "laptop".casefold()) >= 1
-                if has_laptop:
-                    print(item.get_product().get_name())
-                    total -= item.get_product().get_price() * 0.10  # 10% off the mouse
-
-        # Apply multi-tier discount based on cart value
-        if total > 15000:
-            discount = 0.25  # 25% discount for carts over 15000
-        elif total > 7000:
-            discount = 0.20  # 20% discount for carts over 7000
-        elif total > 1000:
-            discount = 0.15  # 15% discount for carts over 2000
-
-        # Apply customer-specific discounts
-        if customer_type == CustomerType.PREMIUM:
-            discount += 0.20  # Additional 20% for premium customers
-        elif customer_type == CustomerType.VIP:
-            discount += 0.15  # Additional 15% for VIP customers
+            sku = item.get_product().get_sku()
+            sku_counts[sku] = sku_counts.get(sku, 0) + item.get_quantity()
+        return sku_counts
 
-        # Apply coupon code discounts, only if a valid coupon code is provided
-        print("coupon_code:", coupon_code)
+    # Percentage and fixed amount granted by a coupon code; unknown, expired and
+    # used-up codes grant nothing
+    def coupon_discount(self, coupon_code: str) -> Tuple[float, float]:
         if coupon_code and coupon_code.strip():
-            # Example: If coupon code is "DISCOUNT10", give 10% off
-            if coupon_code == "DISCOUNT10":
-                discount += 0.10
-            elif coupon_code == "SAVE50":
-                total -= 50  # Fixed amount discount of 50
+            coupon = self._coupon_registry.lookup(coupon_code)
+            if coupon is not None:
+                return coupon.discount()
+        return 0.0, 0.0
+
+    # Total bundle savings for a cart in cents, rounded with the current policy's mode
+    def bundle_savings(self, cart_items: List[CartItem], sku_counts: Dict[str, int],
+                       trace: Optional[PricingTrace] = None, rounding: Optional[RoundingMode] = None) -> int:
+        if rounding is None:
+            rounding = self._pipeline.get_rounding()
+        savings = 0
+        for application in self._bundle_engine.evaluate(cart_items, sku_counts, rounding):
+            if trace is not None:
+                trace.record("bundle", f"{application.rule.get_name()}: "
+                             f"{application.item.get_product().get_name()} x{application.units}", application.savings)
+            savings += application.savings_minor
+        return savings
+
+    # Apply tiered, customer-specific, bundle, and coupon discounts.
+    # sku_counts is the cart's index when the caller already maintains one.
+    # Pricing is done in whole cents; the result is the float nearest the exact price.
+    def apply_discount(self, total: float, customer_type: CustomerType, cart_items: List[CartItem], coupon_code: str,
+                       sku_counts: Optional[Dict[str, int]] = None) -> float:
+        return self.price(total, customer_type, cart_items, coupon_code, sku_counts).final_price
+
+    # Price a cart in one pass and report every discount that went into the final price;
+    # an active promotion replaces all other discounts
+    def price(self, total: float, customer_type: CustomerType, cart_items: List[CartItem], coupon_code: str,
+              sku_counts: Optional[Dict[str, int]] = None, promotion_active: bool = False) -> PricingResult:
+        if self._metrics is not None:
+            return self._metrics.call("apply_discount", self._price, total, customer_type, cart_items, coupon_code,
+                                      sku_counts, promotion_active)
+        return self._price(total, customer_type, cart_items, coupon_code, sku_counts, promotion_active)
+
+    def _price(self, total: float, customer_type: CustomerType, cart_items: List[CartItem], coupon_code: str,
+               sku_counts: Optional[Dict[str, int]], promotion_active: bool) -> PricingResult:
+        pipeline = self._pipeline  # One policy for the whole pass, even across a reload
+        if promotion_active:
+            return PricingResult(total, 0.0, 0.0, 0.0, None, 0.0, 0.0, pipeline.get_promotion_rate(),
+                                 self._promotion_price(total, pipeline))
+
+        trace = self._tracer.start(total, customer_type, coupon_code) if self._tracer is not None else None
+        subtotal = total
+        total = to_minor_units(total)
+
+        # Apply bundle discounts (e.g., buy laptop + mouse, 10% off the mouse);
+        # the cart is analysed once and bundle rules only look at the index
+        if sku_counts is None:
+            sku_counts = self.index_cart(cart_items)
+        bundle_savings = self.bundle_savings(cart_items, sku_counts, trace, pipeline.get_rounding())
+        total -= bundle_savings
+
+        # Apply coupon code discounts, only if a valid coupon code is provided
+        coupon_rate, coupon_amount = self.coupon_discount(coupon_code)
+
+        # Apply the multi-tier discount based on cart value, the customer-specific discount
+        # and the coupon in the customer type's compiled price stage
+        final_price = from_minor_units(
+            pipeline.stage(customer_type)(total, to_rate_units(coupon_rate), to_minor_units(coupon_amount)))
+        tier_rate = pipeline.tier_rate(total)
+        customer_rate = pipeline.customer_rate(customer_type)
+        coupon_applied = bool(coupon_rate or coupon_amount)
+        if trace is not None:
+            if tier_rate:
+                trace.record("tier", "Tiered discount", tier_rate)
+            if customer_rate:
+                trace.record("customer", customer_type.value, customer_rate)
+            if coupon_applied:
+                trace.record("coupon", coupon_code, coupon_rate or coupon_amount)
+            self._tracer.emit(trace, final_price)
+        return PricingResult(subtotal, from_minor_units(bundle_savings), tier_rate, customer_rate,
+                             coupon_code if coupon_applied else None, coupon_rate, coupon_amount, None, final_price)
+
+    # Price many carts at once; returns the same final prices as calculate_final_price, per cart
+    def price_batch(self, carts: List['ShoppingCart']) -> np.ndarray:
+        cart_count = len(carts)
+        pipeline = self._pipeline
+
+        # Per-cart running subtotals in cents, and customer, coupon and promotion settings as
+        # rates in millionths and amounts in cents
+        subtotals = np.array([cart.get_subtotal_minor_units() for cart in carts], dtype=np.int64)
+        customer_rate_units = pipeline.customer_rate_units()
+        customer_rates = np.array([customer_rate_units[cart.get_customer().get_customer_type()] for cart in carts],
+                                  dtype=np.int64)
+        coupon_codes = [cart.get_coupon_code() for cart in carts]
+        coupons = {code: self.coupon_discount(code) for code in set(coupon_codes)}
+        coupon_rates = np.array([to_rate_units(coupons[code][0]) for code in coupon_codes], dtype=np.int64)
+        coupon_amounts = np.array([to_minor_units(coupons[code][1]) for code in coupon_codes], dtype=np.int64)
+        promotions = np.array([cart.is_promotion_active() for cart in carts], dtype=bool)
+
+        # Only carts holding a trigger product need their lines flattened for bundle rules;
+        # SKUs are numbered in order of appearance
+        trigger_skus = self._bundle_engine.get_trigger_skus()
+        sku_ids: Dict[str, int] = {}
+        line_carts: List[int] = []
+        line_skus: List[int] = []
+        line_prices: List[int] = []
+        line_quantities: List[int] = []
+        for index, cart in enumerate(carts):
+            if trigger_skus.isdisjoint(cart.get_sku_counts()):
+                continue
+            items = cart.get_items()
+            line_carts.extend([index] * len(items))
+            for item in items:
+                product = item.get_product()
+                line_prices.append(to_minor_units(product.get_price()))
+                line_quantities.append(item.get_quantity())
+                line_skus.append(sku_ids.setdefault(product.get_sku(), len(sku_ids)))
+
+        bundle_savings = self._bundle_engine.evaluate_batch(
+            list(sku_ids), np.asarray(line_carts, dtype=np.intp), np.asarray(line_skus, dtype=np.intp),
+            np.asarray(line_prices, dtype=np.int64), np.asarray(line_quantities, dtype=np.int64), cart_count,
+            pipeline.get_rounding())
+
+        totals = subtotals - bundle_savings
+        discounts = pipeline.tier_rate_units(totals)
+        discounts += customer_rates
+        discounts += coupon_rates
+        totals -= coupon_amounts
+        final_prices = pipeline.discounted_prices(totals, discounts)
 
-        return total * (1 - discount)
+        prices = np.where(promotions, pipeline.promotion_prices(subtotals), final_prices)
+        return prices / MINOR_UNITS
@@ -1,8 +1,170 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import ExitStack
+from typing import Dict, List, Optional, Sequence
+
+from CartItem import CartItem
+from CheckoutMetrics import CheckoutMetrics
+from Product import Product
+from ProductCatalog import ProductCatalog
+from StockLedger import StockLedger
+from StockReservation import StockReservation
+
+DEFAULT_LOCK_STRIPES = 64
+DEFAULT_RESERVATION_TIMEOUT = 600.0  # seconds
+
+
 class InventoryService:
+    def __init__(self, lock_stripes: int = DEFAULT_LOCK_STRIPES,
+                 reservation_timeout: float = DEFAULT_RESERVATION_TIMEOUT, clock=time.monotonic,
+                 catalog: Optional[ProductCatalog] = None, stock_ledger: Optional[StockLedger] = None,
+                 metrics: Optional[CheckoutMetrics] = None):
+        self._catalog = catalog if catalog is not None else ProductCatalog()
+        # Optional shared stock backend; Product objects passing through are attached to it
+        self._stock_ledger = stock_ledger
+        # Striped stock locks: updates to products on different stripes run in parallel
+        self._stock_locks = [threading.Lock() for _ in range(lock_stripes)]
+        self._reservation_timeout = reservation_timeout
+        self._clock = clock
+        self._reservation_ids = itertools.count(1)
+        self._reservations_lock = threading.Lock()
+        self._pending: Dict[int, StockReservation] = {}
+        self._expiry_queue = []  # (expires_at, reservation_id) heap
+        self._metrics = metrics  # update_stock and reserve are timed when set
+
+    def get_catalog(self) -> ProductCatalog:
+        return self._catalog
+
+    def get_stock_ledger(self) -> Optional[StockLedger]:
+        return self._stock_ledger
+
+    # Move a product's stock into the shared ledger the first time the service sees it
+    def _use_ledger(self, product):
+        if isinstance(product, Product) and product.get_stock_ledger() is not self._stock_ledger:
+            product.attach_stock_ledger(self._stock_ledger)
+
+    # Locks guarding the given products, in stripe order so concurrent callers cannot deadlock
+    def _stock_locks_for(self, products) -> List[threading.Lock]:
+        stripes = sorted({hash(product) % len(self._stock_locks) for product in products})
+        return [self._stock_locks[stripe] for stripe in stripes]
+
+    def get_metrics(self) -> Optional[CheckoutMetrics]:
+        return self._metrics
 
     def update_stock(self, item):
+        if self._metrics is not None:
+            return self._metrics.call("update_stock", self._update_stock, item)
+        self._update_stock(item)
+
+    def _update_stock(self, item):
         product = item.get_product()
+        if self._stock_ledger is not None:
+            self._use_ledger(product)
         try:
-            product.reduce_stock(item.get_quantity())
+            with self._stock_locks_for([product])[0]:
+                product.reduce_stock(item.get_quantity())
         except ValueError:
             raise RuntimeError(f"Failed to update stock for product: {product.get_name()}")
+
+    # Take stock for many catalog rows at once, all or nothing
+    def reduce_stock_many(self, rows: Sequence[int], quantities: Sequence[int]):
+        table = self._catalog.get_table()
+        try:
+            products = {table.row(row) for row in rows}
+        except IndexError as e:
+            raise RuntimeError(f"Failed to update stock: {e}")
+        with ExitStack() as stack:
+            for lock in self._stock_locks_for(products):
+                stack.enter_context(lock)
+            try:
+                self._catalog.reduce_stock_many(rows, quantities)
+            except ValueError as e:
+                raise RuntimeError(f"Failed to update stock: {e}")
+
+    # Take the stock for every line of a cart at once, or none of it if any line is short
+    def reserve(self, items: List[CartItem], timeout: float = None) -> StockReservation:
+        if self._metrics is not None:
+            return self._metrics.call("reserve", self._reserve, items, timeout)
+        return self._reserve(items, timeout)
+
+    def _reserve(self, items: List[CartItem], timeout: Optional[float]) -> StockReservation:
+        self.release_expired()
+
+        quantities: Dict[Product, int] = {}
+        for item in items:
+            quantities[item.get_product()] = quantities.get(item.get_product(), 0) + item.get_quantity()
+
+        if self._stock_ledger is not None:
+            for product in quantities:
+                self._use_ledger(product)
+
+        # Each reduction is atomic on its own; a short line puts back the ones already taken,
+        # which also covers other processes sharing a stock ledger
+        with ExitStack() as stack:
+            for lock in self._stock_locks_for(quantities):
+                stack.enter_context(lock)
+            taken = []
+            for product, quantity in quantities.items():
+                try:
+                    product.reduce_stock(quantity)
+                except ValueError:
+                    for taken_product, taken_quantity in taken:
+                        taken_product.add_stock(taken_quantity)
+                    raise RuntimeError(f"Failed to reserve stock for product: {product.get_name()}")
+                taken.append((product, quantity))
+
+        timeout = self._reservation_timeout if timeout is None else timeout
+        reservation = StockReservation(next(self._reservation_ids), list(quantities.items()), self._clock() + timeout)
+        with self._reservations_lock:
+            self._pending[reservation.get_reservation_id()] = reservation
+            heapq.heappush(self._expiry_queue, (reservation.get_expires_at(), reservation.get_reservation_id()))
+        return reservation
+
+    # Awaitable reserve for async checkouts. It runs in a worker thread, so waiting for a
+    # contended stripe lock or the stock ledger does not stall the other tasks on the loop.
+    async def reserve_async(self, items: List[CartItem], timeout: float = None) -> StockReservation:
+        return await asyncio.to_thread(self.reserve, items, timeout)
+
+    # Make a reservation's stock reduction permanent
+    def commit(self, reservation: StockReservation):
+        with self._reservations_lock:
+            if self._pending.pop(reservation.get_reservation_id(), None) is None:
+                raise RuntimeError(f"Reservation {reservation.get_reservation_id()} is no longer pending "
+                                   f"({reservation.get_status()})")
+            reservation.set_status(StockReservation.COMMITTED)
+
+    # Return a pending reservation's stock; releasing a finished reservation does nothing
+    def release(self, reservation: StockReservation):
+        with self._reservations_lock:
+            if self._pending.pop(reservation.get_reservation_id(), None) is None:
+                return
+            reservation.set_status(StockReservation.RELEASED)
+        self._restock(reservation)
+
+    # Release every pending reservation whose timeout has passed
+    def release_expired(self):
+        now = self._clock()
+        expired = []
+        with self._reservations_lock:
+            while self._expiry_queue and self._expiry_queue[0][0] <= now:
+                _, reservation_id = heapq.heappop(self._expiry_queue)
+                reservation = self._pending.pop(reservation_id, None)
+                if reservation is not None:
+                    reservation.set_status(StockReservation.RELEASED)
+                    expired.append(reservation)
+        for reservation in expired:
+            self._restock(reservation)
+
+    def get_pending_count(self) -> int:
+        return len(self._pending)
+
+    def _restock(self, reservation: StockReservation):
+        products = [product for product, _ in reservation.get_lines()]
+        with ExitStack() as stack:
+            for lock in self._stock_locks_for(products):
+                stack.enter_context(lock)
+            for product, quantity in reservation.get_lines():
+                product.add_stock(quantity)
@@ -0,0 +1,117 @@
+from enum import Enum
+
+import numpy as np
+
+MINOR_UNITS = 100  # Cents per currency unit
+RATE_SCALE = 1_000_000  # Rates are held as integer millionths, so 0.15 is 150000
+
+
+class RoundingMode(Enum):
+    HALF_UP = "half_up"  # Halves away from zero, as on a till receipt
+    HALF_EVEN = "half_even"  # Halves to the even neighbour (banker's rounding)
+    DOWN = "down"  # Towards zero
+
+
+# Integer division rounded with the given mode; denominator must be positive
+def divide(numerator: int, denominator: int, rounding: RoundingMode) -> int:
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if rounding != RoundingMode.DOWN:
+        twice = 2 * remainder
+        if twice > denominator or (twice == denominator and (rounding == RoundingMode.HALF_UP or quotient & 1)):
+            quotient += 1
+    return -quotient if numerator < 0 else quotient
+
+
+# divide over an int64 array of numerators
+def divide_array(numerators: np.ndarray, denominator: int, rounding: RoundingMode) -> np.ndarray:
+    magnitudes = np.abs(numerators)
+    quotients, remainders = np.divmod(magnitudes, denominator)
+    if rounding != RoundingMode.DOWN:
+        twice = 2 * remainders
+        round_up = twice > denominator
+        if rounding == RoundingMode.HALF_UP:
+            round_up |= twice == denominator
+        else:
+            round_up |= (twice == denominator) & (quotients % 2 == 1)
+        quotients += round_up
+    return np.where(numerators < 0, -quotients, quotients)
+
+
+# Nearest whole number of cents to a float amount; exact for amounts quoted in cents
+def to_minor_units(amount: float) -> int:
+    return round(amount * MINOR_UNITS)
+
+
+# A float rate such as 0.15 as integer millionths
+def to_rate_units(rate: float) -> int:
+    return round(rate * RATE_SCALE)
+
+
+# Cents back to a float amount: the float nearest the exact decimal value
+def from_minor_units(minor_units: int) -> float:
+    return minor_units / MINOR_UNITS
+
+
+class Money:
+    """An exact amount of money held as an integer number of cents.
+
+    Sums and integer multiples are exact; the only rounding happens where a rate is
+    applied, with the RoundingMode the caller passes. The pricing hot path works on
+    the plain integers (see to_minor_units and divide); Money wraps them for callers
+    that want a value type.
+    """
+
+    __slots__ = ("_minor_units",)
+
+    def __init__(self, minor_units: int):
+        self._minor_units = int(minor_units)
+
+    @staticmethod
+    def from_float(amount: float) -> 'Money':
+        return Money(to_minor_units(amount))
+
+    def get_minor_units(self) -> int:
+        return self._minor_units
+
+    def to_float(self) -> float:
+        return from_minor_units(self._minor_units)
+
+    # This amount with a rate applied, e.g. apply_rate(0.85) for 15% off
+    def apply_rate(self, rate: float, rounding: RoundingMode = RoundingMode.HALF_UP) -> 'Money':
+        return Money(divide(self._minor_units * to_rate_units(rate), RATE_SCALE, rounding))
+
+    def __add__(self, other: 'Money') -> 'Money':
+        return Money(self._minor_units + other._minor_units)
+
+    def __sub__(self, other: 'Money') -> 'Money':
+        return Money(self._minor_units - other._minor_units)
+
+    def __mul__(self, quantity: int) -> 'Money':
+        if not isinstance(quantity, int):
+            raise TypeError("Money can only be multiplied by a whole quantity; use apply_rate for rates")
+        return Money(self._minor_units * quantity)
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> 'Money':
+        return Money(-self._minor_units)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Money) and self._minor_units == other._minor_units
+
+    def __lt__(self, other: 'Money') -> bool:
+        return self._minor_units < other._minor_units
+
+    def __le__(self, other: 'Money') -> bool:
+        return self._minor_units <= other._minor_units
+
+    def __hash__(self) -> int:
+        return hash(self._minor_units)
+
+    def __str__(self) -> str:
+        sign = "-" if self._minor_units < 0 else ""
+        units, cents = divmod(abs(self._minor_units), MINOR_UNITS)
+        return f"{sign}{units}.{cents:02d}"
+
+    def __repr__(self) -> str:
+        return f"Money('{self}')"
@@ -0,0 +1,256 @@
+import itertools
+import os
+import queue
+import struct
+import threading
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from CustomerType import CustomerType
+from OrderRecord import OrderOutcome, OrderRecord
+from PricingResult import PricingResult
+
+MAGIC = b"ORDERLOG"
+VERSION = 1
+_FILE_HEADER = struct.Struct("<8sI")  # magic, format version
+
+# Each record is a uint32 payload length followed by the payload:
+#   order id, timestamp, outcome, customer type, amount, has pricing
+#   [pricing: subtotal, bundle savings, tier rate, customer rate, coupon rate, coupon amount,
+#    promotion rate (-1 for none), final price; then the coupon code]
+#   message, line count, then per line: sku, quantity, unit price
+# Amounts and rates are the doubles the cart priced with, so they read back exactly;
+# strings are a uint16 byte length followed by UTF-8.
+_LENGTH = struct.Struct("<I")
+_HEADER = struct.Struct("<QdBBd?")
+_PRICING = struct.Struct("<dddddddd")
+_STRING_LENGTH = struct.Struct("<H")
+_LINE_COUNT = struct.Struct("<I")
+_LINE = struct.Struct("<Id")
+
+_CUSTOMER_TYPES = list(CustomerType)
+_CUSTOMER_TYPE_CODES = {customer_type: code for code, customer_type in enumerate(_CUSTOMER_TYPES)}
+_OUTCOMES = {outcome.value: outcome for outcome in OrderOutcome}
+
+_CLOSE = object()  # Queued by close() to stop the writer
+
+
+_EMPTY_STRING = _STRING_LENGTH.pack(0)
+_sku_strings: Dict[str, bytes] = {}  # Encoded SKUs, bounded by the catalog size
+
+
+def _pack_string(text: str) -> bytes:
+    if not text:
+        return _EMPTY_STRING
+    data = text.encode("utf-8")
+    return _STRING_LENGTH.pack(len(data)) + data
+
+
+def encode_record(record: OrderRecord) -> bytes:
+    pricing = record.pricing
+    parts = [_HEADER.pack(record.order_id, record.timestamp, record.outcome.value,
+                          _CUSTOMER_TYPE_CODES[record.customer_type], record.amount, pricing is not None)]
+    if pricing is not None:
+        parts.append(_PRICING.pack(
+            pricing.subtotal, pricing.bundle_savings, pricing.tier_rate, pricing.customer_rate, pricing.coupon_rate,
+            pricing.coupon_amount, -1.0 if pricing.promotion_rate is None else pricing.promotion_rate,
+            pricing.final_price))
+        parts.append(_pack_string(pricing.coupon_code))
+    parts.append(_pack_string(record.message))
+    parts.append(_LINE_COUNT.pack(len(record.lines)))
+    pack_line = _LINE.pack
+    for sku, quantity, unit_price in record.lines:
+        encoded_sku = _sku_strings.get(sku)
+        if encoded_sku is None:
+            encoded_sku = _sku_strings[sku] = _pack_string(sku)
+        parts.append(encoded_sku)
+        parts.append(pack_line(quantity, unit_price))
+    payload = b"".join(parts)
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def _unpack_string(payload: bytes, offset: int):
+    (length,) = _STRING_LENGTH.unpack_from(payload, offset)
+    offset += _STRING_LENGTH.size
+    return payload[offset:offset + length].decode("utf-8"), offset + length
+
+
+def decode_record(payload: bytes) -> OrderRecord:
+    order_id, timestamp, outcome, customer_type, amount, has_pricing = _HEADER.unpack_from(payload, 0)
+    offset = _HEADER.size
+    pricing = None
+    if has_pricing:
+        (subtotal, bundle_savings, tier_rate, customer_rate, coupon_rate, coupon_amount, promotion_rate,
+         final_price) = _PRICING.unpack_from(payload, offset)
+        coupon_code, offset = _unpack_string(payload, offset + _PRICING.size)
+        pricing = PricingResult(subtotal, bundle_savings, tier_rate, customer_rate, coupon_code or None, coupon_rate,
+                                coupon_amount, None if promotion_rate < 0 else promotion_rate, final_price)
+    message, offset = _unpack_string(payload, offset)
+    (line_count,) = _LINE_COUNT.unpack_from(payload, offset)
+    offset += _LINE_COUNT.size
+    lines = []
+    for _ in range(line_count):
+        sku, offset = _unpack_string(payload, offset)
+        quantity, unit_price = _LINE.unpack_from(payload, offset)
+        offset += _LINE.size
+        lines.append((sku, quantity, unit_price))
+    return OrderRecord(order_id, timestamp, _OUTCOMES[outcome], _CUSTOMER_TYPES[customer_type], tuple(lines),
+                       pricing, amount, message)
+
+
+class OrderLog:
+    """An append-only binary log of order attempts.
+
+    append only queues the record, so checkout never waits on the disk. A background
+    writer encodes everything queued since its last write and appends it with one
+    write and one flush (group commit), plus an fsync when ``durable`` is set. Records
+    are length-prefixed, so read can stream a log back; a record torn by a crash is
+    cut off when the log is next opened.
+    """
+
+    def __init__(self, path: str, durable: bool = False, max_batch: int = 4096):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self._path = path
+        self._durable = durable
+        self._max_batch = max_batch
+        # Reopening scans the log once, for the last order id and the end of the last whole record
+        last_order_id, end = self._recover(path)
+        self._file: BinaryIO = open(path, "r+b" if end else "wb")
+        if end:
+            self._file.truncate(end)
+            self._file.seek(end)
+        else:
+            self._file.write(_FILE_HEADER.pack(MAGIC, VERSION))
+            self._file.flush()
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._order_ids = itertools.count(last_order_id + 1)
+        self._records_written = 0
+        self._records_rejected = 0
+        self._commits = 0
+        self._error: Optional[Exception] = None
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="order-log-writer", daemon=True)
+        self._writer.start()
+
+    def get_path(self) -> str:
+        return self._path
+
+    # Next order id; ids keep increasing across reopenings of the same log
+    def next_order_id(self) -> int:
+        return next(self._order_ids)
+
+    # Queue a record for the writer; returns immediately
+    def append(self, record: OrderRecord):
+        if self._closed:
+            raise RuntimeError("Order log is closed")
+        self._queue.put(record)
+
+    # Block until every record appended so far has been written; raises if the writer failed
+    def flush(self):
+        if not self._closed:
+            written = threading.Event()
+            self._queue.put(written)
+            while not written.wait(0.1):
+                if not self._writer.is_alive():
+                    break
+        if self._error is not None:
+            raise RuntimeError(f"Order log write failed: {self._error}") from self._error
+
+    # Records written, records skipped because they could not be encoded, and writes made
+    def get_stats(self) -> Dict[str, int]:
+        return {"records": self._records_written, "rejected": self._records_rejected, "commits": self._commits}
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_CLOSE)
+        self._writer.join()
+        self._file.close()
+
+    def __enter__(self) -> 'OrderLog':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self._max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self._commit([item for item in batch if isinstance(item, OrderRecord)])
+            except Exception as e:
+                self._error = e  # A writer bug is reported like a failed write, not left to hang flush
+            finally:
+                for item in batch:
+                    if isinstance(item, threading.Event):
+                        item.set()
+            if any(item is _CLOSE for item in batch):
+                return
+
+    # Encode records one by one, skipping any that cannot be encoded (e.g. a negative
+    # quantity or an over-long SKU), and append the rest with one write
+    def _commit(self, records: List[OrderRecord]):
+        if not records or self._error is not None:
+            return
+        encoded = []
+        for record in records:
+            try:
+                encoded.append(encode_record(record))
+            except (ValueError, KeyError, AttributeError, TypeError, struct.error):
+                self._records_rejected += 1
+        if not encoded:
+            return
+        try:
+            self._file.write(b"".join(encoded))
+            self._file.flush()
+            if self._durable:
+                os.fsync(self._file.fileno())
+        except OSError as e:
+            self._error = e  # Later records are dropped; flush reports the failure
+            return
+        self._records_written += len(encoded)
+        self._commits += 1
+
+    # Last order id in an existing log and the offset just past its last whole record;
+    # (0, 0) when there is no log yet
+    @staticmethod
+    def _recover(path: str) -> Tuple[int, int]:
+        if not os.path.exists(path) or os.path.getsize(path) < _FILE_HEADER.size:
+            return 0, 0
+        last_order_id = 0
+        end = _FILE_HEADER.size
+        for record, end in OrderLog._scan(path):
+            last_order_id = max(last_order_id, record.order_id)
+        return last_order_id, end
+
+    # Stream the records of a log file in the order they were written
+    @staticmethod
+    def read(path: str) -> Iterator[OrderRecord]:
+        for record, _ in OrderLog._scan(path):
+            yield record
+
+    @staticmethod
+    def _scan(path: str) -> Iterator[Tuple[OrderRecord, int]]:
+        with open(path, "rb") as file:
+            header = file.read(_FILE_HEADER.size)
+            if len(header) < _FILE_HEADER.size:
+                return
+            magic, version = _FILE_HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Not an order log (version {VERSION}): {path}")
+            while True:
+                prefix = file.read(_LENGTH.size)
+                if len(prefix) < _LENGTH.size:
+                    return
+                (length,) = _LENGTH.unpack(prefix)
+                payload = file.read(length)
+                if len(payload) < length:
+                    return  # Torn final record
+                yield decode_record(payload), file.tell()
@@ -0,0 +1,42 @@
+import time
+from enum import Enum
+from typing import NamedTuple, Optional, Tuple
+
+from CustomerType import CustomerType
+from PricingResult import PricingResult
+
+
+class OrderOutcome(Enum):
+    COMPLETED = 0
+    OUT_OF_STOCK = 1
+    COUPON_UNAVAILABLE = 2
+    PAYMENT_FAILED = 3
+    CHARGED_NOT_FULFILLED = 4  # Paid for, but the stock was gone by then; needs a refund
+
+
+class OrderRecord(NamedTuple):
+    """One place_order attempt as written to the OrderLog.
+
+    ``lines`` holds (sku, quantity, unit price) per cart line as they were at checkout,
+    ``amount`` what the customer was charged (0 when payment was not reached) and
+    ``message`` the failure reason, empty for completed orders.
+    """
+
+    order_id: int
+    timestamp: float
+    outcome: OrderOutcome
+    customer_type: CustomerType
+    lines: Tuple[Tuple[str, int, float], ...]
+    pricing: Optional[PricingResult]
+    amount: float
+    message: str
+
+    # pricing is the cart's PricingResult taken before checkout redeemed its coupon; the
+    # cart is priced now when it is not given
+    @staticmethod
+    def from_cart(order_id: int, cart: 'ShoppingCart', outcome: OrderOutcome, amount: float = 0.0,
+                  message: str = "", pricing: Optional[PricingResult] = None) -> 'OrderRecord':
+        lines = tuple([(item.product.get_sku(), item.quantity, item.product.get_price())
+                       for item in cart.get_items()])
+        return OrderRecord(order_id, time.time(), outcome, cart.get_customer().get_customer_type(), lines,
+                           cart.get_pricing() if pricing is None else pricing, amount, message)
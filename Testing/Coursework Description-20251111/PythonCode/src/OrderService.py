@@ -1,23 +1,163 @@
-import threading
+from typing import Optional
 
+from CheckoutMetrics import CheckoutMetrics
+from OrderLog import OrderLog
+from OrderRecord import OrderOutcome, OrderRecord
+from PricingResult import PricingResult
 from ShoppingCart import ShoppingCart
+from StockReservation import StockReservation
+
 
 class OrderService:
-    def __init__(self, payment_service: 'PaymentService', inventory_service: 'InventoryService'):
+    def __init__(self, payment_service: 'PaymentService', inventory_service: 'InventoryService',
+                 order_log: Optional[OrderLog] = None, metrics: Optional[CheckoutMetrics] = None):
         self._payment_service = payment_service
         self._inventory_service = inventory_service
-        self._order_lock = threading.Lock()  # Lock for thread safety
+        self._order_log = order_log  # Every order attempt is recorded here when set
+        # place_order and its calculate_total and process_payment calls are timed when set
+        self._metrics = metrics
+
+    def get_order_log(self) -> Optional[OrderLog]:
+        return self._order_log
+
+    def get_metrics(self) -> Optional[CheckoutMetrics]:
+        return self._metrics
 
     def place_order(self, cart: ShoppingCart, credit_card_number: str) -> bool:
-        with self._order_lock:  # Ensure only one thread places an order at a time
-            try:
-                # Check stock and update it
-                for item in cart.get_items():
-                    self._inventory_service.update_stock(item)
+        if self._metrics is not None:
+            return self._metrics.call("place_order", self._place_order, cart, credit_card_number)
+        return self._place_order(cart, credit_card_number)
+
+    def _place_order(self, cart: ShoppingCart, credit_card_number: str) -> bool:
+        metrics = self._metrics
+        pricing = self._checkout_pricing(cart)
+        try:
+            # Reserve stock for every line at once; nothing is taken if any line is short
+            reservation = self._inventory_service.reserve(cart.get_items())
+        except Exception as e:
+            return self._fail_order(cart, pricing, OrderOutcome.OUT_OF_STOCK, e)
+
+        try:
+            # Use up the coupon before charging, so a single-use code pays for one order only;
+            # then apply discounts and process payment, no stock lock is held meanwhile
+            coupon_code = self._redeem_coupon(cart, pricing)
+        except RuntimeError as e:
+            self._inventory_service.release(reservation)
+            return self._fail_order(cart, pricing, OrderOutcome.COUPON_UNAVAILABLE, e)
 
-                # Apply discounts and process payment
+        try:
+            if metrics is None:
                 total = cart.calculate_total()
-                return self._payment_service.process_payment(credit_card_number, total)
-            except Exception as e:
-                print(f"Order failed: {e}")
-                return False
+                paid = self._payment_service.process_payment(credit_card_number, total)
+            else:
+                # Timed here rather than in ShoppingCart and PaymentService, so payment
+                # services that override process_payment are timed too
+                total = metrics.call("calculate_total", cart.calculate_total)
+                paid = metrics.call("process_payment", self._payment_service.process_payment, credit_card_number,
+                                    total)
+        except Exception as e:
+            self._release_order(cart, reservation, coupon_code)
+            return self._fail_order(cart, pricing, OrderOutcome.PAYMENT_FAILED, e)
+
+        return self._complete_order(cart, pricing, reservation, coupon_code, total, paid)
+
+    # Async checkout: many orders waiting on payment overlap on one event loop
+    async def place_order_async(self, cart: ShoppingCart, credit_card_number: str) -> bool:
+        pricing = self._checkout_pricing(cart)
+        try:
+            reservation = await self._inventory_service.reserve_async(cart.get_items())
+        except Exception as e:
+            return self._fail_order(cart, pricing, OrderOutcome.OUT_OF_STOCK, e)
+
+        try:
+            coupon_code = self._redeem_coupon(cart, pricing)
+        except RuntimeError as e:
+            self._inventory_service.release(reservation)
+            return self._fail_order(cart, pricing, OrderOutcome.COUPON_UNAVAILABLE, e)
+
+        try:
+            total = cart.calculate_total()
+            paid = await self._payment_service.process_payment_async(credit_card_number, total)
+        except Exception as e:
+            self._release_order(cart, reservation, coupon_code)
+            return self._fail_order(cart, pricing, OrderOutcome.PAYMENT_FAILED, e)
+
+        return self._complete_order(cart, pricing, reservation, coupon_code, total, paid)
+
+    # The cart's pricing as the customer saw it, taken before the coupon is redeemed (a
+    # used-up single-use code would price without it); None when neither a coupon nor
+    # the order log needs it
+    def _checkout_pricing(self, cart: ShoppingCart) -> Optional[PricingResult]:
+        if self._order_log is None and not cart.get_coupon_code():
+            return None
+        return cart.get_pricing()
+
+    # Redeem the registered coupon the cart was priced with; returns the code redeemed, or
+    # None when the cart has no registered coupon. A registered coupon that is used up or
+    # expired fails the order, whether that happened before checkout or during it.
+    @staticmethod
+    def _redeem_coupon(cart: ShoppingCart, pricing: Optional[PricingResult]) -> Optional[str]:
+        coupon_code = cart.get_coupon_code()
+        registry = cart.get_discount_service().get_coupon_registry()
+        if not coupon_code or registry.get(coupon_code) is None:
+            return None
+        if pricing.coupon_code != coupon_code or not registry.redeem(coupon_code):
+            raise RuntimeError(f"Coupon is no longer available: {coupon_code}")
+        return coupon_code
+
+    # Give back the reserved stock and the redeemed coupon of an order that did not go through
+    def _release_order(self, cart: ShoppingCart, reservation: StockReservation, coupon_code: Optional[str]):
+        self._inventory_service.release(reservation)
+        if coupon_code is not None:
+            cart.get_discount_service().get_coupon_registry().release(coupon_code)
+
+    # Commit the reserved stock after a successful payment, otherwise give it back
+    def _complete_order(self, cart: ShoppingCart, pricing: Optional[PricingResult], reservation: StockReservation,
+                        coupon_code: Optional[str], total: float, paid: bool) -> bool:
+        if not paid:
+            self._release_order(cart, reservation, coupon_code)
+            self._record(cart, pricing, OrderOutcome.PAYMENT_FAILED, 0.0, "Payment declined")
+            return False
+        try:
+            self._inventory_service.commit(reservation)
+        except RuntimeError as e:
+            return self._fulfil_charged_order(cart, pricing, coupon_code, total, e)
+        return self._order_completed(cart, pricing, coupon_code, total)
+
+    # The reservation expired while payment was in flight and the customer has been charged:
+    # take the stock again if it is still there, otherwise give the coupon back and record the
+    # order as charged but not fulfilled, with the amount charged, so it can be refunded
+    def _fulfil_charged_order(self, cart: ShoppingCart, pricing: Optional[PricingResult], coupon_code: Optional[str],
+                              total: float, error: RuntimeError) -> bool:
+        try:
+            self._inventory_service.commit(self._inventory_service.reserve(cart.get_items()))
+        except RuntimeError as e:
+            if coupon_code is not None:
+                cart.get_discount_service().get_coupon_registry().release(coupon_code)
+            print(f"Order charged but not fulfilled: {error}; {e}")
+            self._record(cart, pricing, OrderOutcome.CHARGED_NOT_FULFILLED, total, f"{error}; {e}")
+            return False
+        return self._order_completed(cart, pricing, coupon_code, total)
+
+    # Record a completed order; a cart whose coupon was redeemed keeps the pricing the
+    # order was placed at, since the registry no longer applies a used-up code
+    def _order_completed(self, cart: ShoppingCart, pricing: Optional[PricingResult], coupon_code: Optional[str],
+                         total: float) -> bool:
+        if coupon_code is not None:
+            cart.set_placed_pricing(pricing)
+        self._record(cart, pricing, OrderOutcome.COMPLETED, total)
+        return True
+
+    # Report and record a failed order
+    def _fail_order(self, cart: ShoppingCart, pricing: Optional[PricingResult], outcome: OrderOutcome,
+                    error: Exception) -> bool:
+        print(f"Order failed: {error}")
+        self._record(cart, pricing, outcome, 0.0, str(error))
+        return False
+
+    # Queue the order attempt on the order log, if there is one
+    def _record(self, cart: ShoppingCart, pricing: Optional[PricingResult], outcome: OrderOutcome, amount: float,
+                message: str = ""):
+        if self._order_log is not None:
+            self._order_log.append(OrderRecord.from_cart(self._order_log.next_order_id(), cart, outcome, amount,
+                                                         message, pricing))
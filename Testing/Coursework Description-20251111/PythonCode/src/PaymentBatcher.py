@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Tuple
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 0.005  # seconds
+
+
+class PaymentBatcher:
+    """Collects payments from many callers and submits them through
+    PaymentService.process_payments_batch.
+
+    A batch is sent once it holds ``batch_size`` payments or ``flush_interval``
+    seconds after its first payment arrived, whichever comes first. Every caller
+    gets its own payment's outcome back. The batcher has the same process_payment
+    methods as PaymentService, so it can be handed to OrderService in its place.
+    """
+
+    def __init__(self, payment_service: 'PaymentService', batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self._payment_service = payment_service
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: "queue.Queue[Tuple[str, float, Future]]" = queue.Queue()
+        self._batches_sent = 0
+        self._closed = False
+        self._closed_lock = threading.Lock()  # Nothing is queued after the stop sentinel
+        self._worker = threading.Thread(target=self._run, name="payment-batcher", daemon=True)
+        self._worker.start()
+
+    # Queue a payment; the future resolves to True or raises the payment's exception
+    def submit(self, credit_card_number: str, amount: float) -> Future:
+        future = Future()
+        with self._closed_lock:
+            if self._closed:
+                raise RuntimeError("Payment batcher is closed")
+            self._queue.put((credit_card_number, amount, future))
+        return future
+
+    def process_payment(self, credit_card_number: str, amount: float) -> bool:
+        return self.submit(credit_card_number, amount).result()
+
+    async def process_payment_async(self, credit_card_number: str, amount: float) -> bool:
+        return await asyncio.wrap_future(self.submit(credit_card_number, amount))
+
+    def get_batches_sent(self) -> int:
+        return self._batches_sent
+
+    # Send whatever is queued and stop the background thread
+    def close(self):
+        with self._closed_lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+        self._worker.join()
+
+    # Whatever way the worker stops, no caller is left waiting on a payment it will not send
+    def _run(self):
+        batch: List[Tuple[str, float, Future]] = []
+        try:
+            self._send_batches(batch)
+        except Exception:
+            logging.getLogger("payments").exception("Payment batcher stopped")
+        finally:
+            with self._closed_lock:
+                self._closed = True
+            leftovers = [future for _, _, future in batch]
+            while True:
+                try:
+                    entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is not None:
+                    leftovers.append(entry[2])
+            for future in leftovers:
+                if not future.done():
+                    future.set_exception(RuntimeError("Payment batcher is closed"))
+
+    # Collect and send batches until the stop sentinel; batch is filled in place, so the
+    # payments of a batch that was being sent when something failed can still be answered
+    def _send_batches(self, batch: List[Tuple[str, float, Future]]):
+        while True:
+            batch.clear()
+            entry = self._queue.get()
+            if entry is None:
+                return
+            batch.append(entry)
+            deadline = time.monotonic() + self._flush_interval
+            stop = False
+            while len(batch) < self._batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+            self._send(batch)
+            if stop:
+                return
+
+    # Submit one batch and hand each caller its own result
+    def _send(self, batch: List[Tuple[str, float, Future]]):
+        self._batches_sent += 1
+        try:
+            results = self._payment_service.process_payments_batch([(card, amount) for card, amount, _ in batch])
+        except Exception as e:
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, _, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+        for _, _, future in batch[len(results):]:
+            future.set_exception(RuntimeError("Payment processor returned no result for this payment"))
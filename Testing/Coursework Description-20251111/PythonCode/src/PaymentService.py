@@ -1,7 +1,45 @@
+from typing import List, Optional, Tuple, Union
+
+from CardValidator import CardValidator
+
+
 class PaymentService:
+    def __init__(self, card_validator: Optional[CardValidator] = None):
+        # Default checks: 16 ASCII digits; pass a configured CardValidator for Luhn and BIN checks
+        self._card_validator = card_validator if card_validator is not None else CardValidator()
 
     def process_payment(self, credit_card_number: str, amount: float) -> bool:
         # Simulating payment processing
-        if len(credit_card_number) != 16 and amount <= 0:
+        self._validate(credit_card_number, amount)
+        return True
+
+    # Awaitable interface for async callers; subclasses talking to a real processor override it
+    async def process_payment_async(self, credit_card_number: str, amount: float) -> bool:
+        return self.process_payment(credit_card_number, amount)
+
+    # Validate many payments and send the valid ones to the processor in one submission.
+    # Each result is True, or the exception process_payment would have raised for that payment.
+    def process_payments_batch(self, payments: List[Tuple[str, float]]) -> List[Union[bool, Exception]]:
+        results: List[Union[bool, Exception]] = []
+        accepted: List[int] = []
+        cards_valid = self._card_validator.validate_batch([credit_card_number for credit_card_number, _ in payments])
+        for position, (valid, (_, amount)) in enumerate(zip(cards_valid, payments)):
+            if valid and amount > 0:
+                accepted.append(position)
+                results.append(True)
+            else:
+                results.append(Exception("Payment failed: Invalid card or amount."))
+
+        outcomes = self._submit_batch([payments[position] for position in accepted])
+        for position, outcome in zip(accepted, outcomes):
+            results[position] = outcome
+        return results
+
+    # Reject the payment if either the card or the amount is invalid
+    def _validate(self, credit_card_number: str, amount: float):
+        if not self._card_validator.validate(credit_card_number) or amount <= 0:
             raise Exception("Payment failed: Invalid card or amount.")
-        return True
\ No newline at end of file
+
+    # Send validated payments to the processor in one round trip (simulated)
+    def _submit_batch(self, payments: List[Tuple[str, float]]) -> List[Union[bool, Exception]]:
+        return [True] * len(payments)
@@ -0,0 +1,94 @@
+from bisect import bisect_left
+from typing import Callable, Dict
+
+import numpy as np
+
+from CustomerType import CustomerType
+from Money import RATE_SCALE, RoundingMode, divide, divide_array, to_minor_units, to_rate_units
+from PricingPolicy import PricingPolicy
+
+# Final price in cents of a cart from its value in cents after bundle savings and its
+# coupon's rate (in millionths) and amount (in cents)
+PriceStage = Callable[[int, int, int], int]
+
+
+class PricingPipeline:
+    """A PricingPolicy compiled for fast, exact pricing.
+
+    Tier thresholds are held in cents in ascending order so the tier for a cart value is
+    one bisect, and each customer type gets its own price stage with the customer rate
+    bound in, so pricing a cart walks no branch ladder. Rates are integer millionths and
+    amounts integer cents, so the only rounding is the policy's, once per price.
+    Compiled once per policy.
+    """
+
+    def __init__(self, policy: PricingPolicy):
+        self._policy = policy
+        self._rounding = policy.get_rounding()
+        tiers = sorted(policy.get_tiers())
+        self._thresholds = [to_minor_units(threshold) for threshold, _ in tiers]
+        # Rate for the number of thresholds a value is above; index 0 is "no tier"
+        self._tier_rates = [0.0] + [rate for _, rate in tiers]
+        self._tier_rate_units = [to_rate_units(rate) for rate in self._tier_rates]
+        self._customer_rates = dict(policy.get_customer_discounts())
+        self._promotion_rate_units = to_rate_units(policy.get_promotion_rate())
+        self._stages: Dict[CustomerType, PriceStage] = {
+            customer_type: self._compile_stage(to_rate_units(rate))
+            for customer_type, rate in self._customer_rates.items()}
+
+    def _compile_stage(self, customer_rate_units: int) -> PriceStage:
+        thresholds = self._thresholds
+        tier_rate_units = self._tier_rate_units
+        rounding = self._rounding
+        # Half-up rounding of a non-negative amount needs no call into divide
+        half = RATE_SCALE // 2 if rounding == RoundingMode.HALF_UP else None
+
+        def price(total: int, coupon_rate: int, coupon_amount: int) -> int:
+            discount = tier_rate_units[bisect_left(thresholds, total)] + customer_rate_units + coupon_rate
+            amount = (total - coupon_amount) * (RATE_SCALE - discount)
+            if half is not None and amount >= 0:
+                return (amount + half) // RATE_SCALE
+            return divide(amount, RATE_SCALE, rounding)
+
+        return price
+
+    def get_policy(self) -> PricingPolicy:
+        return self._policy
+
+    def get_rounding(self) -> RoundingMode:
+        return self._rounding
+
+    # Price stage for a customer type
+    def stage(self, customer_type: CustomerType) -> PriceStage:
+        return self._stages[customer_type]
+
+    # Rate of the highest tier a cart value in cents is above, 0 below every tier
+    def tier_rate(self, total: int) -> float:
+        return self._tier_rates[bisect_left(self._thresholds, total)]
+
+    def customer_rate(self, customer_type: CustomerType) -> float:
+        return self._customer_rates[customer_type]
+
+    # Tier rates in millionths for an int64 array of cart values in cents
+    def tier_rate_units(self, totals: np.ndarray) -> np.ndarray:
+        return np.asarray(self._tier_rate_units, dtype=np.int64)[np.searchsorted(self._thresholds, totals,
+                                                                                  side="left")]
+
+    # Customer rates in millionths, per customer type
+    def customer_rate_units(self) -> Dict[CustomerType, int]:
+        return {customer_type: to_rate_units(rate) for customer_type, rate in self._customer_rates.items()}
+
+    def get_promotion_rate(self) -> float:
+        return self._policy.get_promotion_rate()
+
+    # Promotion price in cents of a subtotal in cents
+    def promotion_price(self, total: int) -> int:
+        return divide(total * self._promotion_rate_units, RATE_SCALE, self._rounding)
+
+    # promotion_price for an int64 array of subtotals in cents
+    def promotion_prices(self, totals: np.ndarray) -> np.ndarray:
+        return divide_array(totals * self._promotion_rate_units, RATE_SCALE, self._rounding)
+
+    # Final prices in cents for int64 arrays of cart values less coupon amounts, and combined rates
+    def discounted_prices(self, totals: np.ndarray, discounts: np.ndarray) -> np.ndarray:
+        return divide_array(totals * (RATE_SCALE - discounts), RATE_SCALE, self._rounding)
@@ -0,0 +1,97 @@
+import json
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Tuple
+
+from CustomerType import CustomerType
+from Money import RoundingMode
+
+
+class PricingPolicy:
+    """The discount rates DiscountService prices with: cart-value tiers as
+    (threshold, rate) pairs, where a cart takes the rate of the highest threshold its
+    value is above, an additional rate per customer type, and the share of the subtotal
+    paid while a promotion runs (0.75 is 25% off). Prices are computed in whole cents
+    and ``rounding`` says how a discounted price is rounded to the cent.
+
+    Policies are immutable, so a DiscountService can compile one once and share it
+    between threads.
+    """
+
+    __slots__ = ("_tiers", "_customer_discounts", "_promotion_rate", "_rounding")
+
+    def __init__(self, tiers: Iterable[Tuple[float, float]], customer_discounts: Mapping[CustomerType, float],
+                 promotion_rate: float, rounding: RoundingMode = RoundingMode.HALF_UP):
+        tiers = tuple(sorted(((float(threshold), float(rate)) for threshold, rate in tiers), reverse=True))
+        if len({threshold for threshold, _ in tiers}) != len(tiers):
+            raise ValueError("Tier thresholds must be unique")
+        if any(not 0 <= rate <= 1 for _, rate in tiers):
+            raise ValueError("Tier rates must be between 0 and 1")
+        missing = [customer_type.value for customer_type in CustomerType if customer_type not in customer_discounts]
+        if missing:
+            raise ValueError(f"No customer discount for: {', '.join(missing)}")
+        if any(not 0 <= rate <= 1 for rate in customer_discounts.values()):
+            raise ValueError("Customer discount rates must be between 0 and 1")
+        if not 0 <= promotion_rate <= 1:
+            raise ValueError("Promotion rate must be between 0 and 1")
+        if not isinstance(rounding, RoundingMode):
+            raise ValueError("rounding must be an instance of RoundingMode")
+        self._tiers = tiers
+        self._customer_discounts = MappingProxyType({customer_type: float(customer_discounts[customer_type])
+                                                     for customer_type in CustomerType})
+        self._promotion_rate = float(promotion_rate)
+        self._rounding = rounding
+
+    # Build a policy from its config form:
+    # {"tiers": [{"threshold": 1000, "rate": 0.15}, ...],
+    #  "customer_discounts": {"Regular": 0.0, ...}, "promotion_rate": 0.75, "rounding": "half_up"}
+    # rounding is optional and defaults to half_up
+    @staticmethod
+    def from_dict(config: Mapping[str, Any]) -> 'PricingPolicy':
+        try:
+            tiers = [(tier["threshold"], tier["rate"]) for tier in config["tiers"]]
+            customer_discounts = {CustomerType(name): rate for name, rate in config["customer_discounts"].items()}
+            promotion_rate = config["promotion_rate"]
+            rounding = RoundingMode(config.get("rounding", RoundingMode.HALF_UP.value))
+            # Values of the wrong type (null, "0.75") only fail in the constructor's checks
+            return PricingPolicy(tiers, customer_discounts, promotion_rate, rounding)
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise ValueError(f"Invalid pricing policy config: {e}") from e
+
+    # Read a policy from a JSON config file
+    @staticmethod
+    def load(path: str) -> 'PricingPolicy':
+        with open(path, encoding="utf-8") as file:
+            try:
+                config = json.load(file)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid pricing policy config: {e}") from e
+        return PricingPolicy.from_dict(config)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tiers": [{"threshold": threshold, "rate": rate} for threshold, rate in self._tiers],
+            "customer_discounts": {customer_type.value: rate for customer_type, rate in self._customer_discounts.items()},
+            "promotion_rate": self._promotion_rate,
+            "rounding": self._rounding.value,
+        }
+
+    # Tiers as (threshold, rate), highest threshold first
+    def get_tiers(self) -> Tuple[Tuple[float, float], ...]:
+        return self._tiers
+
+    def get_customer_discounts(self) -> Mapping[CustomerType, float]:
+        return self._customer_discounts
+
+    def get_promotion_rate(self) -> float:
+        return self._promotion_rate
+
+    def get_rounding(self) -> RoundingMode:
+        return self._rounding
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, PricingPolicy) and self._tiers == other._tiers
+                and self._customer_discounts == other._customer_discounts
+                and self._promotion_rate == other._promotion_rate and self._rounding == other._rounding)
+
+    def __hash__(self) -> int:
+        return hash((self._tiers, tuple(self._customer_discounts.values()), self._promotion_rate, self._rounding))
@@ -0,0 +1,67 @@
+import logging
+import os
+import threading
+from typing import Optional, Tuple
+
+from DiscountService import DiscountService
+from PricingPolicy import PricingPolicy
+
+
+class PricingPolicyReloader:
+    """Keeps a DiscountService priced from a JSON policy file.
+
+    A changed file is parsed into a new immutable PricingPolicy first and only then
+    swapped in with a single reference assignment, so pricing calls take no lock and see
+    either the old policy or the new one, never a mix. A file that fails to parse
+    leaves the current policy in place.
+    """
+
+    def __init__(self, path: str, discount_service: DiscountService):
+        self._path = path
+        self._discount_service = discount_service
+        self._file_state: Optional[Tuple[int, int]] = None  # (mtime_ns, size) of the file last loaded
+        self._lock = threading.Lock()  # Serialises reloads, never taken by pricing
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    def get_path(self) -> str:
+        return self._path
+
+    # Load the file and switch the discount service to its policy
+    def load(self) -> PricingPolicy:
+        with self._lock:
+            stat = os.stat(self._path)
+            policy = PricingPolicy.load(self._path)
+            self._discount_service.set_policy(policy)
+            self._file_state = (stat.st_mtime_ns, stat.st_size)
+            return policy
+
+    # Reload only when the file changed since the last load; returns whether it did
+    def reload_if_changed(self) -> bool:
+        stat = os.stat(self._path)
+        if (stat.st_mtime_ns, stat.st_size) == self._file_state:
+            return False
+        self.load()
+        return True
+
+    # Poll the file in a background thread every interval seconds
+    def watch(self, interval: float = 1.0):
+        if self._watcher is not None:
+            raise RuntimeError("Already watching the pricing policy file")
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._run, args=(interval,), name="pricing-policy-reloader",
+                                         daemon=True)
+        self._watcher.start()
+
+    def _run(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.reload_if_changed()
+            except Exception as e:  # A failed reload must never stop the watcher
+                logging.getLogger("pricing").warning("Pricing policy reload failed: %s", e)
+
+    def stop(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
@@ -0,0 +1,28 @@
+from typing import Any, Dict, NamedTuple, Optional
+
+
+class PricingResult(NamedTuple):
+    """How a cart was priced, from one pricing pass.
+
+    Amounts are in currency units, each the float nearest the exact cent amount; rates
+    are fractions (0.15 is 15%). A promoted cart carries its promotion_rate and none of
+    the other discounts, which a promotion replaces. Being a tuple, a result is
+    immutable and pickles cheaply; as_dict gives a JSON-ready form.
+    """
+
+    subtotal: float
+    bundle_savings: float
+    tier_rate: float
+    customer_rate: float
+    coupon_code: Optional[str]  # The coupon applied, None when no coupon took effect
+    coupon_rate: float
+    coupon_amount: float
+    promotion_rate: Optional[float]  # None when no promotion was active
+    final_price: float
+
+    # Total taken off the subtotal by all discounts together
+    def get_total_savings(self) -> float:
+        return self.subtotal - self.final_price
+
+    def as_dict(self) -> Dict[str, Any]:
+        return self._asdict()
@@ -0,0 +1,61 @@
+import logging
+from typing import Callable, List, Optional, Tuple
+
+
+class PricingTrace:
+    """Structured record of one pricing call: which rules fired and the amounts involved.
+
+    Event amounts are money for bundle, promotion and fixed coupon steps, and a rate
+    (0.15 for 15%) for tier, customer and percentage coupon steps.
+    """
+
+    def __init__(self, subtotal: float, customer_type=None, coupon_code: Optional[str] = None):
+        self.subtotal = subtotal
+        self.customer_type = customer_type
+        self.coupon_code = coupon_code
+        self.events: List[Tuple[str, str, float]] = []
+        self.final_price: Optional[float] = None
+
+    # Record a pricing step, e.g. ("bundle", "Laptop + Mouse: Mouse x1", 10.0)
+    def record(self, stage: str, detail: str, amount: float):
+        self.events.append((stage, detail, amount))
+
+    def as_dict(self) -> dict:
+        return {
+            "subtotal": self.subtotal,
+            "customer_type": self.customer_type.value if self.customer_type is not None else None,
+            "coupon_code": self.coupon_code,
+            "events": [{"stage": stage, "detail": detail, "amount": amount} for stage, detail, amount in self.events],
+            "final_price": self.final_price,
+        }
+
+
+class PricingTracer:
+    """Level-gated hook that receives one PricingTrace per pricing call.
+
+    Traces are only built while ``logger`` is enabled for ``level``. Finished traces
+    go to ``sink`` when one is given, otherwise they are logged.
+    """
+
+    def __init__(self, sink: Optional[Callable[[PricingTrace], None]] = None, level: int = logging.DEBUG,
+                 logger: Optional[logging.Logger] = None):
+        self._sink = sink
+        self._level = level
+        self._logger = logger if logger is not None else logging.getLogger("pricing")
+
+    def is_enabled(self) -> bool:
+        return self._logger.isEnabledFor(self._level)
+
+    # Start a trace for a pricing call, or None when tracing is off at this level
+    def start(self, subtotal: float, customer_type=None, coupon_code: Optional[str] = None) -> Optional[PricingTrace]:
+        if not self._logger.isEnabledFor(self._level):
+            return None
+        return PricingTrace(subtotal, customer_type, coupon_code)
+
+    # Hand a finished trace to the sink
+    def emit(self, trace: PricingTrace, final_price: float):
+        trace.final_price = final_price
+        if self._sink is not None:
+            self._sink(trace)
+        else:
+            self._logger.log(self._level, "pricing trace: %s", trace.as_dict())
@@ -1,8 +1,23 @@
+import weakref
+from typing import Optional
+
+
 class Product:
-    def __init__(self, name: str, price: float, stock: int):
+    __slots__ = ("_name", "_price", "_stock", "_sku", "_price_listeners", "_stock_ledger", "_ledger_slot")
+
+    def __init__(self, name: str, price: float, stock: int, sku: Optional[str] = None):
         self._name = name
         self._price = price
         self._stock = stock
+        # Products without an explicit SKU are identified by their casefolded name, worked
+        # out once here since pricing asks for the SKU of every line on every pass
+        self._sku = sku if sku is not None else name.casefold()
+        # Objects told about price changes through product_price_changed(product, old_price);
+        # created on first registration
+        self._price_listeners = None
+        # Shared stock ledger holding this product's stock instead of _stock, when attached
+        self._stock_ledger = None
+        self._ledger_slot = None
 
     # Getters
     def get_name(self) -> str:
@@ -12,14 +27,58 @@ class Product:
         return self._price
 
     def get_stock(self) -> int:
+        if self._stock_ledger is not None:
+            return self._stock_ledger.get_stock(self._ledger_slot)
         return self._stock
 
-    # Setter
+    def get_sku(self) -> str:
+        return self._sku
+
+    # Setters
     def set_stock(self, stock: int):
-        self._stock = stock
+        if self._stock_ledger is not None:
+            self._stock_ledger.set_stock(self._ledger_slot, stock)
+        else:
+            self._stock = stock
+
+    # Keep this product's stock in a shared StockLedger. The ledger's count wins if
+    # another process registered the SKU first, otherwise it starts from the current stock.
+    def attach_stock_ledger(self, ledger: 'StockLedger'):
+        self._ledger_slot = ledger.slot_for(self.get_sku(), self._stock)
+        self._stock_ledger = ledger
+
+    def get_stock_ledger(self) -> Optional['StockLedger']:
+        return self._stock_ledger
+
+    def set_price(self, price: float):
+        old_price = self._price
+        self._price = price
+        if self._price_listeners:
+            for listener in list(self._price_listeners):
+                listener.product_price_changed(self, old_price)
+
+    # Register or unregister an object to be told about price changes (held weakly)
+    def add_price_listener(self, listener):
+        if self._price_listeners is None:
+            self._price_listeners = weakref.WeakSet()
+        self._price_listeners.add(listener)
+
+    def remove_price_listener(self, listener):
+        if self._price_listeners is not None:
+            self._price_listeners.discard(listener)
 
     # Method to reduce stock
     def reduce_stock(self, quantity: int):
+        if self._stock_ledger is not None:
+            self._stock_ledger.decrement(self._ledger_slot, quantity)
+            return
         if quantity > self._stock:
             raise ValueError("Not enough stock available")
         self._stock -= quantity
+
+    # Put stock back, e.g. when a reservation is released
+    def add_stock(self, quantity: int):
+        if self._stock_ledger is not None:
+            self._stock_ledger.increment(self._ledger_slot, quantity)
+        else:
+            self._stock += quantity
@@ -0,0 +1,98 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from ProductTable import ProductRow, ProductTable
+
+
+class ProductCatalog:
+    """Products interned by SKU on top of a ProductTable, with a casefolded-name index
+    and bulk lookup and update over the typed price and stock columns.
+
+    Bulk methods take and return row numbers so callers can resolve SKUs once and
+    then work with array indexing.
+    """
+
+    def __init__(self, table: Optional[ProductTable] = None):
+        self._table = table if table is not None else ProductTable()
+        self._rows_by_sku: Dict[str, int] = {}
+        self._rows_by_name: Dict[str, List[int]] = {}
+        for product in self._table:
+            self._index(product)
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __contains__(self, sku: str) -> bool:
+        return sku in self._rows_by_sku
+
+    def get_table(self) -> ProductTable:
+        return self._table
+
+    # Add a product, or return the existing one when its SKU is already in the catalog
+    def add_product(self, name: str, price: float, stock: int, sku: Optional[str] = None) -> ProductRow:
+        row = self._rows_by_sku.get(sku if sku else name.casefold())
+        if row is not None:
+            return self._table.row(row)
+        product = self._table.add(name, price, stock, sku)
+        self._index(product)
+        return product
+
+    def _index(self, product: ProductRow):
+        self._rows_by_sku[product.get_sku()] = product.get_row()
+        self._rows_by_name.setdefault(product.get_name().casefold(), []).append(product.get_row())
+
+    # Single lookups
+    def get(self, sku: str) -> Optional[ProductRow]:
+        row = self._rows_by_sku.get(sku)
+        return self._table.row(row) if row is not None else None
+
+    def find_by_name(self, name: str) -> List[ProductRow]:
+        return [self._table.row(row) for row in self._rows_by_name.get(name.casefold(), ())]
+
+    # Row numbers of many SKUs; -1 for SKUs not in the catalog
+    def lookup_many(self, skus: Iterable[str]) -> np.ndarray:
+        rows_by_sku = self._rows_by_sku
+        return np.fromiter((rows_by_sku.get(sku, -1) for sku in skus), dtype=np.intp)
+
+    # Prices and stock of many rows at once
+    def get_prices(self, rows: Sequence[int]) -> np.ndarray:
+        return np.frombuffer(self._table.get_prices(), dtype=np.float64)[rows]
+
+    def get_stocks(self, rows: Sequence[int]) -> np.ndarray:
+        return np.frombuffer(self._table.get_stocks(), dtype=np.int64)[rows]
+
+    # Whether each row has at least the requested quantity in stock
+    def has_stock(self, rows: Sequence[int], quantities: Sequence[int]) -> np.ndarray:
+        return self.get_stocks(rows) >= np.asarray(quantities, dtype=np.int64)
+
+    # Take stock for many rows, all or nothing; repeated rows are added together.
+    # Only the rows involved are aggregated, so the cost does not grow with the catalog.
+    # Callers are responsible for locking (see InventoryService.reduce_stock_many).
+    def reduce_stock_many(self, rows: Sequence[int], quantities: Sequence[int]):
+        rows = np.asarray(rows, dtype=np.intp)
+        quantities = np.asarray(quantities, dtype=np.int64)
+        if rows.shape != quantities.shape:
+            raise ValueError("rows and quantities must have the same length")
+        if np.any(quantities < 0):
+            raise ValueError("Quantities cannot be negative")
+        if np.any((rows < 0) | (rows >= len(self._table))):
+            raise ValueError("Unknown catalog row")
+        unique_rows, positions = np.unique(rows, return_inverse=True)
+        demand = np.zeros(len(unique_rows), dtype=np.int64)
+        np.add.at(demand, positions, quantities)
+        stocks = np.frombuffer(self._table.get_stocks(), dtype=np.int64)
+        short = np.flatnonzero(demand > stocks[unique_rows])
+        if len(short):
+            raise ValueError(f"Not enough stock available for: {self._table.get_name(int(unique_rows[short[0]]))}")
+        stocks[unique_rows] -= demand
+
+    # Set prices for many rows; carts holding a changed row are told as with set_price
+    def set_prices(self, rows: Sequence[int], prices: Sequence[float]):
+        prices = np.asarray(prices, dtype=np.float64)
+        column = np.frombuffer(self._table.get_prices(), dtype=np.float64)
+        for position, row in enumerate(rows):
+            if self._table.has_price_listeners(row):
+                self._table.set_price(row, float(prices[position]))
+            else:
+                column[row] = prices[position]
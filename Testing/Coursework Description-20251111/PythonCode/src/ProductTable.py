@@ -0,0 +1,173 @@
+import weakref
+from array import array
+from typing import Iterable, Iterator, Optional, Tuple
+
+
+class _StringColumn:
+    """Strings packed into one UTF-8 buffer, addressed by row."""
+
+    __slots__ = ("_data", "_ends")
+
+    def __init__(self):
+        self._data = bytearray()
+        self._ends = array("q")
+
+    def append(self, value: str):
+        self._data += value.encode("utf-8")
+        self._ends.append(len(self._data))
+
+    def get(self, row: int) -> str:
+        start = self._ends[row - 1] if row else 0
+        return self._data[start:self._ends[row]].decode("utf-8")
+
+
+class ProductTable:
+    """Columnar product storage: names and SKUs in packed string columns, prices and
+    stock in typed arrays.
+
+    Rows are read and updated through lightweight ProductRow views, which offer the
+    same methods as Product and can be used wherever a Product is expected.
+    """
+
+    def __init__(self):
+        self._names = _StringColumn()
+        self._skus = _StringColumn()  # The casefolded name for products added without a SKU
+        self._prices = array("d")
+        self._stocks = array("q")
+        self._price_listeners = {}  # row -> WeakSet of listeners, only for rows that have any
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def __iter__(self) -> Iterator['ProductRow']:
+        return (ProductRow(self, row) for row in range(len(self)))
+
+    # Append a product and return its row view
+    def add(self, name: str, price: float, stock: int, sku: Optional[str] = None) -> 'ProductRow':
+        self._names.append(name)
+        self._skus.append(sku or name.casefold())
+        self._prices.append(price)
+        self._stocks.append(stock)
+        return ProductRow(self, len(self._prices) - 1)
+
+    # Append many (name, price, stock) or (name, price, stock, sku) records
+    def extend(self, products: Iterable[Tuple]):
+        for product in products:
+            self.add(*product)
+
+    def row(self, row: int) -> 'ProductRow':
+        if not 0 <= row < len(self._prices):
+            raise IndexError("product row out of range")
+        return ProductRow(self, row)
+
+    # Column access for bulk work
+    def get_prices(self) -> array:
+        return self._prices
+
+    def get_stocks(self) -> array:
+        return self._stocks
+
+    # Per-row accessors used by ProductRow
+    def get_name(self, row: int) -> str:
+        return self._names.get(row)
+
+    def get_sku(self, row: int) -> str:
+        return self._skus.get(row)
+
+    def get_price(self, row: int) -> float:
+        return self._prices[row]
+
+    def get_stock(self, row: int) -> int:
+        return self._stocks[row]
+
+    def set_stock(self, row: int, stock: int):
+        self._stocks[row] = stock
+
+    def reduce_stock(self, row: int, quantity: int):
+        if quantity > self._stocks[row]:
+            raise ValueError("Not enough stock available")
+        self._stocks[row] -= quantity
+
+    def add_stock(self, row: int, quantity: int):
+        self._stocks[row] += quantity
+
+    def set_price(self, row: int, price: float):
+        old_price = self._prices[row]
+        self._prices[row] = price
+        listeners = self._price_listeners.get(row)
+        if listeners:
+            product = ProductRow(self, row)
+            for listener in list(listeners):
+                listener.product_price_changed(product, old_price)
+
+    def has_price_listeners(self, row: int) -> bool:
+        return bool(self._price_listeners.get(row))
+
+    def add_price_listener(self, row: int, listener):
+        self._price_listeners.setdefault(row, weakref.WeakSet()).add(listener)
+
+    def remove_price_listener(self, row: int, listener):
+        listeners = self._price_listeners.get(row)
+        if listeners is not None:
+            listeners.discard(listener)
+            if not listeners:
+                del self._price_listeners[row]
+
+
+class ProductRow:
+    """View of one ProductTable row with the Product interface. Views of the same row
+    compare and hash equal, so they count as the same product in carts and locks."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: ProductTable, row: int):
+        self._table = table
+        self._row = row
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ProductRow) and self._table is other._table and self._row == other._row
+
+    def __hash__(self) -> int:
+        return hash((id(self._table), self._row))
+
+    def __repr__(self) -> str:
+        return f"ProductRow({self._row}, {self.get_name()!r})"
+
+    def get_table(self) -> ProductTable:
+        return self._table
+
+    def get_row(self) -> int:
+        return self._row
+
+    # Getters
+    def get_name(self) -> str:
+        return self._table.get_name(self._row)
+
+    def get_price(self) -> float:
+        return self._table.get_price(self._row)
+
+    def get_stock(self) -> int:
+        return self._table.get_stock(self._row)
+
+    def get_sku(self) -> str:
+        return self._table.get_sku(self._row)
+
+    # Setters
+    def set_stock(self, stock: int):
+        self._table.set_stock(self._row, stock)
+
+    def set_price(self, price: float):
+        self._table.set_price(self._row, price)
+
+    def add_price_listener(self, listener):
+        self._table.add_price_listener(self._row, listener)
+
+    def remove_price_listener(self, listener):
+        self._table.remove_price_listener(self._row, listener)
+
+    # Method to reduce stock
+    def reduce_stock(self, quantity: int):
+        self._table.reduce_stock(self._row, quantity)
+
+    def add_stock(self, quantity: int):
+        self._table.add_stock(self._row, quantity)
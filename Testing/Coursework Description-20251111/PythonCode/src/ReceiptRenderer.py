@@ -0,0 +1,66 @@
+import io
+from typing import IO, Iterable, List
+
+RECEIPT_HEADER = "----- Shopping Cart Receipt -----\n"
+RECEIPT_RULE = "---------------------------------\n"
+
+
+class ReceiptRenderer:
+    """Formats cart receipts into a buffer and hands them to a writable in large writes.
+
+    Any object with a write method will do: text streams get str, binary streams
+    (files opened "wb", BytesIO, socket.makefile("wb")) get encoded bytes. Each cart
+    is priced once, through its cached PricingResult.
+    """
+
+    def __init__(self, encoding: str = "utf-8", buffer_size: int = 1 << 16):
+        if buffer_size <= 0:
+            raise ValueError("buffer_size must be positive")
+        self._encoding = encoding
+        self._buffer_size = buffer_size
+
+    # Receipt for one cart as a string
+    def render(self, cart: 'ShoppingCart') -> str:
+        parts: List[str] = [RECEIPT_HEADER]
+        self._append(parts, cart)
+        return "".join(parts)
+
+    # Write one cart's receipt with a single write call
+    def write(self, cart: 'ShoppingCart', stream: IO):
+        self._write(stream, self.render(cart))
+
+    # Bulk mode: write the receipts of many carts back to back, buffering up to
+    # buffer_size characters between writes; returns the number of receipts written
+    def write_many(self, carts: Iterable['ShoppingCart'], stream: IO) -> int:
+        parts: List[str] = []
+        buffered = 0
+        count = 0
+        for cart in carts:
+            start = len(parts)
+            parts.append(RECEIPT_HEADER)
+            self._append(parts, cart)
+            buffered += sum(map(len, parts[start:]))
+            count += 1
+            if buffered >= self._buffer_size:
+                self._write(stream, "".join(parts))
+                parts.clear()
+                buffered = 0
+        if parts:
+            self._write(stream, "".join(parts))
+        return count
+
+    @staticmethod
+    def _append(parts: List[str], cart: 'ShoppingCart'):
+        pricing = cart.get_pricing()
+        for item in cart.get_items():
+            product = item.get_product()
+            parts.append(f"{product.get_name()} - {item.get_quantity()} x ${product.get_price():.2f}\n")
+        parts.append(RECEIPT_RULE)
+        parts.append(f"Total before discount: ${pricing.subtotal:.2f}\n")
+        parts.append(f"Final price after discounts: ${pricing.final_price:.2f}\n")
+
+    def _write(self, stream: IO, text: str):
+        if isinstance(stream, io.TextIOBase) or hasattr(stream, "encoding"):
+            stream.write(text)
+        else:
+            stream.write(text.encode(self._encoding))
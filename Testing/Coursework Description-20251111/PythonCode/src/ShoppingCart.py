@@ -1,60 +1,171 @@
-from typing import List
+import sys
+from typing import IO, Dict, List, Optional
 
 from CartItem import CartItem
 from Customer import Customer
 from DiscountService import DiscountService
+from Money import from_minor_units, to_minor_units
+from PricingResult import PricingResult
+from Product import Product
+from ReceiptRenderer import ReceiptRenderer
 
 class ShoppingCart:
     def __init__(self, customer: Customer, discount_service: DiscountService):
         self._customer = customer
-        self._items: List[CartItem] = []
+        # One line per product, keyed by product identity; dicts keep insertion order for receipts
+        self._lines: Dict[Product, CartItem] = {}
+        # Running totals kept in step with the lines; the subtotal is exact, in cents
+        self._subtotal = 0
+        self._sku_counts: Dict[str, int] = {}
         self._discount_service = discount_service
         self._coupon_code = None
         self._is_promotion_active = False  # Default promotion status is inactive
+        # Pricing cache, invalidated by bumping the version on every change
+        self._version = 0
+        self._cached_price_key = None
+        self._cached_pricing = None
+        self._cached_coupon_expires = False  # The cached pricing applied a coupon with an expiry
+        # Pricing of the order placed with this cart's redeemed coupon, until the cart changes
+        self._placed_pricing: Optional[PricingResult] = None
+        self._placed_version = -1
+        self._cache_hits = 0
+        self._cache_misses = 0
 
-    # Add an item to the shopping cart
+    # Add an item to the shopping cart, merging it into the product's existing line
     def add_item(self, item: CartItem):
-        self._items.append(item)
+        product = item.get_product()
+        line = self._lines.get(product)
+        if line is None:
+            self._lines[product] = item
+            product.add_price_listener(self)
+        else:
+            self._lines[product] = CartItem(product, line.get_quantity() + item.get_quantity())
+        self._change_units(product, item.get_quantity())
 
-    # Remove an item from the shopping cart
+    # Remove an item from the shopping cart; its quantity is taken off the product's line
     def remove_item(self, item: CartItem):
-        self._items.remove(item)
+        product = item.get_product()
+        line = self._lines.get(product)
+        if line is None:
+            raise ValueError("Item is not in the cart")
+        self.update_quantity(product, max(line.get_quantity() - item.get_quantity(), 0))
+
+    # Set the quantity of a product's line; zero removes the line
+    def update_quantity(self, product: Product, quantity: int):
+        if quantity < 0:
+            raise ValueError("Quantity cannot be negative")
+        line = self._lines.get(product)
+        current = line.get_quantity() if line is not None else 0
+        if quantity > 0:
+            if line is None:
+                product.add_price_listener(self)
+            self._lines[product] = CartItem(product, quantity)
+        elif line is not None:
+            del self._lines[product]
+            product.remove_price_listener(self)
+        self._change_units(product, quantity - current)
+
+    # Keep the running subtotal and per-SKU units in step with a change to a line
+    def _change_units(self, product: Product, units: int):
+        self._version += 1
+        self._subtotal += to_minor_units(product.get_price()) * units
+        sku = product.get_sku()
+        remaining = self._sku_counts.get(sku, 0) + units
+        if remaining:
+            self._sku_counts[sku] = remaining
+        else:
+            self._sku_counts.pop(sku, None)
+
+    # Called by products in the cart when their price changes
+    def product_price_changed(self, product: Product, old_price: float):
+        line = self._lines.get(product)
+        if line is not None:
+            self._version += 1
+            self._subtotal += (to_minor_units(product.get_price()) - to_minor_units(old_price)) * line.get_quantity()
 
     # Set a coupon code for discount
     def apply_coupon_code(self, coupon_code: str):
         self._coupon_code = coupon_code
+        self._version += 1
 
     # Activate or deactivate a promotion
     def set_promotion_active(self, is_active: bool):
         self._is_promotion_active = is_active
+        self._version += 1
 
     # Calculate the total price before any discounts
     def calculate_total(self) -> float:
-        total = sum(item.get_product().get_price() * item.get_quantity() for item in self._items)
-        return total
+        return from_minor_units(self._subtotal)
+
+    # The subtotal in cents
+    def get_subtotal_minor_units(self) -> int:
+        return self._subtotal
 
     # Calculate the final price after applying discounts, promotions, and coupon codes
     def calculate_final_price(self) -> float:
-        total = self.calculate_total()
+        return self.get_pricing().final_price
 
+    # Subtotal, every discount applied and the final price, from one pricing pass;
+    # repeated calls on an unchanged cart return the cached result. The coupon's registry
+    # version is part of the key, and an applied coupon that expires is checked again. After
+    # an order used up the cart's coupon, the order's pricing is returned until the cart changes.
+    def get_pricing(self) -> PricingResult:
+        if self._placed_version == self._version:
+            self._cache_hits += 1
+            return self._placed_pricing
+        registry = self._discount_service.get_coupon_registry()
+        coupon_version = registry.get_version(self._coupon_code) if self._coupon_code else None
+        key = (self._version, self._customer.get_customer_type(), self._discount_service.get_policy(),
+               coupon_version)
+        if key == self._cached_price_key and (not self._cached_coupon_expires
+                                              or registry.lookup(self._coupon_code) is not None):
+            self._cache_hits += 1
+            return self._cached_pricing
+        self._cache_misses += 1
 
-        # Apply promotion if active
-        if self._is_promotion_active:
-            total = self._discount_service.apply_promotion_discount(total)
-        else:
-            # Apply multi-tier discount, customer type discount, and bundle discount
-            total = self._discount_service.apply_discount(total, self._customer.get_customer_type(), self._items, self._coupon_code)
+        # Apply the promotion if active, otherwise multi-tier, customer type, bundle and coupon discounts
+        pricing = self._discount_service.price(self.calculate_total(), self._customer.get_customer_type(),
+                                               self.get_items(), self._coupon_code, self._sku_counts,
+                                               self._is_promotion_active)
+
+        self._cached_price_key = key
+        self._cached_pricing = pricing
+        coupon = registry.get(pricing.coupon_code) if pricing.coupon_code is not None else None
+        self._cached_coupon_expires = coupon is not None and coupon.get_expires_at() is not None
+        return pricing
 
-        return total
+    # Keep returning the given pricing until the cart changes; checkout sets it once an order
+    # has used up the cart's coupon, so receipts still show the discount the order got
+    def set_placed_pricing(self, pricing: PricingResult):
+        self._placed_pricing = pricing
+        self._placed_version = self._version
 
-    # Print a detailed breakdown of the cart
-    def print_receipt(self):
-        print("----- Shopping Cart Receipt -----")
-        for item in self._items:
-            print(f"{item.get_product().get_name()} - {item.get_quantity()} x ${item.get_product().get_price():.2f}")
-        print("---------------------------------")
-        print(f"Total before discount: ${self.calculate_total():.2f}")
-        print(f"Final price after discounts: ${self.calculate_final_price():.2f}")
+    # Hit and miss counts of the final price cache
+    def get_price_cache_stats(self) -> Dict[str, int]:
+        return {"hits": self._cache_hits, "misses": self._cache_misses}
+
+    # Print a detailed breakdown of the cart, to stdout unless another writable is given
+    def print_receipt(self, stream: Optional[IO] = None):
+        ReceiptRenderer().write(self, sys.stdout if stream is None else stream)
 
     def get_items(self) -> List[CartItem]:
-        return self._items
+        return list(self._lines.values())
+
+    # Units in the cart per product SKU
+    def get_sku_counts(self) -> Dict[str, int]:
+        return self._sku_counts
+
+    def has_sku(self, sku: str) -> bool:
+        return sku in self._sku_counts
+
+    def get_customer(self) -> Customer:
+        return self._customer
+
+    def get_discount_service(self) -> DiscountService:
+        return self._discount_service
+
+    def get_coupon_code(self) -> str:
+        return self._coupon_code
+
+    def is_promotion_active(self) -> bool:
+        return self._is_promotion_active
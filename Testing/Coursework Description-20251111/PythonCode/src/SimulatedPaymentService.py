@@ -0,0 +1,31 @@
+import asyncio
+import time
+from typing import List, Optional, Tuple, Union
+
+from CardValidator import CardValidator
+from PaymentService import PaymentService
+
+
+class SimulatedPaymentService(PaymentService):
+    """Payment stub that waits ``latency`` seconds per call or per batch submission,
+    standing in for the processor round trip."""
+
+    def __init__(self, latency: float = 0.05, card_validator: Optional[CardValidator] = None):
+        super().__init__(card_validator)
+        self._latency = latency
+
+    def get_latency(self) -> float:
+        return self._latency
+
+    def process_payment(self, credit_card_number: str, amount: float) -> bool:
+        time.sleep(self._latency)
+        return super().process_payment(credit_card_number, amount)
+
+    async def process_payment_async(self, credit_card_number: str, amount: float) -> bool:
+        await asyncio.sleep(self._latency)
+        return super().process_payment(credit_card_number, amount)
+
+    def _submit_batch(self, payments: List[Tuple[str, float]]) -> List[Union[bool, Exception]]:
+        if payments:
+            time.sleep(self._latency)
+        return super()._submit_batch(payments)
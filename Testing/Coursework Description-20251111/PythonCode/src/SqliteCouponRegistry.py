@@ -0,0 +1,88 @@
+import sqlite3
+import threading
+import time
+from typing import Callable, Hashable, Iterable, Optional
+
+from Coupon import Coupon, CouponType
+from CouponRegistry import CouponRegistry
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS coupons (
+    code TEXT PRIMARY KEY,
+    coupon_type TEXT NOT NULL,
+    value REAL NOT NULL,
+    expires_at REAL,
+    max_uses INTEGER,
+    uses INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID
+"""
+
+
+class SqliteCouponRegistry(CouponRegistry):
+    """A CouponRegistry kept in an SQLite database file, for code sets too large to hold
+    in memory or shared between processes.
+
+    Codes are the table's primary key, so a lookup is a single index probe. Redemption
+    is one conditional UPDATE, which SQLite applies atomically even when several
+    processes redeem from the same file.
+    """
+
+    def __init__(self, path: str, coupons: Iterable[Coupon] = (), clock: Callable[[], float] = time.time):
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30.0)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(_SCHEMA)
+        self._lock = threading.Lock()  # One connection, shared by all threads
+        self._clock = clock
+        self.import_coupons(coupons)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM coupons").fetchone()[0]
+
+    def add(self, coupon: Coupon):
+        self.import_coupons([coupon])
+
+    # Bulk import in one transaction; existing codes are replaced
+    def import_coupons(self, coupons: Iterable[Coupon]) -> int:
+        rows = [(coupon.get_code(), coupon.get_coupon_type().value, coupon.get_value(), coupon.get_expires_at(),
+                 coupon.get_max_uses(), coupon.get_uses()) for coupon in coupons]
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN")
+            self._connection.executemany("INSERT OR REPLACE INTO coupons VALUES (?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def get(self, code: str) -> Optional[Coupon]:
+        with self._lock:
+            row = self._connection.execute("SELECT * FROM coupons WHERE code = ?", (code,)).fetchone()
+        if row is None:
+            return None
+        code, coupon_type, value, expires_at, max_uses, uses = row
+        return Coupon(code, CouponType(coupon_type), value, expires_at, max_uses, uses)
+
+    # The code's row: it changes with every import, redemption or release, including ones
+    # made by other processes sharing the file
+    def get_version(self, code: str) -> Hashable:
+        with self._lock:
+            return self._connection.execute("SELECT * FROM coupons WHERE code = ?", (code,)).fetchone()
+
+    def lookup(self, code: str) -> Optional[Coupon]:
+        coupon = self.get(code)
+        if coupon is None or not coupon.is_valid(self._clock()):
+            return None
+        return coupon
+
+    def redeem(self, code: str) -> bool:
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE coupons SET uses = uses + 1 WHERE code = ?"
+                " AND (expires_at IS NULL OR expires_at > ?) AND (max_uses IS NULL OR uses < max_uses)",
+                (code, self._clock()))
+        return cursor.rowcount == 1
+
+    def release(self, code: str):
+        with self._lock:
+            self._connection.execute("UPDATE coupons SET uses = uses - 1 WHERE code = ? AND uses > 0", (code,))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
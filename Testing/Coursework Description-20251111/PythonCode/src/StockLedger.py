@@ -0,0 +1,141 @@
+import fcntl
+import mmap
+import os
+import struct
+import threading
+from typing import Dict
+
+import numpy as np
+
+MAGIC = b"STOCKLDG"
+VERSION = 1
+SKU_WIDTH = 32  # bytes of UTF-8, zero padded
+SLOT_WIDTH = SKU_WIDTH + 8  # SKU followed by a little-endian int64 stock count
+HEADER = struct.Struct("<8sIIq")  # magic, version, capacity, slots used
+HEADER_SIZE = 32
+USED_OFFSET = 16
+THREAD_LOCK_STRIPES = 64
+DEFAULT_CAPACITY = 65536
+
+
+class StockLedger:
+    """Stock counts in a memory-mapped file of fixed-width SKU slots, shared by every
+    process on the host that opens the same path.
+
+    Reads come straight from the mapping. Writes go through compare_and_swap, which
+    holds an in-process lock stripe and an fcntl lock on the slot's 8 bytes, so
+    updates are atomic across threads and processes. Slots are allocated under an
+    fcntl lock on the header and never move, so the capacity is fixed at creation.
+    """
+
+    def __init__(self, path: str, capacity: int = DEFAULT_CAPACITY):
+        self._path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, HEADER_SIZE, 0, os.SEEK_SET)
+        try:
+            if os.fstat(self._fd).st_size == 0:
+                os.ftruncate(self._fd, HEADER_SIZE + capacity * SLOT_WIDTH)
+                os.pwrite(self._fd, HEADER.pack(MAGIC, VERSION, capacity, 0), 0)
+            magic, version, capacity, _ = HEADER.unpack(os.pread(self._fd, HEADER.size, 0))
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, HEADER_SIZE, 0, os.SEEK_SET)
+        if magic != MAGIC or version != VERSION:
+            os.close(self._fd)
+            raise ValueError(f"{path} is not a stock ledger")
+
+        self._capacity = capacity
+        self._map = mmap.mmap(self._fd, HEADER_SIZE + capacity * SLOT_WIDTH)
+        self._slots: Dict[str, int] = {}
+        self._scanned = 0
+        self._slots_lock = threading.Lock()
+        self._thread_locks = [threading.Lock() for _ in range(THREAD_LOCK_STRIPES)]
+
+    def get_path(self) -> str:
+        return self._path
+
+    def get_capacity(self) -> int:
+        return self._capacity
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+    # Slot of a SKU, allocated with initial_stock if no process has registered it yet
+    def slot_for(self, sku: str, initial_stock: int = 0) -> int:
+        slot = self._slots.get(sku)
+        if slot is not None:
+            return slot
+        encoded = sku.encode("utf-8")
+        if not encoded or len(encoded) > SKU_WIDTH:
+            raise ValueError(f"SKU must be 1 to {SKU_WIDTH} bytes of UTF-8: {sku!r}")
+
+        with self._slots_lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, HEADER_SIZE, 0, os.SEEK_SET)
+            try:
+                self._scan()
+                slot = self._slots.get(sku)
+                if slot is None:
+                    slot = self._scanned
+                    if slot >= self._capacity:
+                        raise RuntimeError(f"Stock ledger {self._path} is full ({self._capacity} slots)")
+                    offset = HEADER_SIZE + slot * SLOT_WIDTH
+                    self._map[offset:offset + SKU_WIDTH] = encoded.ljust(SKU_WIDTH, b"\0")
+                    struct.pack_into("<q", self._map, offset + SKU_WIDTH, initial_stock)
+                    # Publish the slot only once it is fully written
+                    struct.pack_into("<q", self._map, USED_OFFSET, slot + 1)
+                    self._slots[sku] = slot
+                    self._scanned = slot + 1
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, HEADER_SIZE, 0, os.SEEK_SET)
+        return slot
+
+    # Pick up slots other processes have allocated since the last scan
+    def _scan(self):
+        used = struct.unpack_from("<q", self._map, USED_OFFSET)[0]
+        for slot in range(self._scanned, used):
+            offset = HEADER_SIZE + slot * SLOT_WIDTH
+            sku = bytes(self._map[offset:offset + SKU_WIDTH]).rstrip(b"\0").decode("utf-8")
+            self._slots[sku] = slot
+        self._scanned = used
+
+    def get_stock(self, slot: int) -> int:
+        return struct.unpack_from("<q", self._map, HEADER_SIZE + slot * SLOT_WIDTH + SKU_WIDTH)[0]
+
+    # Zero-copy read-only view of the stock of every slot
+    def get_stock_column(self) -> np.ndarray:
+        column = np.ndarray((self._capacity,), dtype="<i8", buffer=self._map,
+                            offset=HEADER_SIZE + SKU_WIDTH, strides=(SLOT_WIDTH,))
+        column.flags.writeable = False
+        return column
+
+    # Atomically replace a slot's stock with new_stock if it still holds expected
+    def compare_and_swap(self, slot: int, expected: int, new_stock: int) -> bool:
+        offset = HEADER_SIZE + slot * SLOT_WIDTH + SKU_WIDTH
+        with self._thread_locks[slot % THREAD_LOCK_STRIPES]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 8, offset, os.SEEK_SET)
+            try:
+                if struct.unpack_from("<q", self._map, offset)[0] != expected:
+                    return False
+                struct.pack_into("<q", self._map, offset, new_stock)
+                return True
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 8, offset, os.SEEK_SET)
+
+    # Take quantity from a slot, failing rather than going below zero; returns the new stock
+    def decrement(self, slot: int, quantity: int) -> int:
+        while True:
+            current = self.get_stock(slot)
+            if quantity > current:
+                raise ValueError("Not enough stock available")
+            if self.compare_and_swap(slot, current, current - quantity):
+                return current - quantity
+
+    def increment(self, slot: int, quantity: int) -> int:
+        while True:
+            current = self.get_stock(slot)
+            if self.compare_and_swap(slot, current, current + quantity):
+                return current + quantity
+
+    def set_stock(self, slot: int, stock: int):
+        while not self.compare_and_swap(slot, self.get_stock(slot), stock):
+            pass
@@ -0,0 +1,37 @@
+from typing import List, Tuple
+
+from Product import Product
+
+
+class StockReservation:
+    """Stock set aside for one order until it is committed or released."""
+
+    PENDING = "Pending"
+    COMMITTED = "Committed"
+    RELEASED = "Released"
+
+    def __init__(self, reservation_id: int, lines: List[Tuple[Product, int]], expires_at: float):
+        self._reservation_id = reservation_id
+        self._lines = lines
+        self._expires_at = expires_at
+        self._status = StockReservation.PENDING
+
+    # Getters
+    def get_reservation_id(self) -> int:
+        return self._reservation_id
+
+    def get_lines(self) -> List[Tuple[Product, int]]:
+        return self._lines
+
+    def get_expires_at(self) -> float:
+        return self._expires_at
+
+    def get_status(self) -> str:
+        return self._status
+
+    def is_pending(self) -> bool:
+        return self._status == StockReservation.PENDING
+
+    # Setter
+    def set_status(self, status: str):
+        self._status = status
@@ -0,0 +1,52 @@
+"""Async checkout throughput against the number of concurrent orders.
+
+All orders run on one event loop through OrderService.place_order_async, with a
+SimulatedPaymentService standing in for the payment processor.
+Run from src: python -m benchmarks.async_checkout
+"""
+
+import asyncio
+import time
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from InventoryService import InventoryService
+from OrderService import OrderService
+from Product import Product
+from ShoppingCart import ShoppingCart
+from SimulatedPaymentService import SimulatedPaymentService
+
+TOTAL_ORDERS = 2000
+PAYMENT_LATENCY = 0.01  # seconds
+CARD_NUMBER = "1234567890123456"
+
+
+async def run(concurrency: int) -> float:
+    order_service = OrderService(SimulatedPaymentService(PAYMENT_LATENCY), InventoryService())
+    discount_service = DiscountService()
+    mouse = Product("Mouse", 50.00, TOTAL_ORDERS)
+    queue = asyncio.Queue()
+    for index in range(TOTAL_ORDERS):
+        cart = ShoppingCart(Customer(f"Customer {index}", CustomerType.REGULAR), discount_service)
+        cart.add_item(CartItem(mouse, 1))
+        queue.put_nowait(cart)
+
+    async def worker():
+        while not queue.empty():
+            await order_service.place_order_async(queue.get_nowait(), CARD_NUMBER)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return TOTAL_ORDERS / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'concurrent':>10} {'orders/sec':>12}  (payment latency {PAYMENT_LATENCY * 1000:.0f} ms)")
+    for concurrency in (1, 10, 100, 1000):
+        print(f"{concurrency:>10} {asyncio.run(run(concurrency)):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Overhead of CheckoutMetrics on place_order: no metrics, metrics wired in but
+disabled, and enabled; then the per-stage snapshot of the enabled run.
+
+Run from src: python -m benchmarks.checkout_metrics
+"""
+
+import time
+
+from CartItem import CartItem
+from CheckoutMetrics import CheckoutMetrics
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from InventoryService import InventoryService
+from OrderService import OrderService
+from PaymentService import PaymentService
+from Product import Product
+from ShoppingCart import ShoppingCart
+
+ORDER_COUNT = 20_000
+REPEATS = 5
+CARD_NUMBER = "1234567812345678"
+
+
+def make_carts(metrics, count):
+    discount_service = DiscountService(metrics=metrics)
+    products = [Product(f"Product {index}", 10.00 + index, 10**9) for index in range(5)]
+    carts = []
+    for _ in range(count):
+        cart = ShoppingCart(Customer("Customer", CustomerType.PREMIUM), discount_service)
+        for index, product in enumerate(products):
+            cart.add_item(CartItem(product, 1 + index % 3))
+        carts.append(cart)
+    return carts
+
+
+# Seconds per order over ORDER_COUNT orders; each order prices a fresh cart
+def time_orders(metrics) -> float:
+    order_service = OrderService(PaymentService(), InventoryService(metrics=metrics), metrics=metrics)
+    carts = make_carts(metrics, ORDER_COUNT)
+    start = time.perf_counter()
+    for cart in carts:
+        cart.calculate_final_price()
+        order_service.place_order(cart, CARD_NUMBER)
+    return (time.perf_counter() - start) / ORDER_COUNT
+
+
+def main():
+    metrics = CheckoutMetrics()
+    variants = {"no metrics": None, "metrics disabled": CheckoutMetrics(enabled=False), "metrics enabled": metrics}
+    best = dict.fromkeys(variants, float("inf"))
+    # Variants take turns, so drift in machine speed does not favour any of them; best of REPEATS
+    for _ in range(REPEATS):
+        for name, variant in variants.items():
+            best[name] = min(best[name], time_orders(variant))
+
+    baseline = best["no metrics"]
+    for name, seconds in best.items():
+        print(f"{name + ':':<18}{seconds * 1e6:6.2f} us per order (+{(seconds - baseline) * 1e6:.2f} us)")
+    print(f"{'stage':<16} {'count':>8} {'p50 us':>8} {'p99 us':>8} {'max us':>8}")
+    for stage, stats in metrics.snapshot().items():
+        print(f"{stage:<16} {stats['count']:>8} {stats['p50_us']:>8.2f} {stats['p99_us']:>8.2f} {stats['max_us']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
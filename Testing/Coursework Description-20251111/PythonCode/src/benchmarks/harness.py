@@ -0,0 +1,354 @@
+"""Load-generation harness: synthetic catalogs, customers and carts driven through
+ShoppingCart.calculate_final_price ("price") and OrderService.place_order ("order").
+
+Every scenario runs single-threaded, on threads sharing one OrderService, and on
+worker processes (CheckoutWorkerPool for orders), reporting throughput, p50/p99
+latency of the call itself and memory: the tracemalloc peak of the calls for
+in-process modes, the largest max RSS of any worker process so far for processes. The workload is
+seeded, so runs with the same options see the same carts; --output saves the
+results as JSON and --compare checks them against a saved run, exiting 1 when
+throughput or p99 latency regressed by more than --tolerance.
+
+Run from src: python -m benchmarks.harness [--operations 5000] [--cart-size uniform:1:10]
+    [--customer-mix regular=0.7,premium=0.2,vip=0.1] [--workers 4] [--output run.json]
+    [--compare baseline.json]
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from CartItem import CartItem
+from CheckoutWorkerPool import CheckoutRequest, CheckoutWorkerPool
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from InventoryService import InventoryService
+from OrderService import OrderService
+from PaymentService import PaymentService
+from Product import Product
+from ShoppingCart import ShoppingCart
+
+CARD_NUMBER = "1234567890123456"
+STOCK_PER_PRODUCT = 10**9  # Never runs out, so every order exercises the whole checkout
+WARMUP_OPERATIONS = 200  # Untimed calls first, so the timed run starts with warm caches
+SCENARIOS = ("price", "order")
+MODES = ("single", "threads", "processes")
+CUSTOMER_TYPES = {customer_type.name.lower(): customer_type for customer_type in CustomerType}
+
+
+class WorkloadConfig(NamedTuple):
+    """What to generate. cart_size is "fixed:N", "uniform:MIN:MAX" or "geometric:MEAN"
+    lines per cart; customer_mix weights customer types; coupon_share and
+    promotion_share are the fractions of carts with a coupon or an active promotion."""
+    operations: int = 5000
+    catalog_size: int = 1000
+    cart_size: str = "uniform:1:10"
+    customer_mix: Tuple[Tuple[CustomerType, float], ...] = ((CustomerType.REGULAR, 0.7),
+                                                            (CustomerType.PREMIUM, 0.2),
+                                                            (CustomerType.VIP, 0.1))
+    coupon_share: float = 0.2
+    coupon_codes: Tuple[str, ...] = ("DISCOUNT10",)  # Percentage coupons never price a cart at 0
+    promotion_share: float = 0.0
+    seed: int = 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        config = self._asdict()
+        config["customer_mix"] = {customer_type.name.lower(): weight for customer_type, weight in self.customer_mix}
+        config["coupon_codes"] = list(self.coupon_codes)
+        return config
+
+
+# "regular=0.7,premium=0.2,vip=0.1" as ((CustomerType.REGULAR, 0.7), ...)
+def parse_customer_mix(spec: str) -> Tuple[Tuple[CustomerType, float], ...]:
+    mix = []
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        customer_type = CUSTOMER_TYPES.get(name.strip().lower())
+        if customer_type is None or not weight:
+            raise ValueError(f"Invalid customer mix entry: {part!r}")
+        if float(weight) < 0:
+            raise ValueError("Customer mix weights cannot be negative")
+        mix.append((customer_type, float(weight)))
+    if sum(weight for _, weight in mix) <= 0:
+        raise ValueError("Customer mix needs a positive weight")
+    return tuple(mix)
+
+
+# A cart size spec as a function drawing a number of lines (at least 1) from a Random
+def parse_cart_size(spec: str) -> Callable[[random.Random], int]:
+    kind, *values = spec.split(":")
+    try:
+        numbers = [float(value) for value in values]
+    except ValueError:
+        raise ValueError(f"Invalid cart size: {spec!r}") from None
+    if kind == "fixed" and len(numbers) == 1 and numbers[0] >= 1:
+        size = int(numbers[0])
+        return lambda rng: size
+    if kind == "uniform" and len(numbers) == 2 and 1 <= numbers[0] <= numbers[1]:
+        low, high = int(numbers[0]), int(numbers[1])
+        return lambda rng: rng.randint(low, high)
+    if kind == "geometric" and len(numbers) == 1 and numbers[0] >= 1:
+        # Lines 1, 2, 3... with the given mean; most carts small, a long tail of big ones
+        if numbers[0] == 1:
+            return lambda rng: 1
+        decay = -math.log(1 - 1 / numbers[0])
+        return lambda rng: 1 + int(rng.expovariate(decay))
+    raise ValueError(f"Invalid cart size: {spec!r}")
+
+
+# Catalog lines (sku, name, price). Prices are log-normal around $33 so carts cross the
+# tier thresholds; a laptop and a mouse are always stocked so the bundle rule fires.
+def generate_catalog(size: int, rng: random.Random) -> List[Tuple[str, str, float]]:
+    if size < 2:
+        raise ValueError("Catalog needs at least 2 products")
+    catalog = [("laptop", "Laptop", 999.99), ("mouse", "Mouse", 49.99)]
+    for index in range(size - 2):
+        catalog.append((f"sku-{index}", f"Product {index}", max(round(rng.lognormvariate(3.5, 1.0), 2), 0.01)))
+    return catalog
+
+
+# The workload as picklable CheckoutRequests, one per operation
+def generate_requests(config: WorkloadConfig) -> List[CheckoutRequest]:
+    rng = random.Random(config.seed)
+    catalog = generate_catalog(config.catalog_size, rng)
+    draw_size = parse_cart_size(config.cart_size)
+    customer_types = [customer_type for customer_type, _ in config.customer_mix]
+    weights = [weight for _, weight in config.customer_mix]
+    requests = []
+    for _ in range(config.operations):
+        picks = rng.sample(catalog, min(draw_size(rng), len(catalog)))
+        lines = tuple((sku, name, price, rng.randint(1, 3)) for sku, name, price in picks)
+        coupon_code = rng.choice(config.coupon_codes) if rng.random() < config.coupon_share else None
+        requests.append(CheckoutRequest(rng.choices(customer_types, weights)[0], lines, CARD_NUMBER, coupon_code,
+                                        rng.random() < config.promotion_share))
+    return requests
+
+
+# Carts for requests over one shared set of products, as a storefront would hold them
+def build_carts(requests: Sequence[CheckoutRequest], discount_service: DiscountService) -> List[ShoppingCart]:
+    products: Dict[str, Product] = {}
+    carts = []
+    for request in requests:
+        cart = ShoppingCart(Customer("Customer", request.customer_type), discount_service)
+        for sku, name, price, quantity in request.lines:
+            product = products.get(sku)
+            if product is None:
+                product = products[sku] = Product(name, price, STOCK_PER_PRODUCT, sku=sku)
+            cart.add_item(CartItem(product, quantity))
+        cart.apply_coupon_code(request.coupon_code)
+        cart.set_promotion_active(request.promotion_active)
+        carts.append(cart)
+    return carts
+
+
+# Time operation on every cart, split across thread_count threads; returns the wall time
+# and each call's latency, both in seconds, and how many calls returned a true value
+def time_in_process(operation: Callable[[ShoppingCart], Any], carts: List[ShoppingCart],
+                    thread_count: int) -> Tuple[float, List[float], int]:
+    slices = [carts[index::thread_count] for index in range(thread_count)]
+    latencies: List[List[float]] = [[] for _ in slices]
+    successes = [0] * thread_count
+    ready = threading.Barrier(thread_count + 1)
+
+    def worker(index: int):
+        clock = time.perf_counter
+        timings = latencies[index]
+        succeeded = 0
+        ready.wait()
+        for cart in slices[index]:
+            start = clock()
+            result = operation(cart)
+            timings.append(clock() - start)
+            succeeded += bool(result)
+        successes[index] = succeeded
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, [latency for timings in latencies for latency in timings], sum(successes)
+
+
+# Worker process side of the "price" scenario: price each request's cart, timing the call
+def _price_requests_timed(requests: List[CheckoutRequest]) -> List[float]:
+    return time_in_process(ShoppingCart.calculate_final_price, build_carts(requests, DiscountService()), 1)[1]
+
+
+def time_in_processes(scenario: str, requests: List[CheckoutRequest], workers: int,
+                      chunksize: int = 64) -> Tuple[float, List[float], int]:
+    chunks = [requests[start:start + chunksize] for start in range(0, len(requests), chunksize)]
+    if scenario == "price":
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_price_requests_timed, chunks[:workers]))  # Start every worker before timing
+            start = time.perf_counter()
+            latencies = [latency for timings in executor.map(_price_requests_timed, chunks) for latency in timings]
+            elapsed = time.perf_counter() - start
+        return elapsed, latencies, len(latencies)
+
+    with tempfile.TemporaryDirectory() as directory:
+        with CheckoutWorkerPool(os.path.join(directory, "stock.ledger"), workers=workers) as pool:
+            for sku in {sku for request in requests for sku, _, _, _ in request.lines}:
+                pool.stock(sku, STOCK_PER_PRODUCT)
+            pool.place_orders(requests[:workers * 4], chunksize=1)  # Start every worker before timing
+            start = time.perf_counter()
+            results = pool.place_orders_timed(requests, chunksize=chunksize)
+            elapsed = time.perf_counter() - start
+    return elapsed, [latency for _, latency in results], sum(placed for placed, _ in results)
+
+
+# Run one scenario in one mode; returns its result row
+def run_scenario(scenario: str, mode: str, requests: List[CheckoutRequest], workers: int = 1) -> Dict[str, Any]:
+    if scenario not in SCENARIOS or mode not in MODES:
+        raise ValueError(f"Unknown scenario or mode: {scenario}/{mode}")
+    workers = 1 if mode == "single" else workers
+    peak_traced = None
+    max_rss_kb = None
+    if mode == "processes":
+        elapsed, latencies, succeeded = time_in_processes(scenario, requests, workers)
+        # Workers have exited by now, so their high-water marks are in RUSAGE_CHILDREN
+        max_rss_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    else:
+        discount_service = DiscountService()
+        carts = build_carts(requests, discount_service)
+        if scenario == "price":
+            operation = ShoppingCart.calculate_final_price
+        else:
+            order_service = OrderService(PaymentService(), InventoryService())
+            operation = lambda cart: order_service.place_order(cart, CARD_NUMBER)
+        time_in_process(operation, build_carts(requests[:WARMUP_OPERATIONS], discount_service), 1)
+        elapsed, latencies, succeeded = time_in_process(operation, carts, workers)
+        if scenario == "price":
+            succeeded = len(latencies)  # A price of 0 is still a priced cart
+
+        # Memory pass over fresh carts: tracemalloc slows the calls, so it is not timed
+        carts = build_carts(requests, discount_service)
+        tracemalloc.start()
+        time_in_process(operation, carts, workers)
+        peak_traced = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    latencies_us = np.array(latencies) * 1e6
+    return {
+        "scenario": scenario,
+        "mode": mode,
+        "workers": workers,
+        "operations": len(latencies),
+        "succeeded": succeeded,
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed,
+        "p50_us": float(np.percentile(latencies_us, 50)),
+        "p99_us": float(np.percentile(latencies_us, 99)),
+        "mean_us": float(latencies_us.mean()),
+        "max_us": float(latencies_us.max()),
+        "tracemalloc_peak_kb": None if peak_traced is None else peak_traced / 1024,
+        "max_rss_kb": max_rss_kb,
+    }
+
+
+# Rows of current whose throughput fell, or whose p99 latency rose, by more than tolerance
+# against the matching (scenario, mode, workers) row of baseline
+def find_regressions(baseline: List[Dict[str, Any]], current: List[Dict[str, Any]],
+                     tolerance: float = 0.10) -> List[str]:
+    previous = {(row["scenario"], row["mode"], row["workers"]): row for row in baseline}
+    regressions = []
+    for row in current:
+        before = previous.get((row["scenario"], row["mode"], row["workers"]))
+        if before is None:
+            continue
+        name = f"{row['scenario']}/{row['mode']}/{row['workers']}"
+        if row["throughput"] < before["throughput"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {before['throughput']:.0f} -> {row['throughput']:.0f} ops/sec")
+        if row["p99_us"] > before["p99_us"] * (1 + tolerance):
+            regressions.append(f"{name}: p99 {before['p99_us']:.1f} -> {row['p99_us']:.1f} us")
+    return regressions
+
+
+def describe_environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    defaults = WorkloadConfig()
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.harness", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--operations", type=int, default=defaults.operations, help="carts per run")
+    parser.add_argument("--catalog-size", type=int, default=defaults.catalog_size)
+    parser.add_argument("--cart-size", default=defaults.cart_size,
+                        help="fixed:N, uniform:MIN:MAX or geometric:MEAN lines per cart")
+    parser.add_argument("--customer-mix", default="regular=0.7,premium=0.2,vip=0.1")
+    parser.add_argument("--coupon-share", type=float, default=defaults.coupon_share)
+    parser.add_argument("--promotion-share", type=float, default=defaults.promotion_share)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--workers", type=int, default=4, help="threads or processes for the parallel modes")
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file of an earlier run to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed fractional slowdown")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    arguments = parse_arguments(argv)
+    config = WorkloadConfig(operations=arguments.operations, catalog_size=arguments.catalog_size,
+                            cart_size=arguments.cart_size, customer_mix=parse_customer_mix(arguments.customer_mix),
+                            coupon_share=arguments.coupon_share, promotion_share=arguments.promotion_share,
+                            seed=arguments.seed)
+    parse_cart_size(config.cart_size)  # Reject a bad spec before generating anything
+    requests = generate_requests(config)
+
+    print(f"{'scenario':<8} {'mode':<10} {'workers':>7} {'ops/sec':>10} {'p50 us':>9} {'p99 us':>9} "
+          f"{'traced KB':>10} {'max RSS KB':>11}")
+    results = []
+    for scenario in arguments.scenarios:
+        for mode in arguments.modes:
+            row = run_scenario(scenario, mode, requests, arguments.workers)
+            results.append(row)
+            traced = "-" if row["tracemalloc_peak_kb"] is None else f"{row['tracemalloc_peak_kb']:.0f}"
+            rss = "-" if row["max_rss_kb"] is None else str(row["max_rss_kb"])
+            print(f"{scenario:<8} {mode:<10} {row['workers']:>7} {row['throughput']:>10.0f} {row['p50_us']:>9.1f} "
+                  f"{row['p99_us']:>9.1f} {traced:>10} {rss:>11}")
+
+    report = {"environment": describe_environment(), "config": config.as_dict(), "results": results}
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    if arguments.compare:
+        with open(arguments.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if baseline.get("config") != report["config"]:
+            print("Warning: the baseline was run with a different workload", file=sys.stderr)
+        regressions = find_regressions(baseline["results"], results, arguments.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions against {arguments.compare} (tolerance {arguments.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""Checkout throughput of CheckoutWorkerPool against the number of worker processes.
+
+Orders carry 50-line carts so each one does a meaningful amount of work in its
+worker; all workers share stock through one ledger file.
+Run from src: python -m benchmarks.multiprocess_checkout
+"""
+
+import os
+import tempfile
+import time
+
+from CheckoutWorkerPool import CheckoutRequest, CheckoutWorkerPool
+from CustomerType import CustomerType
+
+ORDERS = 4000
+LINES_PER_ORDER = 50
+CARD_NUMBER = "1234567890123456"
+
+
+def run(workers: int) -> float:
+    lines = tuple((f"sku-{line}", f"Product {line}", 10.0 + line, 1) for line in range(LINES_PER_ORDER))
+    requests = [CheckoutRequest(CustomerType.REGULAR, lines, CARD_NUMBER)] * ORDERS
+    with tempfile.TemporaryDirectory() as directory:
+        with CheckoutWorkerPool(os.path.join(directory, "stock.ledger"), workers=workers) as pool:
+            for sku, _, _, _ in lines:
+                pool.stock(sku, ORDERS)
+            pool.place_orders(requests[:workers * 16])  # Start every worker before timing
+            start = time.perf_counter()
+            results = pool.place_orders(requests[workers * 16:])
+            elapsed = time.perf_counter() - start
+    assert all(results)
+    return len(results) / elapsed
+
+
+def main():
+    print(f"{'workers':>7} {'orders/sec':>12}  ({os.cpu_count()} cores, {LINES_PER_ORDER} lines per order)")
+    worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    for workers in worker_counts:
+        print(f"{workers:>7} {run(workers):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
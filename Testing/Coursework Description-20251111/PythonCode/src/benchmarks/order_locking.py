@@ -0,0 +1,73 @@
+"""Order throughput against thread count with striped inventory locks.
+
+Each thread places orders for its own products through one shared OrderService
+and InventoryService, with a payment call that sleeps to stand in for the
+processor round trip. The "global lock" column holds one lock around the whole
+of place_order, as OrderService used to.
+Run from src: python -m benchmarks.order_locking
+"""
+
+import threading
+import time
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from InventoryService import InventoryService
+from OrderService import OrderService
+from PaymentService import PaymentService
+from Product import Product
+from ShoppingCart import ShoppingCart
+
+ORDERS_PER_THREAD = 200
+PAYMENT_LATENCY = 0.001  # seconds
+CARD_NUMBER = "1234567890123456"
+
+
+class SlowPaymentService(PaymentService):
+    def process_payment(self, credit_card_number: str, amount: float) -> bool:
+        time.sleep(PAYMENT_LATENCY)
+        return super().process_payment(credit_card_number, amount)
+
+
+class GlobalLockOrderService(OrderService):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._order_lock = threading.Lock()
+
+    def place_order(self, cart: ShoppingCart, credit_card_number: str) -> bool:
+        with self._order_lock:
+            return super().place_order(cart, credit_card_number)
+
+
+def run(thread_count: int, lock_stripes: int, global_lock: bool = False) -> float:
+    service_class = GlobalLockOrderService if global_lock else OrderService
+    order_service = service_class(SlowPaymentService(), InventoryService(lock_stripes=lock_stripes))
+    discount_service = DiscountService()
+
+    def worker(index: int):
+        product = Product(f"Product {index}", 10.00, ORDERS_PER_THREAD)
+        cart = ShoppingCart(Customer(f"Customer {index}", CustomerType.REGULAR), discount_service)
+        cart.add_item(CartItem(product, 1))
+        for _ in range(ORDERS_PER_THREAD):
+            order_service.place_order(cart, CARD_NUMBER)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(thread_count)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return thread_count * ORDERS_PER_THREAD / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'threads':>7} {'global lock':>12} {'1 stripe':>12} {'64 stripes':>12}  (orders/sec)")
+    for thread_count in (1, 2, 4, 8, 16):
+        print(f"{thread_count:>7} {run(thread_count, 1, global_lock=True):>12.0f} "
+              f"{run(thread_count, 1):>12.0f} {run(thread_count, 64):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Checkout latency added by the order log: place_order with and without an OrderLog.
+
+Run from src: python -m benchmarks.order_log
+"""
+
+import os
+import tempfile
+import time
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from InventoryService import InventoryService
+from OrderLog import OrderLog
+from OrderRecord import OrderOutcome, OrderRecord
+from OrderService import OrderService
+from PaymentService import PaymentService
+from Product import Product
+from ShoppingCart import ShoppingCart
+
+ORDER_COUNT = 50_000
+CARD_NUMBER = "1234567812345678"
+
+
+def make_cart():
+    cart = ShoppingCart(Customer("Customer", CustomerType.PREMIUM), DiscountService())
+    for index in range(5):
+        cart.add_item(CartItem(Product(f"Product {index}", 10.00 + index, 10**9), 1 + index % 3))
+    cart.apply_coupon_code("DISCOUNT10")
+    cart.calculate_final_price()  # Priced before checkout, as when the customer saw the total
+    return cart
+
+
+def time_orders(order_service, cart) -> float:
+    start = time.perf_counter()
+    for _ in range(ORDER_COUNT):
+        order_service.place_order(cart, CARD_NUMBER)
+    return (time.perf_counter() - start) / ORDER_COUNT
+
+
+def main():
+    cart = make_cart()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "orders.log")
+        without_log = time_orders(OrderService(PaymentService(), InventoryService()), cart)
+        with OrderLog(path) as order_log:
+            with_log = time_orders(OrderService(PaymentService(), InventoryService(), order_log), cart)
+
+            # The caller's share alone: building and queueing a record
+            start = time.perf_counter()
+            for _ in range(ORDER_COUNT):
+                order_log.append(OrderRecord.from_cart(order_log.next_order_id(), cart, OrderOutcome.COMPLETED, 1.0))
+            append = (time.perf_counter() - start) / ORDER_COUNT
+            order_log.flush()
+            stats = order_log.get_stats()
+        size = os.path.getsize(path)
+
+    print(f"place_order without log: {without_log * 1e6:6.2f} us")
+    print(f"place_order with log:    {with_log * 1e6:6.2f} us (+{(with_log - without_log) * 1e6:.2f} us)")
+    print(f"record build + append:   {append * 1e6:6.2f} us")
+    print(f"{stats['records']} records in {stats['commits']} commits, {size / stats['records']:.0f} bytes/record")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Payment throughput with one processor call per payment against batched submission.
+
+Callers on many threads pay through a mock gateway with a single connection, so
+round trips of a fixed latency happen one at a time, either directly or through a
+PaymentBatcher.
+Run from src: python -m benchmarks.payment_batching
+"""
+
+import threading
+import time
+from typing import List, Tuple, Union
+
+from PaymentBatcher import PaymentBatcher
+from SimulatedPaymentService import SimulatedPaymentService
+
+THREADS = 64
+PAYMENTS_PER_THREAD = 20
+GATEWAY_LATENCY = 0.002  # seconds
+CARD_NUMBER = "1234567890123456"
+
+
+class SingleConnectionGateway(SimulatedPaymentService):
+    def __init__(self, latency: float):
+        super().__init__(latency)
+        self._connection = threading.Lock()
+
+    def process_payment(self, credit_card_number: str, amount: float) -> bool:
+        with self._connection:
+            return super().process_payment(credit_card_number, amount)
+
+    def _submit_batch(self, payments: List[Tuple[str, float]]) -> List[Union[bool, Exception]]:
+        with self._connection:
+            return super()._submit_batch(payments)
+
+
+def run(payment_service) -> float:
+    def worker():
+        for _ in range(PAYMENTS_PER_THREAD):
+            payment_service.process_payment(CARD_NUMBER, 10.00)
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return THREADS * PAYMENTS_PER_THREAD / (time.perf_counter() - start)
+
+
+def main():
+    gateway = SingleConnectionGateway(GATEWAY_LATENCY)
+    print(f"{'mode':>18} {'payments/sec':>14}  ({THREADS} callers, {GATEWAY_LATENCY * 1000:.0f} ms gateway latency)")
+    print(f"{'per call':>18} {run(gateway):>14.0f}")
+    for batch_size in (16, 64):
+        batcher = PaymentBatcher(gateway, batch_size=batch_size, flush_interval=0.001)
+        print(f"{f'batches of {batch_size}':>18} {run(batcher):>14.0f}")
+        batcher.close()
+
+
+if __name__ == "__main__":
+    main()
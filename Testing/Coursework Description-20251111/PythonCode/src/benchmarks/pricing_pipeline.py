@@ -0,0 +1,74 @@
+"""Discount rate lookup with the tier/customer branch ladder against the compiled pricing pipeline,
+for the shipped three-tier policy and a fifty-tier one.
+
+Run from src: python -m benchmarks.pricing_pipeline
+"""
+
+import random
+import timeit
+
+from CartItem import CartItem
+from CustomerType import CustomerType
+from DiscountService import CUSTOMER_DISCOUNTS, DEFAULT_PRICING_POLICY, DiscountService
+from Money import to_minor_units
+from PricingPipeline import PricingPipeline
+from PricingPolicy import PricingPolicy
+from Product import Product
+
+CALLS = 200_000
+
+
+# The tier, customer and coupon arithmetic as apply_discount did it before the pipeline, in floats
+def ladder_price(tiers, total, customer_type, coupon_rate, coupon_amount):
+    tier_rate = 0.0
+    for threshold, rate in tiers:
+        if total > threshold:
+            tier_rate = rate
+            break
+    discount = tier_rate
+    discount += CUSTOMER_DISCOUNTS[customer_type]
+    discount += coupon_rate
+    total -= coupon_amount
+    return total * (1 - discount)
+
+
+def compare(label, policy, inputs):
+    tiers = policy.get_tiers()
+    pipeline = PricingPipeline(policy)
+    minor_inputs = [(to_minor_units(total), customer_type) for total, customer_type in inputs]
+
+    def run_ladder():
+        for total, customer_type in inputs:
+            ladder_price(tiers, total, customer_type, 0.0, 0.0)
+
+    def run_pipeline():
+        stage = pipeline.stage
+        for total, customer_type in minor_inputs:
+            stage(customer_type)(total, 0, 0)
+
+    rounds = CALLS // len(inputs)
+    ladder = min(timeit.repeat(run_ladder, number=rounds, repeat=5)) / CALLS
+    compiled = min(timeit.repeat(run_pipeline, number=rounds, repeat=5)) / CALLS
+    print(f"{label}, ladder:   {ladder * 1e9:7.0f} ns/call")
+    print(f"{label}, pipeline: {compiled * 1e9:7.0f} ns/call ({ladder / compiled:.2f}x)")
+
+
+def main():
+    rng = random.Random(7)
+    customer_types = list(CustomerType)
+    inputs = [(rng.uniform(0, 20000), rng.choice(customer_types)) for _ in range(1000)]
+    compare(" 3 tiers", DEFAULT_PRICING_POLICY, inputs)
+    many_tiers = PricingPolicy([(400.0 * step, 0.005 * step) for step in range(1, 51)], CUSTOMER_DISCOUNTS, 0.75)
+    compare("50 tiers", many_tiers, inputs)
+
+    # Whole apply_discount call on a two-line cart, for scale
+    discount_service = DiscountService()
+    items = [CartItem(Product("Laptop", 1200.0, 10), 1), CartItem(Product("Mouse", 40.0, 10), 2)]
+    sku_counts = discount_service.index_cart(items)
+    full = min(timeit.repeat(lambda: discount_service.apply_discount(1280.0, CustomerType.VIP, items, "DISCOUNT10",
+                                                                      sku_counts), number=CALLS, repeat=5)) / CALLS
+    print(f"apply_discount:           {full * 1e9:7.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Memory used by a product catalog held as Product objects against a ProductTable.
+
+Run from src: python -m benchmarks.product_memory
+"""
+
+import gc
+import tracemalloc
+
+from CartItem import CartItem
+from Product import Product
+from ProductTable import ProductTable
+
+PRODUCT_COUNT = 200_000
+
+
+def measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def build_products():
+    return [Product(f"Product {index}", 10.0 + index % 1000, 100) for index in range(PRODUCT_COUNT)]
+
+
+def build_table():
+    table = ProductTable()
+    table.extend((f"Product {index}", 10.0 + index % 1000, 100) for index in range(PRODUCT_COUNT))
+    return table
+
+
+def build_cart_items():
+    product = Product("Mouse", 50.0, 100)
+    return [CartItem(product, 1) for _ in range(PRODUCT_COUNT)]
+
+
+def main():
+    products = measure(build_products)
+    table = measure(build_table)
+    print(f"{PRODUCT_COUNT} products")
+    print(f"  Product objects: {products / PRODUCT_COUNT:7.1f} bytes/product")
+    print(f"  ProductTable:    {table / PRODUCT_COUNT:7.1f} bytes/product ({products / table:.1f}x smaller)")
+    print(f"  CartItem:        {measure(build_cart_items) / PRODUCT_COUNT:7.1f} bytes/line")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Writing receipts for many orders to one file: a print() per line against the buffered bulk renderer.
+
+Run from src: python -m benchmarks.receipt_rendering
+"""
+
+import contextlib
+import os
+import random
+import tempfile
+import time
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from Product import Product
+from ReceiptRenderer import ReceiptRenderer
+from ShoppingCart import ShoppingCart
+
+ORDER_COUNT = 5_000
+LINES_PER_ORDER = 20
+
+
+# The receipt as print_receipt produced it before the renderer
+def print_lines(cart):
+    print("----- Shopping Cart Receipt -----")
+    for item in cart.get_items():
+        print(f"{item.get_product().get_name()} - {item.get_quantity()} x ${item.get_product().get_price():.2f}")
+    print("---------------------------------")
+    print(f"Total before discount: ${cart.calculate_total():.2f}")
+    print(f"Final price after discounts: ${cart.calculate_final_price():.2f}")
+
+
+def build_carts():
+    rng = random.Random(3)
+    discount_service = DiscountService()
+    products = [Product(f"Product {index}", round(rng.uniform(1, 500), 2), 10**9) for index in range(500)]
+    carts = []
+    for _ in range(ORDER_COUNT):
+        cart = ShoppingCart(Customer("Customer", rng.choice(list(CustomerType))), discount_service)
+        for product in rng.sample(products, LINES_PER_ORDER):
+            cart.add_item(CartItem(product, rng.randint(1, 3)))
+        carts.append(cart)
+    return carts
+
+
+def main():
+    carts = build_carts()
+    for cart in carts:
+        cart.calculate_final_price()  # Both runs format already-priced carts
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "receipts.txt")
+
+        with open(path, "w", encoding="utf-8") as file, contextlib.redirect_stdout(file):
+            start = time.perf_counter()
+            for cart in carts:
+                print_lines(cart)
+            printed = time.perf_counter() - start
+
+        with open(path, "wb") as file:
+            start = time.perf_counter()
+            ReceiptRenderer().write_many(carts, file)
+            rendered = time.perf_counter() - start
+
+    print(f"{ORDER_COUNT} receipts x {LINES_PER_ORDER} lines")
+    print(f"print() per line:  {printed * 1e3:8.1f} ms")
+    print(f"write_many:        {rendered * 1e3:8.1f} ms ({printed / rendered:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
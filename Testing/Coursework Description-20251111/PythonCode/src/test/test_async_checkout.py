@@ -0,0 +1,102 @@
+"""Orders shall also be placeable from async code: place_order_async reserves stock,
+awaits the payment service and commits or releases the stock like place_order, and
+checkouts waiting on payment overlap on one event loop."""
+
+import asyncio
+import threading
+import time
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from InventoryService import InventoryService
+from OrderService import OrderService
+from Product import Product
+from ShoppingCart import ShoppingCart
+from SimulatedPaymentService import SimulatedPaymentService
+
+CARD_NUMBER = "1234567890123456"
+
+
+def make_cart(product, quantity=1):
+    cart = ShoppingCart(Customer("John", CustomerType.REGULAR), DiscountService())
+    cart.add_item(CartItem(product, quantity))
+    return cart
+
+
+def test_async_order_commits_stock():
+    # ARRANGE
+    mouse = Product("Mouse", 50.00, 10)
+    order_service = OrderService(SimulatedPaymentService(latency=0), InventoryService())
+
+    # ACT
+    result = asyncio.run(order_service.place_order_async(make_cart(mouse, 3), CARD_NUMBER))
+
+    # ASSERT
+    assert result is True
+    assert mouse.get_stock() == 7
+
+
+def test_async_order_with_failed_payment_returns_stock():
+    # ARRANGE: Invalid card and zero amount make the payment fail
+    free_mouse = Product("Mouse", 0.00, 10)
+    inventory = InventoryService()
+    order_service = OrderService(SimulatedPaymentService(latency=0), inventory)
+
+    # ACT
+    result = asyncio.run(order_service.place_order_async(make_cart(free_mouse, 3), "123"))
+
+    # ASSERT
+    assert result is False
+    assert free_mouse.get_stock() == 10
+    assert inventory.get_pending_count() == 0
+
+
+def test_checkouts_overlap_while_waiting_on_payment():
+    # ARRANGE: 50 orders with a 50 ms payment each
+    mouse = Product("Mouse", 50.00, 50)
+    order_service = OrderService(SimulatedPaymentService(latency=0.05), InventoryService())
+    carts = [make_cart(mouse) for _ in range(50)]
+
+    async def place_all():
+        return await asyncio.gather(*(order_service.place_order_async(cart, CARD_NUMBER) for cart in carts))
+
+    # ACT
+    start = time.perf_counter()
+    results = asyncio.run(place_all())
+    elapsed = time.perf_counter() - start
+
+    # ASSERT: Far quicker than 50 sequential payments (2.5 seconds)
+    assert results == [True] * 50
+    assert mouse.get_stock() == 0
+    assert elapsed < 1.0
+
+
+def test_contended_reservation_does_not_block_the_loop():
+    # ARRANGE: Another thread holds the mouse's stock lock for a while
+    mouse = Product("Mouse", 50.00, 10)
+    inventory = InventoryService()
+    order_service = OrderService(SimulatedPaymentService(latency=0), inventory)
+    lock = inventory._stock_locks_for([mouse])[0]
+    lock.acquire()
+    threading.Timer(0.2, lock.release).start()
+    ticks = []
+
+    async def ticker(order):
+        while not order.done():
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        order = asyncio.ensure_future(order_service.place_order_async(make_cart(mouse), CARD_NUMBER))
+        await ticker(order)
+        return await order
+
+    # ACT
+    placed = asyncio.run(main())
+
+    # ASSERT: Other tasks kept running while the order waited for the lock
+    assert placed is True
+    assert mouse.get_stock() == 9
+    assert len(ticks) >= 5
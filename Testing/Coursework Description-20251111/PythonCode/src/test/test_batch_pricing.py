@@ -0,0 +1,47 @@
+"""DiscountService.price_batch shall price many shopping carts in one call and return,
+for every cart, exactly the final price calculate_final_price gives for that cart."""
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from Product import Product
+from ShoppingCart import ShoppingCart
+
+
+def make_cart(discount_service, customer_type, lines, coupon_code=None, promotion=False):
+    cart = ShoppingCart(Customer("Batch", customer_type), discount_service)
+    for product, quantity in lines:
+        cart.add_item(CartItem(product, quantity))
+    cart.apply_coupon_code(coupon_code)
+    cart.set_promotion_active(promotion)
+    return cart
+
+
+def test_batch_matches_scalar_pricing():
+    # ARRANGE: Carts covering every tier, customer type, coupon and promotion
+    discount_service = DiscountService()
+    laptop = Product("Laptop", 3000.00, 100)
+    mouse = Product("Mouse", 99.99, 100)
+    keyboard = Product("Keyboard", 150.00, 100)
+    monitor = Product("Monitor", 8000.00, 100)
+    carts = [
+        make_cart(discount_service, CustomerType.REGULAR, []),
+        make_cart(discount_service, CustomerType.REGULAR, [(mouse, 3)]),
+        make_cart(discount_service, CustomerType.PREMIUM, [(laptop, 1), (mouse, 2)], "DISCOUNT10"),
+        make_cart(discount_service, CustomerType.VIP, [(laptop, 2), (mouse, 1), (keyboard, 4)], "SAVE50"),
+        make_cart(discount_service, CustomerType.VIP, [(monitor, 1), (keyboard, 1)], "INVALID"),
+        make_cart(discount_service, CustomerType.REGULAR, [(monitor, 2), (laptop, 1), (mouse, 5)], " "),
+        make_cart(discount_service, CustomerType.PREMIUM, [(laptop, 1), (mouse, 1)], "SAVE50", promotion=True),
+    ]
+
+    # ACT
+    batch_prices = discount_service.price_batch(carts)
+
+    # ASSERT: Identical to pricing each cart on its own
+    assert batch_prices.tolist() == [cart.calculate_final_price() for cart in carts]
+
+
+def test_batch_of_no_carts():
+    # ACT & ASSERT
+    assert DiscountService().price_batch([]).tolist() == []
@@ -0,0 +1,58 @@
+"""The benchmark harness shall generate a repeatable synthetic workload from its options,
+report throughput and latency percentiles for each run, and flag regressions against a
+saved run."""
+
+import pytest
+
+from benchmarks.harness import (WorkloadConfig, find_regressions, generate_requests, parse_cart_size,
+                                parse_customer_mix, run_scenario)
+from CustomerType import CustomerType
+
+
+def test_workload_is_repeatable_and_follows_options():
+    # ARRANGE
+    config = WorkloadConfig(operations=300, catalog_size=50, cart_size="uniform:2:4",
+                            customer_mix=parse_customer_mix("premium=1,vip=0"), coupon_share=1.0)
+
+    # ACT
+    requests = generate_requests(config)
+
+    # ASSERT
+    assert requests == generate_requests(config)
+    assert len(requests) == 300
+    assert all(2 <= len(request.lines) <= 4 for request in requests)
+    assert all(request.customer_type is CustomerType.PREMIUM for request in requests)
+    assert all(request.coupon_code == "DISCOUNT10" for request in requests)
+
+
+@pytest.mark.parametrize("spec", ["fixed:0", "uniform:5:2", "geometric:0.5", "normal:3", "uniform:a:b"])
+def test_invalid_cart_size_is_rejected(spec):
+    # ACT & ASSERT
+    with pytest.raises(ValueError):
+        parse_cart_size(spec)
+
+
+@pytest.mark.parametrize("scenario", ["price", "order"])
+def test_scenario_reports_every_operation(scenario):
+    # ARRANGE
+    requests = generate_requests(WorkloadConfig(operations=50, catalog_size=20))
+
+    # ACT
+    row = run_scenario(scenario, "threads", requests, workers=2)
+
+    # ASSERT
+    assert row["operations"] == row["succeeded"] == 50
+    assert row["throughput"] > 0
+    assert 0 < row["p50_us"] <= row["p99_us"] <= row["max_us"]
+    assert row["tracemalloc_peak_kb"] > 0
+
+
+def test_regressions_beyond_tolerance_are_flagged():
+    # ARRANGE
+    baseline = [{"scenario": "order", "mode": "single", "workers": 1, "throughput": 1000.0, "p99_us": 50.0}]
+    within = [dict(baseline[0], throughput=950.0, p99_us=54.0)]
+    slower = [dict(baseline[0], throughput=800.0, p99_us=80.0)]
+
+    # ACT & ASSERT
+    assert find_regressions(baseline, within, tolerance=0.10) == []
+    assert len(find_regressions(baseline, slower, tolerance=0.10)) == 2
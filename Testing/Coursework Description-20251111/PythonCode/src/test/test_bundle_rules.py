@@ -0,0 +1,105 @@
+"""Bundle promotions are declared as data (trigger SKUs, target SKUs, percentage or
+fixed amount off, maximum applications) and compiled into a trigger lookup table so
+only rules whose trigger products are in the cart are evaluated."""
+
+import pytest
+
+from BundleRule import BundleRule, BundleDiscountType
+from BundleRuleEngine import BundleRuleEngine
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DEFAULT_PRICING_POLICY, DiscountService
+from Money import RoundingMode
+from PricingPolicy import PricingPolicy
+from Product import Product
+from ShoppingCart import ShoppingCart
+
+
+def test_only_triggered_rules_are_candidates():
+    # ARRANGE: Two rules, only the keyboard rule's trigger is in the cart
+    laptop_rule = BundleRule("Laptop + Bag", ["laptop"], ["bag"], BundleDiscountType.PERCENTAGE, 10)
+    keyboard_rule = BundleRule("Keyboard + Mouse", ["keyboard"], ["mouse"], BundleDiscountType.FIXED, 5)
+    engine = BundleRuleEngine([laptop_rule, keyboard_rule])
+
+    # ACT
+    candidates = engine.candidate_rules({"keyboard": 1, "mouse": 1})
+
+    # ASSERT
+    assert candidates == [keyboard_rule]
+
+
+def test_fixed_bundle_discount():
+    # ARRANGE: £5 off a mouse for every keyboard
+    rule = BundleRule("Keyboard + Mouse", ["keyboard"], ["mouse"], BundleDiscountType.FIXED, 5)
+    customer = Customer("John", CustomerType.REGULAR)
+    cart = ShoppingCart(customer, DiscountService(bundle_rules=[rule]))
+
+    # ACT
+    cart.add_item(CartItem(Product("Keyboard", 100.00, 10), 2))
+    cart.add_item(CartItem(Product("Mouse", 50.00, 10), 3))
+
+    # ASSERT: Two keyboards unlock two mice, 350 - 2 * 5 = 340
+    assert cart.calculate_final_price() == 340.00
+
+
+def test_max_applications_caps_discounted_units():
+    # ARRANGE: 10% off a mouse per laptop, at most one per cart
+    rule = BundleRule("Laptop + Mouse", ["laptop"], ["mouse"], BundleDiscountType.PERCENTAGE, 10, max_applications=1)
+    customer = Customer("Jane", CustomerType.REGULAR)
+    cart = ShoppingCart(customer, DiscountService(bundle_rules=[rule]))
+
+    # ACT
+    cart.add_item(CartItem(Product("Laptop", 150.00, 10), 3))
+    cart.add_item(CartItem(Product("Mouse", 100.00, 10), 3))
+
+    # ASSERT: 750 - 10 (only one mouse discounted) = 740
+    assert cart.calculate_final_price() == 740.00
+
+
+def test_target_unit_discounted_by_one_rule_only():
+    # ARRANGE: Two rules competing for the same single mouse
+    first = BundleRule("Laptop + Mouse", ["laptop"], ["mouse"], BundleDiscountType.FIXED, 20)
+    second = BundleRule("Keyboard + Mouse", ["keyboard"], ["mouse"], BundleDiscountType.FIXED, 5)
+    engine = BundleRuleEngine([first, second])
+    items = [
+        CartItem(Product("Laptop", 150.00, 10), 1),
+        CartItem(Product("Keyboard", 50.00, 10), 1),
+        CartItem(Product("Mouse", 40.00, 10), 1),
+    ]
+
+    # ACT
+    applications = engine.evaluate(items, DiscountService.index_cart(items))
+
+    # ASSERT: The first declared rule claims the mouse
+    assert [(a.rule, a.units, a.savings) for a in applications] == [(first, 1, 20)]
+
+
+def test_fixed_discount_never_exceeds_unit_price():
+    # ARRANGE
+    rule = BundleRule("Laptop + Cable", ["laptop"], ["cable"], BundleDiscountType.FIXED, 15)
+
+    # ACT & ASSERT: A £10 cable can only be discounted by £10
+    assert rule.unit_savings(10.00) == 10.00
+
+
+def test_rule_requires_triggers_and_targets():
+    # ACT & ASSERT
+    with pytest.raises(ValueError):
+        BundleRule("Empty", [], ["mouse"], BundleDiscountType.PERCENTAGE, 10)
+
+
+@pytest.mark.parametrize("rounding, savings", [(RoundingMode.HALF_UP, 0.03), (RoundingMode.HALF_EVEN, 0.02)])
+def test_bundle_savings_follow_policy_rounding(rounding, savings):
+    # ARRANGE: 10% off a 0.25 mouse is exactly half a cent over 0.02
+    policy = PricingPolicy.from_dict(dict(DEFAULT_PRICING_POLICY.to_dict(), rounding=rounding.value))
+    cart = ShoppingCart(Customer("John", CustomerType.REGULAR), DiscountService(policy=policy))
+    cart.add_item(CartItem(Product("Laptop", 10.00, 5), 1))
+    cart.add_item(CartItem(Product("Mouse", 0.25, 5), 1))
+
+    # ACT
+    pricing = cart.get_pricing()
+
+    # ASSERT: The single cart and batch paths round the same way
+    assert pricing.bundle_savings == savings
+    assert cart.get_discount_service().price_batch([cart]).tolist() == [pricing.final_price]
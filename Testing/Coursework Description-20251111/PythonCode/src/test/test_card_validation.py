@@ -0,0 +1,65 @@
+"""Card numbers shall be validated as ASCII digits of an allowed length, optionally with
+the Luhn checksum and issuer BIN ranges, one card at a time or in bulk, and a payment
+shall be refused when either the card or the amount is invalid."""
+
+import pytest
+
+from CardValidator import CardValidator
+from PaymentService import PaymentService
+
+VISA_TEST_CARD = "4111111111111111"
+MASTERCARD_TEST_CARD = "5500005555555559"
+
+
+def test_default_checks_digits_and_length():
+    # ARRANGE
+    validator = CardValidator()
+
+    # ACT & ASSERT
+    assert validator.validate("1234567890123456")
+    assert not validator.validate("123456789012345a")
+    assert not validator.validate("1234 5678 9012 3456")
+    assert not validator.validate("١٢٣٤٥٦٧٨٩٠١٢٣٤٥٦")  # Non-ASCII digits
+
+
+def test_luhn_checksum():
+    # ARRANGE
+    validator = CardValidator(check_luhn=True)
+
+    # ACT & ASSERT
+    assert validator.validate(VISA_TEST_CARD)
+    assert not validator.validate("4111111111111112")
+
+
+def test_bin_ranges():
+    # ARRANGE: Only Visa issuers allowed
+    validator = CardValidator(check_luhn=True, bin_ranges=[(400000, 499999)])
+
+    # ACT & ASSERT
+    assert validator.validate(VISA_TEST_CARD)
+    assert not validator.validate(MASTERCARD_TEST_CARD)
+
+
+def test_batch_matches_single_card_validation():
+    # ARRANGE
+    validator = CardValidator(lengths=(15, 16), check_luhn=True, bin_ranges=[(340000, 379999), (400000, 559999)])
+    cards = [VISA_TEST_CARD, MASTERCARD_TEST_CARD, "378282246310005", "4111111111111112", "1234567890123456",
+             "411111111111111a", "", "41111111111111111", "6011111111111117"]
+
+    # ACT
+    batch = validator.validate_batch(cards)
+
+    # ASSERT
+    assert batch.tolist() == [validator.validate(card) for card in cards]
+    assert batch.tolist() == [True, True, True, False, False, False, False, False, False]
+
+
+def test_payment_uses_configured_validator():
+    # ARRANGE: Payment service that requires a Luhn-valid card
+    payment_service = PaymentService(CardValidator(check_luhn=True))
+
+    # ACT & ASSERT
+    assert payment_service.process_payment(VISA_TEST_CARD, 10.00) is True
+    with pytest.raises(Exception) as exc_info:
+        payment_service.process_payment("1234567890123456", 10.00)
+    assert "Payment failed" in str(exc_info.value)
@@ -0,0 +1,38 @@
+"""The discount service shall analyse the cart in a single pass, indexing the number
+of units per product SKU so bundle rules do not rescan the cart. Products without an
+explicit SKU are identified by their casefolded name."""
+
+from Product import Product
+from CartItem import CartItem
+from DiscountService import DiscountService
+
+
+def test_index_counts_units_per_casefolded_name():
+    # ARRANGE: Same product name with different casing on separate lines
+    items = [
+        CartItem(Product("Laptop", 200.00, 10), 2),
+        CartItem(Product("LAPTOP", 200.00, 10), 1),
+        CartItem(Product("Mouse", 100.00, 20), 3),
+    ]
+
+    # ACT
+    name_counts = DiscountService.index_cart(items)
+
+    # ASSERT: Lines are merged by casefolded name and quantities summed
+    assert name_counts == {"laptop": 3, "mouse": 3}
+
+
+def test_index_uses_explicit_sku():
+    # ARRANGE: Two differently named products sharing one SKU
+    items = [
+        CartItem(Product("Laptop 14in", 900.00, 10, sku="LT-1"), 1),
+        CartItem(Product("Laptop 14 inch", 900.00, 10, sku="LT-1"), 2),
+    ]
+
+    # ACT & ASSERT
+    assert DiscountService.index_cart(items) == {"LT-1": 3}
+
+
+def test_index_of_empty_cart():
+    # ACT & ASSERT: Empty cart produces an empty index
+    assert DiscountService.index_cart([]) == {}
@@ -0,0 +1,90 @@
+"""The shopping cart shall hold one line per product: adding a product that is already
+in the cart merges the quantities, and removals and quantity updates change that line
+in place while keeping the order products were first added in."""
+
+import pytest
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from Product import Product
+from ShoppingCart import ShoppingCart
+
+
+def make_cart():
+    return ShoppingCart(Customer("John", CustomerType.REGULAR), DiscountService())
+
+
+def test_adding_same_product_merges_lines():
+    # ARRANGE
+    mouse = Product("Mouse", 50.00, 20)
+    keyboard = Product("Keyboard", 150.00, 15)
+    cart = make_cart()
+
+    # ACT
+    cart.add_item(CartItem(mouse, 1))
+    cart.add_item(CartItem(keyboard, 1))
+    cart.add_item(CartItem(mouse, 2))
+
+    # ASSERT: Two lines, mouse first with the merged quantity
+    assert [(item.get_product(), item.get_quantity()) for item in cart.get_items()] == [(mouse, 3), (keyboard, 1)]
+    assert cart.calculate_total() == 300.00
+
+
+def test_remove_item_takes_its_quantity_off_the_line():
+    # ARRANGE
+    mouse = Product("Mouse", 50.00, 20)
+    cart = make_cart()
+    first = CartItem(mouse, 1)
+    cart.add_item(first)
+    cart.add_item(CartItem(mouse, 2))
+
+    # ACT
+    cart.remove_item(first)
+
+    # ASSERT
+    assert [item.get_quantity() for item in cart.get_items()] == [2]
+    assert cart.calculate_total() == 100.00
+
+
+def test_update_quantity_and_remove_line():
+    # ARRANGE
+    mouse = Product("Mouse", 50.00, 20)
+    keyboard = Product("Keyboard", 150.00, 15)
+    cart = make_cart()
+    cart.add_item(CartItem(mouse, 1))
+    cart.add_item(CartItem(keyboard, 1))
+
+    # ACT
+    cart.update_quantity(mouse, 4)
+    cart.update_quantity(keyboard, 0)
+
+    # ASSERT
+    assert [(item.get_product(), item.get_quantity()) for item in cart.get_items()] == [(mouse, 4)]
+    assert cart.get_sku_counts() == {"mouse": 4}
+    assert cart.calculate_total() == 200.00
+
+
+def test_removing_product_not_in_cart():
+    # ARRANGE
+    cart = make_cart()
+
+    # ACT & ASSERT
+    with pytest.raises(ValueError):
+        cart.remove_item(CartItem(Product("Mouse", 50.00, 20), 1))
+
+
+@pytest.mark.parametrize("in_cart", [0, 3])
+def test_negative_quantity_is_rejected(in_cart):
+    # ARRANGE
+    pen = Product("Pen", 10.00, 20)
+    cart = make_cart()
+    if in_cart:
+        cart.add_item(CartItem(pen, in_cart))
+
+    # ACT & ASSERT: The cart is left as it was
+    with pytest.raises(ValueError):
+        cart.update_quantity(pen, -2)
+    assert cart.calculate_total() == 10.00 * in_cart
+    assert [item.get_quantity() for item in cart.get_items()] == ([in_cart] if in_cart else [])
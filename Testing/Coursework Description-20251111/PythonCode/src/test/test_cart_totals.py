@@ -0,0 +1,49 @@
+"""The shopping cart shall keep its subtotal and the number of units per product SKU up
+to date as items are added and removed, so totals and bundle rule inputs are available
+without rescanning the cart."""
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from Product import Product
+from ShoppingCart import ShoppingCart
+
+
+def test_running_totals_follow_adds_and_removes():
+    # ARRANGE
+    laptop = Product("Laptop", 1000.00, 10)
+    mouse = Product("Mouse", 50.00, 20)
+    cart = ShoppingCart(Customer("John", CustomerType.REGULAR), DiscountService())
+    laptop_line = CartItem(laptop, 2)
+    mouse_line = CartItem(mouse, 3)
+
+    # ACT & ASSERT: Add both lines
+    cart.add_item(laptop_line)
+    cart.add_item(mouse_line)
+    assert cart.calculate_total() == 2150.00
+    assert cart.get_sku_counts() == {"laptop": 2, "mouse": 3}
+    assert cart.has_sku("laptop")
+
+    # ACT & ASSERT: Removing the laptop line drops its SKU
+    cart.remove_item(laptop_line)
+    assert cart.calculate_total() == 150.00
+    assert cart.get_sku_counts() == {"mouse": 3}
+    assert not cart.has_sku("laptop")
+
+
+def test_empty_cart_after_removals_has_zero_total():
+    # ARRANGE: A price that does not add and subtract exactly in floating point
+    cart = ShoppingCart(Customer("Jane", CustomerType.REGULAR), DiscountService())
+    first = CartItem(Product("Cable", 0.1, 10), 1)
+    second = CartItem(Product("Adapter", 0.2, 10), 1)
+    cart.add_item(first)
+    cart.add_item(second)
+
+    # ACT
+    cart.remove_item(first)
+    cart.remove_item(second)
+
+    # ASSERT
+    assert cart.calculate_total() == 0
+    assert cart.get_sku_counts() == {}
@@ -0,0 +1,151 @@
+"""Checkout stages shall be counted and timed into per-thread latency histograms that can
+be exported as one snapshot, and record nothing while metrics are disabled."""
+
+import threading
+
+import pytest
+
+from CartItem import CartItem
+from CheckoutMetrics import CheckoutMetrics, LatencyHistogram
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from InventoryService import InventoryService
+from OrderService import OrderService
+from PaymentService import PaymentService
+from Product import Product
+from ShoppingCart import ShoppingCart
+
+CARD_NUMBER = "1234567890123456"
+
+
+def make_checkout(metrics):
+    order_service = OrderService(PaymentService(), InventoryService(metrics=metrics), metrics=metrics)
+    cart = ShoppingCart(Customer("John", CustomerType.REGULAR), DiscountService(metrics=metrics))
+    cart.add_item(CartItem(Product("Laptop", 1000.00, 10), 1))
+    return order_service, cart
+
+
+@pytest.mark.parametrize("value", [0, 1, 127, 128, 1000, 123_456, 987_654_321])
+def test_histogram_percentiles_are_within_bucket_precision(value):
+    # ARRANGE
+    histogram = LatencyHistogram()
+
+    # ACT
+    histogram.record(value)
+
+    # ASSERT: the reported value is the recorded one to within 1/64
+    assert abs(histogram.value_at_percentile(50) - value) <= value / 64
+    assert histogram.get_max() == value
+
+
+def test_histogram_percentiles_and_merge():
+    # ARRANGE: 1..1000 ns split over two histograms
+    first, second = LatencyHistogram(), LatencyHistogram()
+    for value in range(1, 1001):
+        (first if value % 2 else second).record(value)
+
+    # ACT
+    first.merge(second)
+
+    # ASSERT
+    assert first.get_count() == 1000
+    assert first.get_mean() == pytest.approx(500.5)
+    assert first.value_at_percentile(50) == pytest.approx(500, rel=1 / 64)
+    assert first.value_at_percentile(99) == pytest.approx(990, rel=1 / 64)
+    assert first.value_at_percentile(100) == 1000
+
+
+def test_checkout_stages_are_counted_and_timed():
+    # ARRANGE
+    metrics = CheckoutMetrics()
+    order_service, cart = make_checkout(metrics)
+    cart.calculate_final_price()
+
+    # ACT
+    placed = order_service.place_order(cart, CARD_NUMBER)
+    declined = order_service.place_order(cart, "123")
+    snapshot = metrics.snapshot()
+
+    # ASSERT
+    assert placed is True and declined is False
+    assert set(snapshot) == {"apply_discount", "calculate_total", "place_order", "process_payment", "reserve"}
+    assert snapshot["reserve"]["count"] == 2
+    assert snapshot["apply_discount"]["count"] == 1  # The cart's price cache answers the second time
+    assert snapshot["process_payment"] == dict(snapshot["process_payment"], count=2, errors=1)
+    assert snapshot["place_order"]["errors"] == 0  # place_order reports failures, it does not raise
+    assert 0 < snapshot["place_order"]["p50_us"] <= snapshot["place_order"]["max_us"]
+
+
+def test_update_stock_is_timed():
+    # ARRANGE
+    metrics = CheckoutMetrics()
+    inventory = InventoryService(metrics=metrics)
+    product = Product("Mouse", 50.00, 1)
+
+    # ACT
+    inventory.update_stock(CartItem(product, 1))
+    with pytest.raises(RuntimeError):
+        inventory.update_stock(CartItem(product, 1))
+
+    # ASSERT
+    assert metrics.snapshot()["update_stock"] == dict(metrics.snapshot()["update_stock"], count=2, errors=1)
+
+
+def test_threads_record_separately_into_one_snapshot():
+    # ARRANGE
+    metrics = CheckoutMetrics()
+
+    def worker():
+        for _ in range(1000):
+            metrics.call("stage", lambda: None)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+
+    # ACT
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # ASSERT
+    assert metrics.snapshot()["stage"]["count"] == 4000
+    assert metrics.get_histogram("stage").get_count() == 4000
+
+
+def test_ended_threads_are_folded_into_one_recorder():
+    # ARRANGE: Short-lived threads, one after another, as in a pool that replaces its workers
+    metrics = CheckoutMetrics()
+
+    def worker():
+        metrics.call("stage", lambda: None)
+        with pytest.raises(ValueError):
+            metrics.call("stage", int, "x")
+
+    # ACT
+    for _ in range(50):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+    snapshot = metrics.snapshot()
+
+    # ASSERT: Every call still counted, but no recorder is kept for an ended thread
+    assert snapshot["stage"]["count"] == 100
+    assert snapshot["stage"]["errors"] == 50
+    assert metrics.get_recorder_count() == 0
+
+
+def test_disabled_metrics_record_nothing():
+    # ARRANGE
+    metrics = CheckoutMetrics(enabled=False)
+    order_service, cart = make_checkout(metrics)
+
+    # ACT
+    placed = order_service.place_order(cart, CARD_NUMBER)
+    metrics.set_enabled(True)
+    metrics.call("stage", lambda: None)
+    metrics.reset()
+
+    # ASSERT
+    assert placed is True
+    assert metrics.snapshot() == {}
@@ -0,0 +1,97 @@
+"""Orders can be placed by a pool of worker processes sharing inventory through a stock
+ledger file, without selling more stock than there is."""
+
+import functools
+
+from CartItem import CartItem
+from CheckoutWorkerPool import CheckoutRequest, CheckoutWorkerPool
+from Coupon import Coupon, CouponType
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from PaymentService import PaymentService
+from Product import Product
+from ShoppingCart import ShoppingCart
+from SqliteCouponRegistry import SqliteCouponRegistry
+
+CARD_NUMBER = "1234567890123456"
+
+
+class CappedPaymentService(PaymentService):
+    # Declines charges over 50, so a test can see the amount a worker charged
+    def process_payment(self, credit_card_number: str, amount: float) -> bool:
+        return amount <= 50 and super().process_payment(credit_card_number, amount)
+
+
+def shared_coupon_discount_service(registry_path: str) -> DiscountService:
+    return DiscountService(coupon_registry=SqliteCouponRegistry(registry_path))
+
+
+def test_request_from_cart():
+    # ARRANGE
+    cart = ShoppingCart(Customer("John", CustomerType.VIP), DiscountService())
+    cart.add_item(CartItem(Product("Mouse", 50.00, 10), 2))
+    cart.apply_coupon_code("SAVE50")
+
+    # ACT
+    request = CheckoutRequest.from_cart(cart, CARD_NUMBER)
+
+    # ASSERT
+    assert request == CheckoutRequest(CustomerType.VIP, (("mouse", "Mouse", 50.00, 2),), CARD_NUMBER, "SAVE50", False)
+
+
+def test_workers_do_not_oversell(tmp_path):
+    # ARRANGE: 30 mice, 50 orders for 1 mouse each and one order that cannot be paid
+    request = CheckoutRequest(CustomerType.REGULAR, (("mouse", "Mouse", 50.00, 1),), CARD_NUMBER)
+    bad_card = request._replace(credit_card_number="123")
+
+    with CheckoutWorkerPool(str(tmp_path / "stock.ledger"), workers=3) as pool:
+        pool.stock("mouse", 30)
+
+        # ACT
+        results = pool.place_orders([bad_card] + [request] * 50, chunksize=4)
+
+        # ASSERT: The failed payment gives its stock back, so exactly 30 orders succeed
+        assert results[0] is False
+        assert results.count(True) == 30
+        assert pool.get_stock("mouse") == 0
+
+
+def test_workers_charge_each_request_at_its_own_price(tmp_path):
+    # ARRANGE: The same SKU requested at 100.00, then at 40.00
+    expensive = CheckoutRequest(CustomerType.REGULAR, (("mouse", "Mouse", 100.00, 1),), CARD_NUMBER)
+    cheap = CheckoutRequest(CustomerType.REGULAR, (("mouse", "Mouse", 40.00, 1),), CARD_NUMBER)
+
+    with CheckoutWorkerPool(str(tmp_path / "stock.ledger"), workers=1,
+                            payment_service_factory=CappedPaymentService) as pool:
+        pool.stock("mouse", 10)
+
+        # ACT
+        results = pool.place_orders([expensive, cheap], chunksize=1)
+
+    # ASSERT: Only the 40.00 order fits under the cap
+    assert results == [False, True]
+
+
+def test_workers_share_a_coupon_registry_from_the_factory(tmp_path):
+    # ARRANGE: A single-use coupon in a registry file every worker opens
+    registry_path = str(tmp_path / "coupons.db")
+    registry = SqliteCouponRegistry(registry_path, [Coupon("ONCE10", CouponType.PERCENTAGE, 10, max_uses=1)])
+    request = CheckoutRequest(CustomerType.REGULAR, (("mouse", "Mouse", 50.00, 1),), CARD_NUMBER, "ONCE10")
+
+    with CheckoutWorkerPool(str(tmp_path / "stock.ledger"), workers=2,
+                            discount_service_factory=functools.partial(shared_coupon_discount_service,
+                                                                       registry_path)) as pool:
+        pool.stock("mouse", 10)
+
+        # ACT
+        results = pool.place_orders([request] * 6, chunksize=1)
+        stock_left = pool.get_stock("mouse")
+
+    # ASSERT: The cap holds across workers. Checkout only places an order priced with a
+    # registered coupon by redeeming it, so the one order placed is the one priced with
+    # ONCE10; every other order finds it used up and is rejected, giving its stock back
+    assert results.count(True) == 1
+    assert stock_left == 9
+    assert registry.get("ONCE10").get_uses() == 1
+    registry.close()
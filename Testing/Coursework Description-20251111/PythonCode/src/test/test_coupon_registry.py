@@ -0,0 +1,188 @@
+"""Coupon codes shall come from a registry supporting percentage and fixed coupons,
+expiry and per-code usage caps, with each use redeemed atomically when an order is placed."""
+
+import threading
+
+from CartItem import CartItem
+from Coupon import Coupon, CouponType
+from CouponRegistry import CouponRegistry
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from InventoryService import InventoryService
+from OrderService import OrderService
+from PaymentService import PaymentService
+from Product import Product
+from ShoppingCart import ShoppingCart
+from SqliteCouponRegistry import SqliteCouponRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cart(registry, coupon_code):
+    cart = ShoppingCart(Customer("Alice", CustomerType.REGULAR), DiscountService(coupon_registry=registry))
+    cart.add_item(CartItem(Product("Mouse", 100.00, 10), 1))
+    cart.apply_coupon_code(coupon_code)
+    return cart
+
+
+def test_registry_coupons_price_the_cart():
+    # ARRANGE
+    registry = CouponRegistry([Coupon("TAKE20", CouponType.PERCENTAGE, 20), Coupon("MINUS5", CouponType.FIXED, 5)])
+
+    # ACT & ASSERT: Percentage and fixed coupons, unknown codes grant nothing
+    assert make_cart(registry, "TAKE20").calculate_final_price() == 100.00 * (1 - 0.20)
+    assert make_cart(registry, "MINUS5").calculate_final_price() == 95.00
+    assert make_cart(registry, "UNKNOWN").calculate_final_price() == 100.00
+
+
+def test_expired_coupon_is_ignored():
+    # ARRANGE
+    clock = FakeClock()
+    registry = CouponRegistry([Coupon("SPRING", CouponType.FIXED, 10, expires_at=2000.0)], clock=clock)
+
+    # ACT & ASSERT
+    assert registry.lookup("SPRING") is not None
+    clock.now = 2000.0
+    assert registry.lookup("SPRING") is None
+    assert not registry.redeem("SPRING")
+    assert make_cart(registry, "SPRING").calculate_final_price() == 100.00
+
+
+def test_bulk_imported_single_use_codes_redeem_once():
+    # ARRANGE
+    registry = CouponRegistry()
+    imported = registry.import_codes((f"ONE-{n:06d}" for n in range(10000)), CouponType.FIXED, 5)
+
+    # ACT: Many threads race for the same single-use code
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.redeem("ONE-000042"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # ASSERT
+    assert imported == 10000 and len(registry) == 10000
+    assert results.count(True) == 1
+    assert registry.get("ONE-000042").get_uses() == 1
+    assert registry.lookup("ONE-000042") is None
+
+
+def test_order_redeems_coupon_and_returns_it_when_payment_fails():
+    # ARRANGE
+    registry = CouponRegistry([Coupon("ONCE", CouponType.PERCENTAGE, 10, max_uses=1)])
+    order_service = OrderService(PaymentService(), InventoryService())
+
+    # ACT & ASSERT: A failed payment leaves the code unused, a successful order uses it up
+    assert not order_service.place_order(make_cart(registry, "ONCE"), "bad-card")
+    assert registry.get("ONCE").get_uses() == 0
+    assert order_service.place_order(make_cart(registry, "ONCE"), "1234567812345678")
+    assert registry.get("ONCE").get_uses() == 1
+    assert make_cart(registry, "ONCE").calculate_final_price() == 100.00
+
+
+def test_sqlite_registry_persists_uses(tmp_path):
+    # ARRANGE
+    path = str(tmp_path / "coupons.db")
+    registry = SqliteCouponRegistry(path)
+    registry.import_codes(["A1", "A2"], CouponType.PERCENTAGE, 15, max_uses=2)
+
+    # ACT
+    assert registry.redeem("A1") and registry.redeem("A1")
+    registry.close()
+    reopened = SqliteCouponRegistry(path)
+
+    # ASSERT: Uses survive reopening and the cap holds
+    assert len(reopened) == 2
+    assert not reopened.redeem("A1")
+    assert reopened.lookup("A1") is None
+    assert reopened.lookup("A2").discount() == (0.15, 0.0)
+    reopened.release("A1")
+    assert reopened.redeem("A1")
+    reopened.close()
+
+
+def test_cached_price_drops_a_coupon_that_expired():
+    # ARRANGE: A cart priced while its coupon was valid
+    clock = FakeClock()
+    registry = CouponRegistry([Coupon("SPRING10", CouponType.PERCENTAGE, 10, expires_at=2000.0)], clock=clock)
+    cart = make_cart(registry, "SPRING10")
+    assert cart.calculate_final_price() == 90.00
+
+    # ACT
+    clock.now = 2000.0
+
+    # ASSERT
+    assert cart.calculate_final_price() == 100.00
+    assert cart.get_pricing().coupon_code is None
+
+
+def test_cached_price_follows_redemptions_of_its_coupon():
+    # ARRANGE: Two carts priced with the same single-use code, and a cart with another code
+    registry = CouponRegistry([Coupon("ONCE10", CouponType.PERCENTAGE, 10, max_uses=1),
+                               Coupon("TAKE20", CouponType.PERCENTAGE, 20)])
+    waiting, other = make_cart(registry, "ONCE10"), make_cart(registry, "TAKE20")
+    assert waiting.calculate_final_price() == 90.00 and other.calculate_final_price() == 80.00
+
+    # ACT & ASSERT: Using up the code reprices carts holding it, and only those
+    assert registry.redeem("ONCE10")
+    assert waiting.calculate_final_price() == 100.00
+    assert other.get_price_cache_stats() == {"hits": 0, "misses": 1} and other.calculate_final_price() == 80.00
+    assert other.get_price_cache_stats()["hits"] == 1
+    registry.release("ONCE10")
+    assert waiting.calculate_final_price() == 90.00
+
+
+def test_sqlite_registry_version_follows_redemptions(tmp_path):
+    # ARRANGE
+    registry = SqliteCouponRegistry(str(tmp_path / "coupons.db"), [Coupon("ONCE10", CouponType.PERCENTAGE, 10,
+                                                                          max_uses=1)])
+    cart = make_cart(registry, "ONCE10")
+    assert cart.calculate_final_price() == 90.00
+
+    # ACT
+    assert registry.redeem("ONCE10")
+
+    # ASSERT
+    assert cart.calculate_final_price() == 100.00
+    registry.close()
+
+
+def test_cart_keeps_the_discount_its_order_used():
+    # ARRANGE
+    registry = CouponRegistry([Coupon("ONCE10", CouponType.PERCENTAGE, 10, max_uses=1)])
+    cart = make_cart(registry, "ONCE10")
+
+    # ACT
+    placed = OrderService(PaymentService(), InventoryService()).place_order(cart, "1234567812345678")
+
+    # ASSERT: The code is used up, but the cart still prices the order with it until it changes
+    assert placed
+    assert registry.lookup("ONCE10") is None
+    assert cart.calculate_final_price() == 90.00
+    assert cart.get_pricing().coupon_code == "ONCE10"
+    cart.add_item(CartItem(Product("Pad", 10.00, 10), 1))
+    assert cart.calculate_final_price() == 110.00
+
+
+def test_used_up_coupon_fails_the_order_however_it_was_used_up():
+    # ARRANGE: One cart priced before its code was used up elsewhere, one only after
+    registry = CouponRegistry([Coupon("ONCE10", CouponType.PERCENTAGE, 10, max_uses=1)])
+    order_service = OrderService(PaymentService(), InventoryService())
+    priced_before = make_cart(registry, "ONCE10")
+    assert priced_before.calculate_final_price() == 90.00
+    assert order_service.place_order(make_cart(registry, "ONCE10"), "1234567812345678")
+    priced_after = make_cart(registry, "ONCE10")
+
+    # ACT & ASSERT: Both are turned away, and neither takes stock
+    assert not order_service.place_order(priced_before, "1234567812345678")
+    assert not order_service.place_order(priced_after, "1234567812345678")
+    assert registry.get("ONCE10").get_uses() == 1
+    assert [item.get_product().get_stock() for item in priced_after.get_items()] == [10]
@@ -0,0 +1,61 @@
+"""Prices shall be computed exactly in whole cents, with explicit rounding where a rate is
+applied, so totals do not drift however many items or carts are priced."""
+
+import pytest
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from Money import Money, RoundingMode, divide
+from Product import Product
+from ShoppingCart import ShoppingCart
+
+
+@pytest.mark.parametrize("numerator, half_up, half_even, down", [
+    (25, 3, 2, 2), (35, 4, 4, 3), (24, 2, 2, 2), (-25, -3, -2, -2), (-26, -3, -3, -2),
+])
+def test_divide_rounding_modes(numerator, half_up, half_even, down):
+    # ACT & ASSERT: numerator / 10 in each mode
+    assert divide(numerator, 10, RoundingMode.HALF_UP) == half_up
+    assert divide(numerator, 10, RoundingMode.HALF_EVEN) == half_even
+    assert divide(numerator, 10, RoundingMode.DOWN) == down
+
+
+def test_money_arithmetic_is_exact():
+    # ARRANGE
+    dime = Money.from_float(0.10)
+
+    # ACT
+    total = sum([dime] * 10, Money(0))
+
+    # ASSERT: Ten floats of 0.10 sum to 0.9999999999999999, ten Money dimes to exactly 1.00
+    assert sum([0.10] * 10) != 1.00
+    assert total == Money(100) and total.to_float() == 1.00
+    assert str(Money(-1234)) == "-12.34"
+    assert Money(1999).apply_rate(0.85) == Money(1699)  # 16.9915 rounds half up to 16.99
+    assert Money(5).apply_rate(0.5, RoundingMode.HALF_EVEN) == Money(2)
+
+
+def test_cart_subtotal_does_not_drift():
+    # ARRANGE: Many cheap lines added and mostly removed again
+    cart = ShoppingCart(Customer("Alice", CustomerType.REGULAR), DiscountService())
+    products = [Product(f"Sticker {index}", 0.10, 1000) for index in range(1000)]
+    for product in products:
+        cart.add_item(CartItem(product, 3))
+    for product in products[1:]:
+        cart.update_quantity(product, 0)
+
+    # ACT & ASSERT: Exactly the one remaining line
+    assert cart.calculate_total() == 0.30
+    assert cart.get_subtotal_minor_units() == 30
+
+
+def test_final_price_is_rounded_to_the_cent():
+    # ARRANGE: VIP on a 1999.99 cart with a 10% coupon: 1999.99 * (1 - 0.15 - 0.15 - 0.10) = 1199.994
+    cart = ShoppingCart(Customer("Bob", CustomerType.VIP), DiscountService())
+    cart.add_item(CartItem(Product("Laptop", 1999.99, 5), 1))
+    cart.apply_coupon_code("DISCOUNT10")
+
+    # ACT & ASSERT
+    assert cart.calculate_final_price() == 1199.99
@@ -0,0 +1,85 @@
+"""Orders for different products shall be placed concurrently: stock is guarded per
+product and payment is processed outside any stock lock, while concurrent orders for
+the same product never sell more than the available stock."""
+
+import threading
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from InventoryService import InventoryService
+from OrderService import OrderService
+from PaymentService import PaymentService
+from Product import Product
+from ShoppingCart import ShoppingCart
+
+CARD_NUMBER = "1234567890123456"
+
+
+def make_cart(product, quantity=1):
+    cart = ShoppingCart(Customer("John", CustomerType.REGULAR), DiscountService())
+    cart.add_item(CartItem(product, quantity))
+    return cart
+
+
+class BlockingPaymentService(PaymentService):
+    # Holds the first payment until released, letting other orders run meanwhile
+    def __init__(self):
+        super().__init__()
+        self.first_payment_started = threading.Event()
+        self.release_first_payment = threading.Event()
+        self._lock = threading.Lock()
+        self._payments = 0
+
+    def process_payment(self, credit_card_number: str, amount: float) -> bool:
+        with self._lock:
+            self._payments += 1
+            is_first = self._payments == 1
+        if is_first:
+            self.first_payment_started.set()
+            self.release_first_payment.wait(timeout=5)
+        return super().process_payment(credit_card_number, amount)
+
+
+def test_slow_payment_does_not_block_other_orders():
+    # ARRANGE: Two products that share a single lock stripe
+    payment_service = BlockingPaymentService()
+    order_service = OrderService(payment_service, InventoryService(lock_stripes=1))
+    laptop = Product("Laptop", 1000.00, 5)
+    mouse = Product("Mouse", 50.00, 5)
+    first = threading.Thread(target=order_service.place_order, args=(make_cart(laptop), CARD_NUMBER))
+
+    # ACT: Second order is placed while the first one waits on payment
+    first.start()
+    assert payment_service.first_payment_started.wait(timeout=5)
+    second_result = order_service.place_order(make_cart(mouse), CARD_NUMBER)
+    payment_service.release_first_payment.set()
+    first.join()
+
+    # ASSERT
+    assert second_result is True
+    assert laptop.get_stock() == 4
+    assert mouse.get_stock() == 4
+
+
+def test_concurrent_orders_do_not_oversell():
+    # ARRANGE: Stock for 10 orders, 40 orders racing for it
+    order_service = OrderService(PaymentService(), InventoryService())
+    mouse = Product("Mouse", 50.00, 10)
+    results = []
+
+    def place():
+        results.append(order_service.place_order(make_cart(mouse), CARD_NUMBER))
+
+    threads = [threading.Thread(target=place) for _ in range(40)]
+
+    # ACT
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # ASSERT
+    assert results.count(True) == 10
+    assert mouse.get_stock() == 0
@@ -0,0 +1,131 @@
+"""Every order attempt shall be appended to a binary order log, written in batches by a
+background thread, and the log shall stream back every record for replay."""
+
+import os
+
+from CartItem import CartItem
+from Coupon import Coupon, CouponType
+from CouponRegistry import CouponRegistry
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from InventoryService import InventoryService
+from OrderLog import OrderLog
+from OrderRecord import OrderOutcome, OrderRecord
+from OrderService import OrderService
+from PaymentService import PaymentService
+from Product import Product
+from ShoppingCart import ShoppingCart
+
+CARD_NUMBER = "1234567812345678"
+
+
+def make_cart(laptops=1):
+    cart = ShoppingCart(Customer("Alice", CustomerType.VIP), DiscountService())
+    cart.add_item(CartItem(Product("Laptop", 1200.00, 2), laptops))
+    cart.add_item(CartItem(Product("Mouse", 40.00, 10), 1))
+    cart.apply_coupon_code("SAVE50")
+    return cart
+
+
+def test_orders_are_logged_with_lines_pricing_and_outcome(tmp_path):
+    # ARRANGE
+    path = str(tmp_path / "orders.log")
+    order_log = OrderLog(path)
+    order_service = OrderService(PaymentService(), InventoryService(), order_log)
+    cart = make_cart()
+
+    # ACT: One completed order, one declined card, one short on stock
+    assert order_service.place_order(cart, CARD_NUMBER)
+    assert not order_service.place_order(cart, "bad-card")
+    assert not order_service.place_order(make_cart(laptops=5), CARD_NUMBER)
+    order_log.close()
+    records = list(OrderLog.read(path))
+
+    # ASSERT
+    assert [record.order_id for record in records] == [1, 2, 3]
+    assert [record.outcome for record in records] == [OrderOutcome.COMPLETED, OrderOutcome.PAYMENT_FAILED,
+                                                      OrderOutcome.OUT_OF_STOCK]
+    completed = records[0]
+    assert completed.customer_type == CustomerType.VIP
+    assert completed.lines == (("laptop", 1, 1200.00), ("mouse", 1, 40.00))
+    assert completed.pricing == cart.get_pricing()
+    assert completed.amount == 1240.00 and completed.message == ""
+    assert "Payment failed" in records[1].message
+
+
+def test_records_are_group_committed(tmp_path):
+    # ARRANGE
+    path = str(tmp_path / "orders.log")
+    cart = make_cart()
+
+    # ACT
+    with OrderLog(path) as order_log:
+        for _ in range(2000):
+            order_log.append(OrderRecord.from_cart(order_log.next_order_id(), cart, OrderOutcome.COMPLETED, 1240.00))
+        order_log.flush()
+        stats = order_log.get_stats()
+
+    # ASSERT: Every record written, in fewer writes than records
+    assert stats["records"] == 2000
+    assert stats["commits"] < 2000
+    assert [record.order_id for record in OrderLog.read(path)] == list(range(1, 2001))
+
+
+def test_torn_record_is_cut_off_on_reopen(tmp_path):
+    # ARRANGE: A log whose last record was only half written
+    path = str(tmp_path / "orders.log")
+    cart = make_cart()
+    with OrderLog(path) as order_log:
+        for _ in range(3):
+            order_log.append(OrderRecord.from_cart(order_log.next_order_id(), cart, OrderOutcome.COMPLETED, 1.00))
+    with open(path, "r+b") as file:
+        file.truncate(os.path.getsize(path) - 5)
+
+    # ACT: Reopen and keep logging
+    assert [record.order_id for record in OrderLog.read(path)] == [1, 2]
+    with OrderLog(path) as order_log:
+        order_log.append(OrderRecord.from_cart(order_log.next_order_id(), cart, OrderOutcome.COMPLETED, 1.00))
+
+    # ASSERT: Ids carry on after the last whole record
+    assert [record.order_id for record in OrderLog.read(path)] == [1, 2, 3]
+
+
+def test_single_use_coupon_is_logged_as_priced(tmp_path):
+    # ARRANGE: A 10% coupon that can be used once, on a cart not priced before checkout
+    path = str(tmp_path / "orders.log")
+    discount_service = DiscountService(coupon_registry=CouponRegistry([Coupon("ONCE10", CouponType.PERCENTAGE, 10,
+                                                                              max_uses=1)]))
+    cart = ShoppingCart(Customer("Bob", CustomerType.REGULAR), discount_service)
+    cart.add_item(CartItem(Product("Keyboard", 100.00, 5), 1))
+    cart.apply_coupon_code("ONCE10")
+
+    # ACT
+    with OrderLog(path) as order_log:
+        placed = OrderService(PaymentService(), InventoryService(), order_log).place_order(cart, CARD_NUMBER)
+    (record,) = OrderLog.read(path)
+
+    # ASSERT: The record keeps the coupon the order was placed with
+    assert placed
+    assert record.outcome == OrderOutcome.COMPLETED
+    assert record.pricing.coupon_code == "ONCE10"
+    assert record.pricing.final_price == 90.00
+
+
+def test_record_that_cannot_be_encoded_is_skipped(tmp_path):
+    # ARRANGE: A negative quantity and an over-long SKU between two good records
+    path = str(tmp_path / "orders.log")
+    good = OrderRecord.from_cart(0, make_cart(), OrderOutcome.COMPLETED, 1240.00)
+    negative = good._replace(lines=(("laptop", -1, 1200.00),))
+    too_long = good._replace(lines=(("x" * 70000, 1, 1.00),))
+
+    # ACT
+    with OrderLog(path) as order_log:
+        for record in (good, negative, too_long, good):
+            order_log.append(record._replace(order_id=order_log.next_order_id()))
+        order_log.flush()
+        stats = order_log.get_stats()
+
+    # ASSERT: The bad records are counted and every good one is still written
+    assert stats["records"] == 2 and stats["rejected"] == 2
+    assert [record.order_id for record in OrderLog.read(path)] == [1, 4]
@@ -0,0 +1,124 @@
+"""Payments shall be submittable in bulk: process_payments_batch validates many payments
+and submits the valid ones together, and a PaymentBatcher groups payments from many
+callers into batches and returns each caller its own outcome."""
+
+import threading
+
+import pytest
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from InventoryService import InventoryService
+from OrderService import OrderService
+from PaymentBatcher import PaymentBatcher
+from PaymentService import PaymentService
+from Product import Product
+from ShoppingCart import ShoppingCart
+from SimulatedPaymentService import SimulatedPaymentService
+
+CARD_NUMBER = "1234567890123456"
+
+
+class ShortBatchPaymentService(PaymentService):
+    # Drops the last result of every batch
+    def process_payments_batch(self, payments):
+        return super().process_payments_batch(payments)[:-1]
+
+
+class BrokenBatchPaymentService(PaymentService):
+    # Returns something that is not a list of results
+    def process_payments_batch(self, payments):
+        return None
+
+
+def test_batch_results_line_up_with_payments():
+    # ARRANGE: The middle payment has both an invalid card and amount
+    payments = [(CARD_NUMBER, 10.00), ("123", 0.00), (CARD_NUMBER, 20.00)]
+
+    # ACT
+    results = PaymentService().process_payments_batch(payments)
+
+    # ASSERT
+    assert results[0] is True
+    assert isinstance(results[1], Exception)
+    assert results[2] is True
+
+
+def test_batcher_groups_concurrent_payments():
+    # ARRANGE: 40 callers, batches of up to 10
+    batcher = PaymentBatcher(SimulatedPaymentService(latency=0.01), batch_size=10, flush_interval=0.05)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(batcher.process_payment(CARD_NUMBER, 10.00)))
+               for _ in range(40)]
+
+    # ACT
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    # ASSERT: Everyone paid, in far fewer submissions than payments
+    assert results == [True] * 40
+    assert 4 <= batcher.get_batches_sent() < 40
+
+
+def test_batcher_raises_failed_payment_for_its_caller():
+    # ARRANGE
+    batcher = PaymentBatcher(PaymentService(), flush_interval=0.001)
+
+    # ACT & ASSERT
+    with pytest.raises(Exception) as exc_info:
+        batcher.process_payment("123", 0.00)
+    assert "Payment failed" in str(exc_info.value)
+    assert batcher.process_payment(CARD_NUMBER, 5.00) is True
+    batcher.close()
+
+
+def test_order_service_pays_through_batcher():
+    # ARRANGE
+    batcher = PaymentBatcher(PaymentService(), flush_interval=0.001)
+    order_service = OrderService(batcher, InventoryService())
+    mouse = Product("Mouse", 50.00, 10)
+    cart = ShoppingCart(Customer("John", CustomerType.REGULAR), DiscountService())
+    cart.add_item(CartItem(mouse, 2))
+
+    # ACT
+    result = order_service.place_order(cart, CARD_NUMBER)
+    batcher.close()
+
+    # ASSERT
+    assert result is True
+    assert mouse.get_stock() == 8
+
+
+def test_payment_left_without_a_result_fails():
+    # ARRANGE
+    batcher = PaymentBatcher(ShortBatchPaymentService(), batch_size=2, flush_interval=1.0)
+
+    # ACT
+    first = batcher.submit(CARD_NUMBER, 10.00)
+    second = batcher.submit(CARD_NUMBER, 20.00)
+    batcher.close()
+
+    # ASSERT
+    assert first.result(timeout=1) is True
+    with pytest.raises(RuntimeError):
+        second.result(timeout=1)
+
+
+def test_worker_failure_fails_queued_payments_and_closes():
+    # ARRANGE
+    batcher = PaymentBatcher(BrokenBatchPaymentService(), flush_interval=0.001)
+
+    # ACT
+    future = batcher.submit(CARD_NUMBER, 10.00)
+
+    # ASSERT: The caller gets an error instead of waiting forever, later callers are turned away
+    with pytest.raises(RuntimeError, match="closed"):
+        future.result(timeout=1)
+    with pytest.raises(RuntimeError, match="closed"):
+        batcher.submit(CARD_NUMBER, 10.00)
+    batcher.close()
@@ -0,0 +1,131 @@
+"""Discount tiers, customer rates and the promotion rate shall be loaded from a config
+file and reloaded without a redeploy; a bad file shall leave the current policy in place."""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DEFAULT_PRICING_POLICY, DiscountService
+from PricingPolicy import PricingPolicy
+from PricingPolicyReloader import PricingPolicyReloader
+from Product import Product
+from ShoppingCart import ShoppingCart
+
+SHIPPED_CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pricing_policy.json")
+
+
+def write_config(path, config):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(config, file)
+    # Make the change visible even on filesystems with coarse timestamps
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_shipped_config_matches_default_policy():
+    # ACT & ASSERT
+    assert PricingPolicy.load(SHIPPED_CONFIG) == DEFAULT_PRICING_POLICY
+    assert PricingPolicy.from_dict(DEFAULT_PRICING_POLICY.to_dict()) == DEFAULT_PRICING_POLICY
+
+
+def test_reload_switches_prices_only_when_file_changes(tmp_path):
+    # ARRANGE
+    path = str(tmp_path / "policy.json")
+    config = DEFAULT_PRICING_POLICY.to_dict()
+    write_config(path, config)
+    discount_service = DiscountService()
+    reloader = PricingPolicyReloader(path, discount_service)
+    reloader.load()
+    cart = ShoppingCart(Customer("Alice", CustomerType.REGULAR), discount_service)
+    cart.add_item(CartItem(Product("Laptop", 1000.00, 10), 1))
+    cart.set_promotion_active(True)
+    assert cart.calculate_final_price() == 1000.00 * 0.75
+
+    # ACT & ASSERT: Unchanged file, nothing reloaded
+    assert not reloader.reload_if_changed()
+
+    # ACT & ASSERT: A new Black Friday rate is picked up
+    config["promotion_rate"] = 0.5
+    write_config(path, config)
+    assert reloader.reload_if_changed()
+    assert cart.calculate_final_price() == 500.00
+
+
+def test_bad_config_keeps_current_policy(tmp_path):
+    # ARRANGE
+    path = str(tmp_path / "policy.json")
+    discount_service = DiscountService()
+    reloader = PricingPolicyReloader(path, discount_service)
+    write_config(path, {"tiers": [], "customer_discounts": {"Regular": 0.0}, "promotion_rate": 0.75})
+
+    # ACT & ASSERT
+    with pytest.raises(ValueError):
+        reloader.load()
+    assert discount_service.get_policy() is DEFAULT_PRICING_POLICY
+
+
+@pytest.mark.parametrize("bad_value", [{"threshold": None}, {"promotion_rate": "0.75"}])
+def test_watcher_survives_malformed_config(tmp_path, caplog, bad_value):
+    # ARRANGE
+    path = str(tmp_path / "policy.json")
+    config = DEFAULT_PRICING_POLICY.to_dict()
+    write_config(path, config)
+    discount_service = DiscountService()
+    reloader = PricingPolicyReloader(path, discount_service)
+    reloader.load()
+    bad_config = DEFAULT_PRICING_POLICY.to_dict()
+    if "threshold" in bad_value:
+        bad_config["tiers"][0]["threshold"] = bad_value["threshold"]
+    else:
+        bad_config.update(bad_value)
+
+    # ACT: A malformed edit, then a fixed one
+    reloader.watch(interval=0.01)
+    try:
+        with pytest.raises(ValueError, match="Invalid pricing policy config"):
+            PricingPolicy.from_dict(bad_config)
+        write_config(path, bad_config)
+        deadline = time.monotonic() + 5
+        while "Pricing policy reload failed" not in caplog.text and time.monotonic() < deadline:
+            time.sleep(0.01)
+        config["promotion_rate"] = 0.5
+        write_config(path, config)
+        while discount_service.get_policy().get_promotion_rate() != 0.5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        reloader.stop()
+
+    # ASSERT: The failure was logged and the watcher went on to load the fixed file
+    assert "Pricing policy reload failed" in caplog.text
+    assert discount_service.get_policy().get_promotion_rate() == 0.5
+
+
+def test_pricing_during_reloads_sees_whole_policies():
+    # ARRANGE: Two policies whose tier and customer rates always change together
+    rates = {customer_type: 0.0 for customer_type in CustomerType}
+    low = PricingPolicy([(0, 0.10)], rates, 0.9)
+    high = PricingPolicy([(0, 0.30)], {customer_type: 0.30 for customer_type in CustomerType}, 0.7)
+    discount_service = DiscountService(bundle_rules=[], policy=low)
+    stop = threading.Event()
+
+    def swap():
+        while not stop.is_set():
+            discount_service.set_policy(high)
+            discount_service.set_policy(low)
+
+    swapper = threading.Thread(target=swap)
+    swapper.start()
+
+    # ACT
+    prices = {discount_service.apply_discount(100.0, CustomerType.VIP, [], None, {}) for _ in range(20000)}
+    stop.set()
+    swapper.join()
+
+    # ASSERT: Only prices from one whole policy or the other
+    assert prices <= {100.0 * (1 - 0.10), 100.0 * (1 - (0.30 + 0.30))}
@@ -0,0 +1,70 @@
+"""The shopping cart shall cache its final price and only reprice after something that
+affects it changes: items, coupon code, promotion status, customer type or the price of
+a product in the cart. Cache hits and misses are counted."""
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from Product import Product
+from ShoppingCart import ShoppingCart
+
+
+def test_repeated_reads_hit_the_cache():
+    # ARRANGE
+    cart = ShoppingCart(Customer("John", CustomerType.REGULAR), DiscountService())
+    cart.add_item(CartItem(Product("Mouse", 500.00, 20), 1))
+
+    # ACT
+    prices = [cart.calculate_final_price() for _ in range(3)]
+
+    # ASSERT: Priced once, then served from the cache
+    assert prices == [500.00, 500.00, 500.00]
+    assert cart.get_price_cache_stats() == {"hits": 2, "misses": 1}
+
+
+def test_cart_changes_invalidate_the_cache():
+    # ARRANGE
+    mouse = Product("Mouse", 500.00, 20)
+    cart = ShoppingCart(Customer("Jane", CustomerType.REGULAR), DiscountService())
+    cart.add_item(CartItem(mouse, 1))
+    assert cart.calculate_final_price() == 500.00
+
+    # ACT & ASSERT: Every change is picked up on the next read
+    cart.apply_coupon_code("SAVE50")
+    assert cart.calculate_final_price() == 450.00
+    cart.set_promotion_active(True)
+    assert cart.calculate_final_price() == 375.00
+    cart.set_promotion_active(False)
+    cart.add_item(CartItem(mouse, 1))
+    assert cart.calculate_final_price() == 950.00
+    assert cart.get_price_cache_stats() == {"hits": 0, "misses": 4}
+
+
+def test_product_price_change_invalidates_the_cache():
+    # ARRANGE
+    mouse = Product("Mouse", 500.00, 20)
+    cart = ShoppingCart(Customer("Alice", CustomerType.REGULAR), DiscountService())
+    cart.add_item(CartItem(mouse, 2))
+    assert cart.calculate_final_price() == 1000.00
+
+    # ACT
+    mouse.set_price(400.00)
+
+    # ASSERT: Subtotal and final price follow the new price
+    assert cart.calculate_total() == 800.00
+    assert cart.calculate_final_price() == 800.00
+
+
+def test_customer_type_change_invalidates_the_cache():
+    # ARRANGE
+    customer = Customer("Bob", CustomerType.REGULAR)
+    cart = ShoppingCart(customer, DiscountService())
+    cart.add_item(CartItem(Product("Mouse", 500.00, 20), 1))
+    assert cart.calculate_final_price() == 500.00
+
+    # ACT
+    customer.set_customer_type(CustomerType.VIP)
+
+    # ASSERT
+    assert cart.calculate_final_price() == 425.00
@@ -0,0 +1,71 @@
+"""Discounts shall be priced from a PricingPolicy compiled into per-customer-type price
+stages, giving the same prices as the tier ladder and recompiling only when the policy changes."""
+
+from decimal import ROUND_HALF_UP, Decimal
+
+import pytest
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import CUSTOMER_DISCOUNTS, DEFAULT_PRICING_POLICY, TIERED_DISCOUNTS, DiscountService
+from Money import to_minor_units
+from PricingPipeline import PricingPipeline
+from PricingPolicy import PricingPolicy
+from Product import Product
+from ShoppingCart import ShoppingCart
+
+
+def ladder_rate(total):
+    for threshold, rate in TIERED_DISCOUNTS:
+        if total > threshold:
+            return rate
+    return 0.0
+
+
+@pytest.mark.parametrize("total", [0, 999.99, 1000, 1000.01, 6999.99, 7000, 7000.01, 15000, 15000.01, 1e9])
+def test_tier_lookup_matches_ladder_at_boundaries(total):
+    # ARRANGE
+    pipeline = PricingPipeline(DEFAULT_PRICING_POLICY)
+
+    # ACT & ASSERT: The pipeline takes cart values in cents
+    assert pipeline.tier_rate(to_minor_units(total)) == ladder_rate(total)
+
+
+def test_price_stage_matches_ladder_for_every_customer_type():
+    # ARRANGE
+    pipeline = PricingPipeline(DEFAULT_PRICING_POLICY)
+
+    for customer_type in CustomerType:
+        for total in ("500.00", "1500.07", "8000.33", "20000.99"):
+            # ACT: 10% coupon and 50.00 off, in millionths and cents
+            price = pipeline.stage(customer_type)(to_minor_units(float(total)), 100000, 5000)
+
+            # ASSERT: The ladder's rates, computed exactly and rounded half up to the cent
+            discount = Decimal(str(ladder_rate(float(total)))) + Decimal(str(CUSTOMER_DISCOUNTS[customer_type]))
+            expected = (Decimal(total) - 50) * (1 - discount - Decimal("0.10"))
+            assert price == int((expected * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def test_policy_change_recompiles_and_reprices_cart():
+    # ARRANGE
+    discount_service = DiscountService()
+    cart = ShoppingCart(Customer("Alice", CustomerType.REGULAR), discount_service)
+    cart.add_item(CartItem(Product("Laptop", 2000.00, 10), 1))
+    assert cart.calculate_final_price() == 2000.00 * (1 - 0.15)
+    pipeline = discount_service.get_pipeline()
+
+    # ACT & ASSERT: An equal policy keeps the compiled pipeline
+    discount_service.set_policy(PricingPolicy(TIERED_DISCOUNTS, CUSTOMER_DISCOUNTS, 0.75))
+    assert discount_service.get_pipeline() is pipeline
+
+    # ACT & ASSERT: A new policy is compiled and the cached cart price is not reused
+    discount_service.set_policy(PricingPolicy([(1000, 0.30)], CUSTOMER_DISCOUNTS, 0.75))
+    assert discount_service.get_pipeline() is not pipeline
+    assert cart.calculate_final_price() == 2000.00 * (1 - 0.30)
+
+
+def test_policy_rejects_missing_customer_type():
+    # ACT & ASSERT
+    with pytest.raises(ValueError):
+        PricingPolicy(TIERED_DISCOUNTS, {CustomerType.REGULAR: 0.0}, 0.75)
@@ -0,0 +1,77 @@
+"""A cart shall produce an immutable, serializable PricingResult from one pricing pass,
+showing the subtotal, every discount that applied and the final price."""
+
+import json
+import pickle
+
+import pytest
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from PricingResult import PricingResult
+from Product import Product
+from ShoppingCart import ShoppingCart
+
+
+def make_cart(customer_type=CustomerType.VIP, coupon_code="SAVE50"):
+    cart = ShoppingCart(Customer("Grace", customer_type), DiscountService())
+    cart.add_item(CartItem(Product("Laptop", 3000.00, 10), 1))
+    cart.add_item(CartItem(Product("Mouse", 100.00, 20), 1))
+    cart.apply_coupon_code(coupon_code)
+    return cart
+
+
+def test_result_breaks_down_every_discount():
+    # ARRANGE
+    cart = make_cart()
+
+    # ACT
+    pricing = cart.get_pricing()
+
+    # ASSERT: 3100 - 10 bundle = 3090, 15% tier + 15% VIP, then 50 off: 3040 * 0.70
+    assert pricing == PricingResult(subtotal=3100.00, bundle_savings=10.00, tier_rate=0.15, customer_rate=0.15,
+                                    coupon_code="SAVE50", coupon_rate=0.0, coupon_amount=50.00,
+                                    promotion_rate=None, final_price=2128.00)
+    assert pricing.final_price == cart.calculate_final_price()
+    assert pricing.get_total_savings() == 972.00
+
+
+def test_result_is_computed_once_and_cached():
+    # ARRANGE
+    cart = make_cart()
+
+    # ACT
+    first = cart.get_pricing()
+    cart.calculate_final_price()
+
+    # ASSERT
+    assert cart.get_pricing() is first
+    assert cart.get_price_cache_stats() == {"hits": 2, "misses": 1}
+
+
+def test_promotion_result_and_unknown_coupon():
+    # ARRANGE
+    cart = make_cart(customer_type=CustomerType.REGULAR, coupon_code="NOPE")
+    plain = cart.get_pricing()
+    cart.set_promotion_active(True)
+
+    # ACT
+    promoted = cart.get_pricing()
+
+    # ASSERT
+    assert plain.coupon_code is None
+    assert promoted.promotion_rate == 0.75
+    assert promoted.bundle_savings == 0.0 and promoted.final_price == 2325.00
+
+
+def test_result_is_immutable_and_serializable():
+    # ARRANGE
+    pricing = make_cart().get_pricing()
+
+    # ACT & ASSERT
+    with pytest.raises(AttributeError):
+        pricing.final_price = 0.0
+    assert pickle.loads(pickle.dumps(pricing)) == pricing
+    assert PricingResult(**json.loads(json.dumps(pricing.as_dict()))) == pricing
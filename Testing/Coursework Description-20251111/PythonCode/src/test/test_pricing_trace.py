@@ -0,0 +1,67 @@
+"""Pricing shall not write to stdout. A level-gated tracing hook can instead collect a
+structured trace of each pricing call: which discounts fired and the amounts involved."""
+
+import logging
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from PricingTracer import PricingTracer
+from Product import Product
+from ShoppingCart import ShoppingCart
+
+
+def make_cart(tracer, customer_type=CustomerType.VIP):
+    cart = ShoppingCart(Customer("Grace", customer_type), DiscountService(tracer=tracer))
+    cart.add_item(CartItem(Product("Laptop", 3000.00, 10), 1))
+    cart.add_item(CartItem(Product("Mouse", 100.00, 20), 1))
+    cart.apply_coupon_code("SAVE50")
+    return cart
+
+
+def test_pricing_does_not_print(capsys):
+    # ARRANGE
+    cart = make_cart(tracer=None)
+
+    # ACT
+    cart.calculate_final_price()
+
+    # ASSERT: Nothing is written to stdout on the pricing path
+    assert capsys.readouterr().out == ""
+
+
+def test_trace_records_fired_rules():
+    # ARRANGE: Collect traces at DEBUG level
+    logger = logging.getLogger("pricing.test.enabled")
+    logger.setLevel(logging.DEBUG)
+    traces = []
+    cart = make_cart(PricingTracer(sink=traces.append, logger=logger))
+
+    # ACT
+    final_price = cart.calculate_final_price()
+
+    # ASSERT: One trace holding the bundle, tier, VIP and coupon steps
+    assert len(traces) == 1
+    trace = traces[0].as_dict()
+    assert trace["subtotal"] == 3100.00
+    assert trace["final_price"] == final_price
+    assert [event["stage"] for event in trace["events"]] == ["bundle", "tier", "customer", "coupon"]
+    assert trace["events"][0]["amount"] == 10.00
+    assert trace["events"][3] == {"stage": "coupon", "detail": "SAVE50", "amount": 50.0}
+
+
+def test_trace_not_built_below_level():
+    # ARRANGE: Logger only enabled for warnings, tracer emits at DEBUG
+    logger = logging.getLogger("pricing.test.disabled")
+    logger.setLevel(logging.WARNING)
+    traces = []
+    tracer = PricingTracer(sink=traces.append, logger=logger)
+    cart = make_cart(tracer)
+
+    # ACT
+    cart.calculate_final_price()
+
+    # ASSERT
+    assert not tracer.is_enabled()
+    assert traces == []
@@ -0,0 +1,111 @@
+"""The inventory service shall own a product catalog that interns products by SKU, indexes
+them by casefolded name, and looks up and updates prices and stock for many products at
+once."""
+
+import pytest
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from InventoryService import InventoryService
+from ProductCatalog import ProductCatalog
+from ShoppingCart import ShoppingCart
+
+
+def make_catalog():
+    catalog = ProductCatalog()
+    catalog.add_product("Laptop", 1000.00, 10, sku="LT-1")
+    catalog.add_product("Mouse", 50.00, 20)
+    catalog.add_product("Gaming Mouse", 80.00, 5, sku="MS-2")
+    return catalog
+
+
+def test_products_are_interned_by_sku():
+    # ARRANGE
+    catalog = make_catalog()
+
+    # ACT: Adding an existing SKU returns the catalogued product
+    again = catalog.add_product("Laptop (duplicate)", 1.00, 1, sku="LT-1")
+
+    # ASSERT
+    assert len(catalog) == 3
+    assert again == catalog.get("LT-1")
+    assert again.get_name() == "Laptop"
+    assert catalog.get("mouse").get_price() == 50.00
+    assert catalog.get("missing") is None
+
+
+def test_name_index_is_case_insensitive():
+    # ARRANGE
+    catalog = make_catalog()
+
+    # ACT & ASSERT
+    assert [product.get_sku() for product in catalog.find_by_name("MOUSE")] == ["mouse"]
+    assert catalog.find_by_name("keyboard") == []
+
+
+def test_bulk_lookup_and_columns():
+    # ARRANGE
+    catalog = make_catalog()
+
+    # ACT
+    rows = catalog.lookup_many(["MS-2", "LT-1", "nope"])
+
+    # ASSERT
+    assert rows.tolist() == [2, 0, -1]
+    assert catalog.get_prices(rows[:2]).tolist() == [80.00, 1000.00]
+    assert catalog.get_stocks(rows[:2]).tolist() == [5, 10]
+    assert catalog.has_stock(rows[:2], [6, 10]).tolist() == [False, True]
+
+
+def test_bulk_stock_update_is_all_or_nothing():
+    # ARRANGE
+    inventory = InventoryService(catalog=make_catalog())
+    catalog = inventory.get_catalog()
+
+    # ACT & ASSERT: Row 2 only has 5 units, so nothing is taken
+    with pytest.raises(RuntimeError):
+        inventory.reduce_stock_many([0, 2, 2], [1, 3, 3])
+    assert catalog.get_stocks([0, 1, 2]).tolist() == [10, 20, 5]
+
+    # ACT & ASSERT: Repeated rows are added together
+    inventory.reduce_stock_many([0, 2, 2], [1, 2, 3])
+    assert catalog.get_stocks([0, 1, 2]).tolist() == [9, 20, 0]
+
+
+def test_bulk_stock_update_rejects_negative_quantities():
+    # ARRANGE
+    inventory = InventoryService(catalog=make_catalog())
+    catalog = inventory.get_catalog()
+
+    # ACT & ASSERT: A negative quantity would add stock, so nothing changes
+    with pytest.raises(RuntimeError):
+        inventory.reduce_stock_many([0, 1], [1, -100])
+    assert catalog.get_stocks([0, 1, 2]).tolist() == [10, 20, 5]
+
+
+def test_bulk_stock_update_rejects_unknown_rows():
+    # ARRANGE
+    inventory = InventoryService(catalog=make_catalog())
+    catalog = inventory.get_catalog()
+
+    # ACT & ASSERT
+    with pytest.raises(RuntimeError, match="Failed to update stock"):
+        inventory.reduce_stock_many([0, 99], [1, 1])
+    assert catalog.get_stocks([0, 1, 2]).tolist() == [10, 20, 5]
+
+
+def test_bulk_price_update_reaches_carts():
+    # ARRANGE
+    catalog = make_catalog()
+    cart = ShoppingCart(Customer("John", CustomerType.REGULAR), DiscountService())
+    cart.add_item(CartItem(catalog.get("mouse"), 2))
+    assert cart.calculate_final_price() == 100.00
+
+    # ACT
+    catalog.set_prices(catalog.lookup_many(["mouse", "LT-1"]), [40.00, 900.00])
+
+    # ASSERT
+    assert cart.calculate_final_price() == 80.00
+    assert catalog.get("LT-1").get_price() == 900.00
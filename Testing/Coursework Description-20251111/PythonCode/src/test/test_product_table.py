@@ -0,0 +1,88 @@
+"""Products and cart lines shall use compact storage: Product and CartItem use __slots__,
+and a ProductTable keeps a catalog in typed columns whose row views can be used
+anywhere a Product is."""
+
+import pytest
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from InventoryService import InventoryService
+from Product import Product
+from ProductTable import ProductTable
+from ShoppingCart import ShoppingCart
+
+
+def test_product_and_cart_item_have_no_instance_dict():
+    # ARRANGE
+    product = Product("Mouse", 50.00, 20)
+
+    # ACT & ASSERT
+    assert not hasattr(product, "__dict__")
+    assert not hasattr(CartItem(product, 1), "__dict__")
+
+
+def test_row_view_behaves_like_product():
+    # ARRANGE
+    table = ProductTable()
+    table.add("Keyboard", 150.00, 15)
+    row = table.add("Café Laptop", 999.99, 10, sku="LT-1")
+
+    # ACT
+    row.reduce_stock(3)
+
+    # ASSERT
+    assert len(table) == 2
+    assert row.get_name() == "Café Laptop"
+    assert row.get_price() == 999.99
+    assert row.get_stock() == 7
+    assert row.get_sku() == "LT-1"
+    assert table.row(0).get_sku() == "keyboard"
+    with pytest.raises(ValueError):
+        row.reduce_stock(8)
+
+
+def test_row_views_of_same_row_are_the_same_product_in_a_cart():
+    # ARRANGE
+    table = ProductTable()
+    table.extend([("Laptop", 200.00, 10), ("Mouse", 100.00, 20)])
+    cart = ShoppingCart(Customer("Alice", CustomerType.REGULAR), DiscountService())
+
+    # ACT: Separate views of the same rows
+    cart.add_item(CartItem(table.row(0), 1))
+    cart.add_item(CartItem(table.row(1), 1))
+    cart.add_item(CartItem(table.row(1), 1))
+
+    # ASSERT: Mouse lines merged, bundle discount applied to one mouse
+    assert len(cart.get_items()) == 2
+    assert cart.calculate_total() == 400.00
+    assert cart.calculate_final_price() == 390.00
+
+
+def test_row_price_change_reaches_cart():
+    # ARRANGE
+    table = ProductTable()
+    mouse = table.add("Mouse", 100.00, 20)
+    cart = ShoppingCart(Customer("Bob", CustomerType.REGULAR), DiscountService())
+    cart.add_item(CartItem(mouse, 2))
+    assert cart.calculate_final_price() == 200.00
+
+    # ACT
+    table.row(0).set_price(80.00)
+
+    # ASSERT
+    assert cart.calculate_final_price() == 160.00
+
+
+def test_inventory_reserves_row_stock():
+    # ARRANGE
+    table = ProductTable()
+    mouse = table.add("Mouse", 100.00, 5)
+    inventory = InventoryService()
+
+    # ACT
+    inventory.commit(inventory.reserve([CartItem(mouse, 2)]))
+
+    # ASSERT: The change is visible in the stock column
+    assert table.get_stocks()[0] == 3
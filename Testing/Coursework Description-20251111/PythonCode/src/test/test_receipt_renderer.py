@@ -0,0 +1,81 @@
+"""Receipts shall be rendered in one pass into a buffer or any writable, text or binary,
+with a bulk mode writing many orders' receipts to one file."""
+
+import io
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from Product import Product
+from ReceiptRenderer import ReceiptRenderer
+from ShoppingCart import ShoppingCart
+
+EXPECTED_RECEIPT = (
+    "----- Shopping Cart Receipt -----\n"
+    "Laptop - 1 x $3000.00\n"
+    "Mouse - 2 x $50.00\n"
+    "---------------------------------\n"
+    "Total before discount: $3100.00\n"
+    "Final price after discounts: $2630.75\n"
+)
+
+
+class CountingWriter(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def make_cart():
+    cart = ShoppingCart(Customer("Alice", CustomerType.REGULAR), DiscountService())
+    cart.add_item(CartItem(Product("Laptop", 3000.00, 10), 1))
+    cart.add_item(CartItem(Product("Mouse", 50.00, 10), 2))
+    return cart
+
+
+def test_receipt_is_written_in_one_call():
+    # ARRANGE
+    cart = make_cart()
+    writer = CountingWriter()
+
+    # ACT
+    cart.print_receipt(writer)
+
+    # ASSERT: Same layout as the printed receipt, one write, one pricing pass
+    assert writer.getvalue() == EXPECTED_RECEIPT
+    assert writer.writes == 1
+    assert cart.get_price_cache_stats() == {"hits": 0, "misses": 1}
+
+
+def test_binary_writable_gets_encoded_receipt():
+    # ARRANGE
+    stream = io.BytesIO()
+
+    # ACT
+    ReceiptRenderer().write(make_cart(), stream)
+
+    # ASSERT
+    assert stream.getvalue() == EXPECTED_RECEIPT.encode("utf-8")
+
+
+def test_bulk_mode_writes_all_receipts_in_buffered_chunks(tmp_path):
+    # ARRANGE
+    carts = [make_cart() for _ in range(1000)]
+    path = tmp_path / "receipts.txt"
+    writer = CountingWriter()
+
+    # ACT
+    with open(path, "wb") as file:
+        written = ReceiptRenderer().write_many(carts, file)
+    ReceiptRenderer(buffer_size=4096).write_many(carts, writer)
+
+    # ASSERT: Everything lands, in far fewer writes than receipts
+    assert written == 1000
+    assert path.read_text(encoding="utf-8") == EXPECTED_RECEIPT * 1000
+    assert writer.getvalue() == EXPECTED_RECEIPT * 1000
+    assert writer.writes < 1000 * len(EXPECTED_RECEIPT) // 4096 + 2
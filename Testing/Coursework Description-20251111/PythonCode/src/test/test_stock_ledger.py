@@ -0,0 +1,99 @@
+"""Stock can be kept in a memory-mapped ledger file shared by processes on one host:
+each SKU has a fixed slot, updates use atomic compare-and-swap, and products and the
+inventory service take stock through the ledger once attached."""
+
+import multiprocessing
+
+import pytest
+
+from CartItem import CartItem
+from InventoryService import InventoryService
+from Product import Product
+from StockLedger import StockLedger
+
+
+def take_one_at_a_time(path, attempts, results):
+    ledger = StockLedger(path)
+    slot = ledger.slot_for("mouse")
+    taken = 0
+    for _ in range(attempts):
+        try:
+            ledger.decrement(slot, 1)
+            taken += 1
+        except ValueError:
+            pass
+    ledger.close()
+    results.put(taken)
+
+
+def test_compare_and_swap(tmp_path):
+    # ARRANGE
+    ledger = StockLedger(str(tmp_path / "stock.ledger"), capacity=8)
+    slot = ledger.slot_for("mouse", initial_stock=10)
+
+    # ACT & ASSERT: Only a swap from the current value succeeds
+    assert not ledger.compare_and_swap(slot, 9, 5)
+    assert ledger.compare_and_swap(slot, 10, 5)
+    assert ledger.get_stock(slot) == 5
+    with pytest.raises(ValueError):
+        ledger.decrement(slot, 6)
+    assert ledger.decrement(slot, 5) == 0
+    ledger.close()
+
+
+def test_stock_persists_across_reopen(tmp_path):
+    # ARRANGE
+    path = str(tmp_path / "stock.ledger")
+    ledger = StockLedger(path, capacity=8)
+    ledger.decrement(ledger.slot_for("laptop", initial_stock=7), 2)
+    ledger.close()
+
+    # ACT: Reopen; the existing slot keeps its count over a new initial value
+    reopened = StockLedger(path)
+    slot = reopened.slot_for("laptop", initial_stock=100)
+
+    # ASSERT
+    assert reopened.get_capacity() == 8
+    assert reopened.get_stock(slot) == 5
+    assert reopened.get_stock_column()[slot] == 5
+    reopened.close()
+
+
+def test_processes_share_stock_without_overselling(tmp_path):
+    # ARRANGE: 200 units, 4 processes each trying to take 100
+    path = str(tmp_path / "stock.ledger")
+    ledger = StockLedger(path, capacity=8)
+    slot = ledger.slot_for("mouse", initial_stock=200)
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=take_one_at_a_time, args=(path, 100, results)) for _ in range(4)]
+
+    # ACT
+    for worker in workers:
+        worker.start()
+    taken = sum(results.get(timeout=30) for _ in workers)
+    for worker in workers:
+        worker.join()
+
+    # ASSERT
+    assert taken == 200
+    assert ledger.get_stock(slot) == 0
+    ledger.close()
+
+
+def test_inventory_takes_stock_through_ledger(tmp_path):
+    # ARRANGE: Two processes' worth of Product objects for the same SKU
+    ledger = StockLedger(str(tmp_path / "stock.ledger"), capacity=8)
+    inventory = InventoryService(stock_ledger=ledger)
+    here = Product("Mouse", 50.00, 10)
+    elsewhere = Product("Mouse", 50.00, 10)
+
+    # ACT
+    inventory.update_stock(CartItem(here, 3))
+    inventory.release(inventory.reserve([CartItem(elsewhere, 2)]))
+    inventory.commit(inventory.reserve([CartItem(elsewhere, 4)]))
+
+    # ASSERT: Both objects see the shared count
+    assert here.get_stock_ledger() is ledger
+    assert here.get_stock() == 3
+    assert elsewhere.get_stock() == 3
+    ledger.close()
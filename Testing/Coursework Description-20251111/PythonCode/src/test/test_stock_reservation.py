@@ -0,0 +1,148 @@
+"""Stock for an order shall be reserved for all cart lines at once, committed only after
+payment succeeds, and returned if the payment fails or the reservation times out."""
+
+import pytest
+
+from CartItem import CartItem
+from Customer import Customer
+from CustomerType import CustomerType
+from DiscountService import DiscountService
+from InventoryService import InventoryService
+from OrderLog import OrderLog
+from OrderRecord import OrderOutcome
+from OrderService import OrderService
+from PaymentService import PaymentService
+from Product import Product
+from ShoppingCart import ShoppingCart
+from StockReservation import StockReservation
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class SlowPaymentService(PaymentService):
+    # Payment that takes longer than the reservation timeout; other orders may take the
+    # stock while it is in flight
+    def __init__(self, inventory, clock, taken_meanwhile=None):
+        super().__init__()
+        self._inventory = inventory
+        self._clock = clock
+        self._taken_meanwhile = taken_meanwhile
+
+    def process_payment(self, credit_card_number, amount):
+        self._clock.now += 60
+        self._inventory.release_expired()
+        if self._taken_meanwhile is not None:
+            self._taken_meanwhile.reduce_stock(self._taken_meanwhile.get_stock())
+        return super().process_payment(credit_card_number, amount)
+
+
+def test_reservation_is_all_or_nothing():
+    # ARRANGE: Enough laptops but not enough mice
+    inventory = InventoryService()
+    laptop = Product("Laptop", 1000.00, 5)
+    mouse = Product("Mouse", 50.00, 1)
+
+    # ACT & ASSERT: The short mouse line fails the whole reservation
+    with pytest.raises(RuntimeError):
+        inventory.reserve([CartItem(laptop, 2), CartItem(mouse, 2)])
+    assert laptop.get_stock() == 5
+    assert mouse.get_stock() == 1
+
+
+def test_release_returns_stock_and_commit_keeps_it():
+    # ARRANGE
+    inventory = InventoryService()
+    mouse = Product("Mouse", 50.00, 10)
+
+    # ACT & ASSERT: Reserved stock is unavailable until released
+    released = inventory.reserve([CartItem(mouse, 3)])
+    assert mouse.get_stock() == 7
+    inventory.release(released)
+    assert mouse.get_stock() == 10
+    assert released.get_status() == StockReservation.RELEASED
+
+    # ACT & ASSERT: Committed stock stays taken
+    committed = inventory.reserve([CartItem(mouse, 4)])
+    inventory.commit(committed)
+    assert mouse.get_stock() == 6
+    assert committed.get_status() == StockReservation.COMMITTED
+    assert inventory.get_pending_count() == 0
+
+
+def test_expired_reservation_is_released():
+    # ARRANGE
+    clock = FakeClock()
+    inventory = InventoryService(reservation_timeout=30, clock=clock)
+    mouse = Product("Mouse", 50.00, 10)
+    reservation = inventory.reserve([CartItem(mouse, 3)])
+
+    # ACT
+    clock.now = 31
+    inventory.release_expired()
+
+    # ASSERT: Stock is back and the reservation can no longer be committed
+    assert mouse.get_stock() == 10
+    with pytest.raises(RuntimeError):
+        inventory.commit(reservation)
+
+
+def test_failed_payment_returns_stock():
+    # ARRANGE: Payment fails for a zero total
+    inventory = InventoryService()
+    order_service = OrderService(PaymentService(), inventory)
+    free_mouse = Product("Mouse", 0.00, 10)
+    cart = ShoppingCart(Customer("John", CustomerType.REGULAR), DiscountService())
+    cart.add_item(CartItem(free_mouse, 2))
+
+    # ACT
+    result = order_service.place_order(cart, "123")
+
+    # ASSERT
+    assert result is False
+    assert free_mouse.get_stock() == 10
+    assert inventory.get_pending_count() == 0
+
+
+def test_order_paid_after_reservation_expired_takes_stock_again():
+    # ARRANGE
+    clock = FakeClock()
+    inventory = InventoryService(reservation_timeout=30, clock=clock)
+    mouse = Product("Mouse", 50.00, 10)
+    cart = ShoppingCart(Customer("John", CustomerType.REGULAR), DiscountService())
+    cart.add_item(CartItem(mouse, 3))
+
+    # ACT
+    result = OrderService(SlowPaymentService(inventory, clock), inventory).place_order(cart, "1234567890123456")
+
+    # ASSERT: Stock taken once, nothing left pending
+    assert result is True
+    assert mouse.get_stock() == 7
+    assert inventory.get_pending_count() == 0
+
+
+def test_order_paid_after_stock_was_taken_is_logged_as_not_fulfilled(tmp_path):
+    # ARRANGE
+    path = str(tmp_path / "orders.log")
+    clock = FakeClock()
+    inventory = InventoryService(reservation_timeout=30, clock=clock)
+    mouse = Product("Mouse", 50.00, 10)
+    cart = ShoppingCart(Customer("John", CustomerType.REGULAR), DiscountService())
+    cart.add_item(CartItem(mouse, 3))
+
+    # ACT
+    with OrderLog(path) as order_log:
+        result = OrderService(SlowPaymentService(inventory, clock, taken_meanwhile=mouse), inventory,
+                              order_log).place_order(cart, "1234567890123456")
+    (record,) = OrderLog.read(path)
+
+    # ASSERT: The customer was charged, so the record says so and keeps the amount for a refund
+    assert result is False
+    assert mouse.get_stock() == 0
+    assert record.outcome == OrderOutcome.CHARGED_NOT_FULFILLED
+    assert record.amount == 150.00